@@ -1,59 +1,200 @@
-import matplotlib.pyplot as plt
+import os
 import csv
-from collections import defaultdict
+import argparse
+import matplotlib.pyplot as plt
 import numpy as np
+from model.results_store import ResultsStore, TEXT_COLUMNS, INT_COLUMNS, COLUMNS
+from model.microbench import mann_whitney_greater
+from model.complexity import loglog_fit, best_model
+
+# Columns the plots use; loading fewer columns is what keeps large runs fast
+PLOT_COLUMNS = ("generator", "algorithm", "status", "size", "seed", "time_ms", "gen_time_ms", "path_len",
+                "visited_count", "peak_frontier", "working_set", "peak_alloc_kb", "memory_kb")
+
+def load_csv(path):
+    """A results CSV as {column: array}, like ResultsStore.load; columns missing from older files are NaN."""
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    # Older files: one generator, no status, mazes identified by iteration. The defaults go in
+    # before the arrays are built: a str array is only as wide as its longest value.
+    defaults = {"generator": "RecursiveBacktracker", "status": "ok"}
+    cols = {}
+    for column in COLUMNS:
+        vals = [row.get(column) or defaults.get(column, "") for row in rows]
+        if column in TEXT_COLUMNS:
+            cols[column] = np.array(vals, dtype=str)
+        elif column in INT_COLUMNS:
+            cols[column] = np.array([int(v) if v else -1 for v in vals], dtype=np.int64)
+        else:
+            cols[column] = np.array([float(v) if v else np.nan for v in vals], dtype=np.float64)
+    if (cols["seed"] < 0).any():
+        cols["seed"] = cols["iteration"]
+    return cols
+
+def load_columns(db, run_id, csv_path):
+    """Columns of run `run_id` (default: the latest) from the store, or of `csv_path` without one."""
+    if db and os.path.exists(db):
+        store = ResultsStore(db)
+        run_id = run_id or store.latest_run()
+        cols = store.load(run_id, PLOT_COLUMNS) if run_id else None
+        store.close()
+        if cols is not None:
+            print(f"Run {run_id} from {db}")
+            return cols
+    if not os.path.exists(csv_path):
+        return None
+    return load_csv(csv_path)
 
-def analyze():
-    # Structure: data[generator][algorithm][size]['metric'] = [list of values]
-    data = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict(list))))
+def group_rows(cols, mask, keys):
+    """{key tuple: row indices} of the rows selected by `mask`, grouped by the `keys` columns (one sort)."""
+    idx = np.flatnonzero(mask)
+    if not idx.size:
+        return {}
+    order = idx[np.lexsort([cols[k][idx] for k in reversed(keys)])]
+    sorted_keys = [cols[k][order] for k in keys]
+    starts = np.zeros(len(order), dtype=bool)
+    starts[0] = True
+    for column in sorted_keys:
+        starts[1:] |= column[1:] != column[:-1]
+    starts = np.flatnonzero(starts)
+    return {tuple(column[i].item() for column in sorted_keys): part
+            for i, part in zip(starts, np.split(order, starts[1:]))}
+
+def maze_rows(cols, mask):
+    """One row per (generator, size, seed) among `mask`: generation times are repeated on every solver row."""
+    idx = np.flatnonzero(mask)
+    _, first = np.unique(np.stack([cols["size"][idx], cols["seed"][idx]]), axis=1, return_index=True)
+    return idx[first]
+
+def compare_runs(db, run_a, run_b):
+    """Median time per generator/algorithm/size of two stored runs, with the change and a two-sided Mann-Whitney p."""
+    store = ResultsStore(db)
+    a = store.load(run_a, ("generator", "algorithm", "size", "seed", "status", "time_ms", "gen_time_ms"))
+    b = store.load(run_b, ("generator", "algorithm", "size", "seed", "status", "time_ms", "gen_time_ms"))
+    store.close()
     
-    try:
-        with open("results.csv", "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                gen = row.get("generator", "RecursiveBacktracker")
-                algo = row["algorithm"]
-                size = int(row["size"])
-                data[gen][algo][size]["time_ms"].append(float(row["time_ms"]))
-                data[gen][algo][size]["path_len"].append(float(row["path_len"]))
-                data[gen][algo][size]["visited_count"].append(float(row["visited_count"]))
-                data[gen][algo][size]["peak_frontier"].append(float(row.get("peak_frontier", 0)))
-                data[gen][algo][size]["memory_kb"].append(float(row.get("memory_kb", 0)))
-    except FileNotFoundError:
-        print("results.csv not found. Run benchmark_runner.py first.")
-        return
+    def medians(cols):
+        samples = {}
+        for key, rows in group_rows(cols, cols["status"] == "ok", ("generator", "algorithm", "size")).items():
+            samples[key] = cols["time_ms"][rows]
+        for gen in np.unique(cols["generator"]):
+            rows = maze_rows(cols, cols["generator"] == gen)
+            for size in np.unique(cols["size"][rows]):
+                samples[(gen.item(), "(generate)", size.item())] = cols["gen_time_ms"][rows[cols["size"][rows] == size]]
+        return samples
+    
+    samples_a, samples_b = medians(a), medians(b)
+    print(f"{'generator':<22}{'algorithm':>14}{'size':>6}{f'run {run_a}':>10}{f'run {run_b}':>10}{'change':>9}{'p':>8}")
+    for key in sorted(samples_a.keys() & samples_b.keys()):
+        ta, tb = samples_a[key], samples_b[key]
+        ma, mb = np.median(ta), np.median(tb)
+        p = min(1.0, 2 * min(mann_whitney_greater(list(tb), list(ta)), mann_whitney_greater(list(ta), list(tb))))
+        change = (mb / ma - 1) * 100 if ma else 0.0
+        print(f"{key[0]:<22}{key[1]:>14}{key[2]:>6}{ma:>10.2f}{mb:>10.2f}{change:>+8.1f}%{p:>8.4f}")
+    for key in sorted(samples_a.keys() ^ samples_b.keys()):
+        print(f"{key[0]:<22}{key[1]:>14}{key[2]:>6}  only in run {run_a if key in samples_a else run_b}")
+
+def list_runs(db):
+    store = ResultsStore(db)
+    for run in store.runs():
+        print(f"run {run['run_id']:>4}  {run['started']}  {run['git_rev']:<14} seed {run['seed']:<6} {run['rows']:>8} rows  {run['machine']}")
+    store.close()
 
-    generators = sorted(list(data.keys()))
+# Metrics fitted against the cell count n. Every generator and solver here is linear in time and
+# space; the priority-queue solvers' n log n stays within the tolerance over benchmark sizes.
+FIT_METRICS = ("time_ms", "visited_count", "peak_frontier", "peak_alloc_kb")
+EXPECTED_EXPONENT = 1.0
+
+def complexity_report(cols, tolerance=0.15):
+    """
+    Fits log-log scaling exponents (and the best of n, n log n, n^2) per generator, algorithm
+    and metric over every maze, prints them and flags any whose exponent's 95% CI lies wholly
+    above EXPECTED_EXPONENT + `tolerance`. Returns {(generator, algorithm, metric): fit}.
+    """
+    ok = cols["status"] == "ok"
+    series = []
+    for (gen, algo), rows in group_rows(cols, ok, ("generator", "algorithm")).items():
+        series += [(gen, algo, metric, rows) for metric in FIT_METRICS]
+    for gen in np.unique(cols["generator"]):
+        series.append((gen.item(), "(generate)", "gen_time_ms", maze_rows(cols, cols["generator"] == gen)))
     
-    for gen in generators:
-        algos = sorted(list(data[gen].keys()))
-        sizes = sorted(list(data[gen][algos[0]].keys()))
+    fits = {}
+    print(f"\n{'generator':<22}{'algorithm':>14}{'metric':>15}{'exponent':>10}{'95% CI':>16}{'best fit':>10}{'n':>6}")
+    for gen, algo, metric, rows in sorted(series, key=lambda r: r[:3]):
+        n = cols["size"][rows].astype(np.float64) ** 2
+        y = cols[metric][rows]
+        keep = y > 0 # Log scale; NaN (older files) is dropped too
+        if len(np.unique(n[keep])) < 2:
+            continue
+        fit = loglog_fit(n[keep], y[keep])
+        fit["model"], _ = best_model(n[keep], y[keep])
+        fit["flagged"] = fit["ci_low"] > EXPECTED_EXPONENT + tolerance
+        fits[(gen, algo, metric)] = fit
+        ci = f"{fit['ci_low']:.2f}-{fit['ci_high']:.2f}"
+        flag = "  WORSE THAN EXPECTED" if fit["flagged"] else ""
+        print(f"{gen:<22}{algo:>14}{metric:>15}{fit['exponent']:>10.2f}{ci:>16}{fit['model']:>10}{fit['points']:>6}{flag}")
+    
+    flagged = [key for key, fit in fits.items() if fit["flagged"]]
+    print(f"Exponents are in cells (n = size^2); expected <= {EXPECTED_EXPONENT} (+{tolerance} tolerance). "
+          f"{len(flagged)} of {len(fits)} fits scale worse.")
+    return fits
 
-        fig, axes = plt.subplots(3, 2, figsize=(16, 18))
+def analyze(db="results.db", run_id=None, csv_path="results.csv", tolerance=0.15):
+    cols = load_columns(db, run_id, csv_path)
+    if cols is None:
+        print(f"No results in {db} or {csv_path}. Run benchmark_runner.py first.")
+        return
+    
+    fits = complexity_report(cols, tolerance)
+    ok = cols["status"] == "ok" # Solvers that timed out or were skipped have no measurements
+    # groups[(generator, algorithm, size)] = row indices
+    groups = group_rows(cols, ok, ("generator", "algorithm", "size"))
+    generators = sorted(set(cols["generator"].tolist()))
+    
+    for gen in generators:
+        in_gen = cols["generator"] == gen
+        algos = sorted(set(cols["algorithm"][in_gen & ok].tolist()))
+        fig, axes = plt.subplots(4, 2, figsize=(16, 24))
         fig.suptitle(f"Scalability Analysis: {gen} Maze", fontsize=16)
         
         ax_time, ax_visited = axes[0]
         ax_path, ax_frontier = axes[1]
-        ax_memory = axes[2][0]
-        axes[2][1].axis('off') # Hide empty subplot
+        ax_memory, ax_working = axes[2]
+        ax_gen, ax_rss = axes[3]
+        # Per-solver memory columns are missing from older results files
+        has_alloc = not np.isnan(cols["peak_alloc_kb"][in_gen & ok]).any()
 
         colors = plt.cm.tab10(np.linspace(0, 1, len(algos)))
 
         for i, algo in enumerate(algos):
-            avg_times = [np.mean(data[gen][algo][s]["time_ms"]) for s in sizes]
-            avg_visited = [np.mean(data[gen][algo][s]["visited_count"]) for s in sizes]
-            avg_paths = [np.mean(data[gen][algo][s]["path_len"]) for s in sizes]
-            avg_frontier = [np.mean(data[gen][algo][s]["peak_frontier"]) for s in sizes]
-            avg_memory = [np.mean(data[gen][algo][s]["memory_kb"]) for s in sizes]
+            # Fewer sizes for a solver skipped after a timeout
+            sizes = sorted(s for g, a, s in groups if g == gen and a == algo)
+            rows = [groups[(gen, algo, s)] for s in sizes]
+            def means(column):
+                return [cols[column][r].mean() for r in rows]
+            # Time: median over mazes with the interquartile range, robust to the odd slow run
+            q1_times, med_times, q3_times = np.array([np.percentile(cols["time_ms"][r], [25, 50, 75]) for r in rows]).T
+            avg_visited = means("visited_count")
+            avg_paths = means("path_len")
+            avg_frontier = means("peak_frontier")
+            avg_rss = means("memory_kb")
 
-            ax_time.plot(sizes, avg_times, marker='o', label=algo, color=colors[i])
+            fit = fits.get((gen, algo, "time_ms"))
+            label = f"{algo} (~cells^{fit['exponent']:.2f})" if fit else algo
+            ax_time.plot(sizes, med_times, marker='o', label=label, color=colors[i])
+            ax_time.fill_between(sizes, q1_times, q3_times, color=colors[i], alpha=0.2)
             ax_visited.plot(sizes, avg_visited, marker='o', label=algo, color=colors[i])
             ax_path.plot(sizes, avg_paths, marker='o', label=algo, color=colors[i])
             ax_frontier.plot(sizes, avg_frontier, marker='o', label=algo, color=colors[i])
-            ax_memory.plot(sizes, avg_memory, marker='o', label=algo, color=colors[i])
+            ax_rss.plot(sizes, avg_rss, marker='o', label=algo, color=colors[i])
+            if has_alloc:
+                avg_alloc = means("peak_alloc_kb")
+                avg_working = means("working_set")
+                ax_memory.plot(sizes, avg_alloc, marker='o', label=algo, color=colors[i])
+                ax_working.plot(sizes, avg_working, marker='o', label=algo, color=colors[i])
 
         ax_time.set_title("Execution Time vs Grid Size")
-        ax_time.set_ylabel("Average Time (ms)")
+        ax_time.set_ylabel("Median Time (ms), IQR shaded")
         ax_time.legend()
         ax_time.grid(True, linestyle='--', alpha=0.7)
 
@@ -72,10 +213,38 @@ def analyze():
         ax_frontier.legend()
         ax_frontier.grid(True, linestyle='--', alpha=0.7)
 
-        ax_memory.set_title("Peak Memory Usage vs Grid Size")
-        ax_memory.set_ylabel("RAM Usage (KB)")
-        ax_memory.legend()
-        ax_memory.grid(True, linestyle='--', alpha=0.7)
+        if has_alloc:
+            ax_memory.set_title("Peak Allocation per Solve (tracemalloc)")
+            ax_memory.set_ylabel("Peak Allocated (KB)")
+            ax_memory.legend()
+            ax_memory.grid(True, linestyle='--', alpha=0.7)
+
+            ax_working.set_title("Solver Working Set vs Grid Size")
+            ax_working.set_ylabel("Frontier Insertions (labelled cells)")
+            ax_working.legend()
+            ax_working.grid(True, linestyle='--', alpha=0.7)
+        else:
+            ax_memory.axis('off')
+            ax_working.axis('off')
+
+        ax_rss.set_title("Process RSS after Solve (whole worker process)")
+        ax_rss.set_ylabel("RSS (KB)")
+        ax_rss.legend()
+        ax_rss.grid(True, linestyle='--', alpha=0.7)
+
+        mazes = maze_rows(cols, in_gen)
+        if not np.isnan(cols["gen_time_ms"][mazes]).all():
+            maze_sizes = cols["size"][mazes]
+            sizes = np.unique(maze_sizes)
+            q1_gen, med_gen, q3_gen = np.array([np.percentile(cols["gen_time_ms"][mazes[maze_sizes == s]], [25, 50, 75]) for s in sizes]).T
+            ax_gen.plot(sizes, med_gen, marker='o', color='black', label=gen)
+            ax_gen.fill_between(sizes, q1_gen, q3_gen, color='gray', alpha=0.3)
+            ax_gen.set_title("Generation Time vs Grid Size")
+            ax_gen.set_ylabel("Median Time (ms), IQR shaded")
+            ax_gen.legend()
+            ax_gen.grid(True, linestyle='--', alpha=0.7)
+        else:
+            ax_gen.axis('off') # Older results without generation times
 
         for ax in axes.flat:
             if ax.get_visible():
@@ -87,5 +256,19 @@ def analyze():
         print(f"Analysis for {gen} complete. Plot saved as {filename}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plot benchmark results; reads the results store, or results.csv without one.")
+    parser.add_argument("--db", default="results.db")
+    parser.add_argument("--run", type=int, default=None, help="Run id to plot (default: the latest)")
+    parser.add_argument("--csv", default="results.csv", help="Read this CSV when there is no results store")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Flag a fitted scaling exponent whose CI lies above 1 + this (in cells)")
+    parser.add_argument("--list", action="store_true", help="List the stored runs")
+    parser.add_argument("--compare", type=int, nargs=2, metavar=("RUN_A", "RUN_B"), help="Compare the median times of two stored runs")
+    args = parser.parse_args()
 
-    analyze()
+    if args.list:
+        list_runs(args.db)
+    elif args.compare:
+        compare_runs(args.db, *args.compare)
+    else:
+        analyze(args.db, args.run, args.csv, args.tolerance)
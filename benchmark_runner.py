@@ -1,9 +1,15 @@
+import math
 import time
 import csv
 import sys
 import os
+import random
+import signal
+import argparse
+import pstats
 import psutil
 import multiprocessing
+from collections import Counter
 from model.grid import Grid
 from model.generators.recursive_backtracker import RecursiveBacktracker
 from model.generators.prims import PrimsAlgorithm
@@ -12,13 +18,56 @@ from model.solvers.dfs import DFS
 from model.solvers.astar import AStar
 from model.solvers.dijkstra import Dijkstra
 from model.solvers.wall_follower import WallFollower
+from model.execution import EXECUTION_MODES, DEFAULT_CHUNK_SIZE, execute_generator
+from model.microbench import bench_generator, bench_solver, solver_peak_kb, solve_within, summarize, pin_worker
+from model.checkpoint import BenchmarkCheckpoint
+from model.opcount import OP_COUNTERS, count_ops
+from model.telemetry import init_telemetry, publish, TelemetryState, ConsoleDashboard
+from model.results_store import ResultsStore
+from model.profiling import SamplingProfiler, profile_call, sample_for, self_counts, write_collapsed
+from model.registry import GENERATORS, SOLVERS
+from model.scheduler import CostModel, order_tasks, relative_ci, plan_round
+from model.portfolio import SolverPortfolio, win_rate_table
+from model.solvers.parallel_bfs import bfs_distances, parallel_bfs_distances
 
 # Increased recursion limit for deep mazes in all processes
 sys.setrecursionlimit(10**7)
 
+SOLVER_NAMES = ["BFS", "DFS", "AStar", "Dijkstra", "WallFollower"]
+GENERATOR_NAMES = ["RecursiveBacktracker", "Prims"]
+
+# Per worker: smallest size at which each (generator, solver) timed out, shared by all workers
+_timed_out = None
+
+def init_worker(timed_out, pin_counter=None, telemetry=None):
+    global _timed_out
+    _timed_out = timed_out
+    # Ctrl-C is the parent's to handle: it saves the checkpoint and terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_telemetry(telemetry)
+    if pin_counter is not None:
+        pin_worker(pin_counter)
+
+def _timeout_slot(gen_name, solver_name):
+    return GENERATOR_NAMES.index(gen_name) * len(SOLVER_NAMES) + SOLVER_NAMES.index(solver_name)
+
 def run_single_iteration(args):
-    """Worker function to run a single benchmark iteration."""
-    gen_name, size, iteration = args
+    """
+    Worker function to run a single benchmark iteration: times the generator on fresh grids,
+    then every solver on the last maze generated, each with warmup and `repeats` timed runs
+    (GC collected before and disabled during each). Times are the medians of the runs.
+    Each solver's peak allocation is measured in one extra, untimed run under tracemalloc, and
+    its operation counts (see model.opcount) in another. The mazes come from `seed`, so a task gives the same mazes wherever and whenever it runs.
+    
+    With a `timeout` (seconds), the first untimed run of each solver is a chunked solve() that
+    gives up after `timeout`; the solver is then recorded as "timeout" and, in every worker,
+    "skipped" on this generator's mazes of the same or larger size.
+    """
+    gen_name, size, iteration, seed, mode, chunk_size, warmup, repeats, timeout = args
+    task_start = time.perf_counter()
+    label = f"{gen_name} {size}x{size} seed {seed}"
+    publish("task_start", f"{label}: generate")
+    random.seed(seed)
     
     # Instantiate generators and solvers inside the worker process
     solvers = {
@@ -40,80 +89,550 @@ def run_single_iteration(args):
     
     rows, cols = size, size
     
-    # Generate a new maze for this iteration
+    # Time the generator on fresh grids, then solve the seed's own maze: regenerated (untimed)
+    # right after seeding, so it doesn't depend on --warmup/--repeats and --profile sees the same one
+    gen_samples, _ = bench_generator(generator, rows, cols, mode, chunk_size, warmup, repeats)
+    gen_stats = summarize(gen_samples)
+    random.seed(seed)
     grid = Grid(rows, cols)
-    gen = generator.generate(grid)
-    for _ in gen: pass # Run to completion
+    execute_generator(generator, grid, mode, chunk_size)
     
     start_cell = grid.get_cell(0, 0)
     end_cell = grid.get_cell(cols - 1, rows - 1)
     
     for name, solver in solvers.items():
-        grid.reset_visited()
-        
-        start_time = time.perf_counter_ns()
-        
-        # Run WITHOUT visualization for max speed and accurate timing
-        solve_gen = solver.solve(grid, start_cell, end_cell, visualize=False)
-        try:
-            while True:
-                next(solve_gen)
-        except StopIteration as e:
-            results_dict = e.value
-        
-        end_time = time.perf_counter_ns()
-        duration_ms = (end_time - start_time) / 1_000_000
-        mem_kb = process.memory_info().rss / 1024
-        
-        results.append({
+        publish("task_step", f"{label}: {name}")
+        row = {
             "generator": gen_name,
             "size": size,
             "iteration": iteration,
+            "seed": seed,
             "algorithm": name,
-            "time_ms": duration_ms,
+            "mode": mode,
+            "status": "ok",
+            "repeats": repeats,
+            "gen_time_ms": gen_stats["median"],
+        }
+        results.append(row)
+        
+        solver_warmup = warmup
+        if timeout:
+            slot = _timeout_slot(gen_name, name)
+            if _timed_out is not None and 0 < _timed_out[slot] <= size:
+                row["status"] = "skipped"
+                continue
+            if solve_within(solver, grid, start_cell, end_cell, timeout, chunk_size) is None:
+                row["status"] = "timeout"
+                if _timed_out is not None:
+                    with _timed_out.get_lock():
+                        if _timed_out[slot] == 0 or size < _timed_out[slot]:
+                            _timed_out[slot] = size
+                continue
+            solver_warmup = max(0, warmup - 1) # The probe already warmed up
+        
+        # Run WITHOUT visualization for max speed and accurate timing
+        samples, results_dict = bench_solver(solver, grid, start_cell, end_cell, mode, chunk_size, solver_warmup, repeats)
+        stats = summarize(samples)
+        peak_kb = solver_peak_kb(solver, grid, start_cell, end_cell, mode, chunk_size)
+        mem_kb = process.memory_info().rss / 1024 # Whole process, for reference
+        
+        row.update({
+            "time_ms": stats["median"],
+            "time_q1_ms": stats["q1"],
+            "time_q3_ms": stats["q3"],
             "path_len": len(results_dict["path"]),
             "visited_count": results_dict["visited_count"],
             "peak_frontier": results_dict["peak_frontier"],
-            "memory_kb": mem_kb
+            "working_set": results_dict["working_set"],
+            "peak_alloc_kb": peak_kb,
+            "memory_kb": mem_kb,
+            **count_ops(solver, grid, start_cell, end_cell)
         })
     
+    # Whole task wall time, for the scheduler's cost model
+    task_ms = (time.perf_counter() - task_start) * 1000
+    for row in results:
+        row["task_ms"] = task_ms
+    publish("task_end", label)
     return results
 
-def run_benchmark(sizes=[100, 250, 500, 750, 1000], iterations=50):
-    generators = ["RecursiveBacktracker", "Prims"]
+def print_summary(results):
+    """
+    Per generator, size and algorithm: median over the iterations (one maze each) with the
+    interquartile range, 95% confidence interval of the median and outlier mazes.
+    Solvers that timed out or were skipped are counted separately.
+    """
+    groups = {}
+    dropped = {}
+    for row in results:
+        # Generation first; it has one time per maze, repeated on every solver row
+        algos = groups.setdefault((row["generator"], int(row["size"])), {"(generate)": {}})
+        algos["(generate)"][row["seed"]] = float(row["gen_time_ms"])
+        if row["status"] != "ok":
+            key = (row["generator"], int(row["size"]), row["algorithm"])
+            dropped[key] = dropped.get(key, 0) + 1
+            continue
+        algos.setdefault(row["algorithm"], {})[row["seed"]] = float(row["time_ms"])
     
-    tasks = []
-    for gen_name in generators:
+    print(f"\n{'generator':<22}{'size':>6}{'algorithm':>14}{'median':>10}{'IQR':>9}{'95% CI':>20}{'n':>5}  outliers")
+    for (gen_name, size), algos in sorted(groups.items()):
+        for name, times in algos.items():
+            st = summarize(list(times.values()))
+            ci = f"{st['ci_low']:.2f}-{st['ci_high']:.2f}"
+            flag = ", ".join(f"{t:.2f}" for t in st["outliers"])
+            print(f"{gen_name:<22}{size:>6}{name:>14}{st['median']:>10.2f}{st['iqr']:>9.2f}{ci:>20}{st['n']:>5}  {flag}")
+    for (gen_name, size, name), n in sorted(dropped.items()):
+        print(f"{gen_name:<22}{size:>6}{name:>14}  timed out or skipped on {n} mazes")
+
+def print_op_mix(results):
+    """Mean operation counts per solve at each generator's largest size, next to the median time."""
+    results = list(results)
+    largest = {}
+    for row in results:
+        largest[row["generator"]] = max(largest.get(row["generator"], 0), int(row["size"]))
+    groups = {}
+    for row in results:
+        if row["status"] == "ok" and int(row["size"]) == largest[row["generator"]] and row["neighbor_queries"] != "":
+            groups.setdefault((row["generator"], int(row["size"]), row["algorithm"]), []).append(row)
+    if not groups:
+        return
+    
+    short = {"neighbor_queries": "nbr_q", "cell_lookups": "cells", "wall_checks": "walls", "frontier_pushes": "push",
+             "frontier_pops": "pop", "stale_pops": "stale", "label_writes": "labels", "path_steps": "path"}
+    print(f"\nOperation mix per solve (mean over mazes, largest size)")
+    print(f"{'generator':<22}{'size':>6}{'algorithm':>14}{'median ms':>11}" + "".join(f"{short[c]:>9}" for c in OP_COUNTERS))
+    for (gen_name, size, name), rows in sorted(groups.items()):
+        median = summarize([float(r["time_ms"]) for r in rows])["median"]
+        means = "".join(f"{sum(float(r[c]) for r in rows) / len(rows):>9.0f}" for c in OP_COUNTERS)
+        print(f"{gen_name:<22}{size:>6}{name:>14}{median:>11.2f}{means}")
+
+RESULT_FIELDS = ["generator", "size", "iteration", "seed", "algorithm", "mode", "status", "time_ms", "time_q1_ms",
+                 "time_q3_ms", "repeats", "gen_time_ms", "path_len", "visited_count", "peak_frontier",
+                 "working_set", "peak_alloc_kb", "memory_kb", *OP_COUNTERS, "task_ms"]
+
+def run_benchmark(sizes=[100, 250, 500, 750, 1000], iterations=50, mode="run", chunk_size=DEFAULT_CHUNK_SIZE,
+                  warmup=1, repeats=5, pin=False, seed=0, out="results.csv", flush_every=10, fresh=False,
+                  budget=None, target_ci=0.05, min_iterations=3, timeout=None, db="results.db"):
+    """
+    Streams results to a checkpoint directory next to `out` (<out without .csv>.parts/) as
+    tasks finish, flushing a chunk file every `flush_every` tasks. A (generator, size, seed)
+    task already in the checkpoint is skipped, so an interrupted run continues where it
+    stopped when restarted with the same settings (or extended with more sizes/iterations).
+    `out` is rebuilt from all checkpointed rows at the end. The rows not yet in the SQLite
+    results store `db` (those of this invocation and of an interrupted one it resumed, but not
+    those of a finished run it extends) are stored there as a new run, unless there are none
+    or `db` is None.
+    
+    Tasks are handed to the pool one at a time, largest predicted cost first (see
+    model.scheduler). Without a `budget` every generator/size gets `iterations` mazes. With a
+    `budget` (seconds of wall time) the run goes in rounds: a pilot on the two smallest sizes
+    fits the cost model, then each round adds mazes to the groups whose median CI is still
+    wider than `target_ci` (relative), between `min_iterations` and `iterations`, as far as the
+    predicted cost fits in the remaining budget.
+    """
+    generators = GENERATOR_NAMES
+    
+    parts_dir = os.path.splitext(out)[0] + ".parts"
+    config = {"mode": mode, "chunk_size": chunk_size, "warmup": warmup, "repeats": repeats, "timeout": timeout}
+    checkpoint = BenchmarkCheckpoint(parts_dir, config, RESULT_FIELDS, fresh)
+    groups = [(gen_name, size) for gen_name in generators for size in sizes]
+    
+    def count_done():
+        counts = {}
+        for gen_name, size, _ in checkpoint.done:
+            counts[(gen_name, size)] = counts.get((gen_name, size), 0) + 1
+        return counts
+    
+    def make_tasks(plan):
+        # plan: {(generator, size): mazes wanted in total}; seeds count up from `seed`
+        tasks = []
+        for (gen_name, size), n in plan.items():
+            for i in range(n):
+                if not checkpoint.is_done((gen_name, size, seed + i)):
+                    tasks.append((gen_name, size, i, seed + i, mode, chunk_size, warmup, repeats, timeout))
+        return order_tasks(tasks, model)
+    
+    model = CostModel()
+    model.fit(checkpoint.rows())
+    skipped = len(checkpoint.done)
+    processes = multiprocessing.cpu_count()
+    print(f"Starting Scalability Benchmark with {processes} cores...")
+    if skipped:
+        print(f"Resuming from {parts_dir}: {skipped} finished iterations kept")
+    
+    # Use a Process Pool to run tasks in parallel (optionally one CPU per worker)
+    timed_out = multiprocessing.Array('i', len(GENERATOR_NAMES) * len(SOLVER_NAMES))
+    telemetry = multiprocessing.Queue()
+    initargs = (timed_out, multiprocessing.Value('i', 0) if pin else None, telemetry)
+    started = time.perf_counter()
+    try:
+        with multiprocessing.Pool(processes, initializer=init_worker, initargs=initargs) as pool:
+            def run_tasks(tasks, label):
+                if not tasks:
+                    return
+                total_tasks = len(tasks)
+                print(f"{label}: {total_tasks} iterations to run (mode: {mode}, {warmup} warmup + {repeats} timed runs each)")
+                state = TelemetryState(total_tasks)
+                dashboard = ConsoleDashboard(state)
+                # chunksize=1: one task per hand-out, so the order holds and no worker sits on a backlog
+                results = pool.imap_unordered(run_single_iteration, tasks, chunksize=1)
+                for _ in range(total_tasks):
+                    while True:
+                        try:
+                            task_results = results.next(timeout=dashboard.interval)
+                            break
+                        except multiprocessing.TimeoutError:
+                            # Nothing finished yet: keep the dashboard live
+                            state.drain(telemetry)
+                            dashboard.update()
+                    first = task_results[0]
+                    checkpoint.add((first["generator"], first["size"], first["seed"]), task_results)
+                    if checkpoint.pending >= flush_every:
+                        checkpoint.flush()
+                    state.drain(telemetry)
+                    dashboard.update()
+                state.catch_up(telemetry)
+                dashboard.update(force=True)
+                checkpoint.flush()
+            
+            if budget is None:
+                run_tasks(make_tasks({key: iterations for key in groups}), "Benchmark")
+            else:
+                if not model.fitted:
+                    pilot_sizes = sorted(sizes)[:2]
+                    run_tasks(make_tasks({(g, s): 1 for g, s in groups if s in pilot_sizes}), "Pilot")
+                for rnd in range(1, 100):
+                    model.fit(checkpoint.rows())
+                    capacity_ms = (budget - (time.perf_counter() - started)) * 1000 * processes
+                    counts = count_done()
+                    plan = plan_round(groups, counts, relative_ci(checkpoint.rows()), model, capacity_ms,
+                                      target_ci, min_iterations, iterations)
+                    if not plan:
+                        break
+                    print(f"Cost model: {model.describe()}")
+                    run_tasks(make_tasks({key: counts.get(key, 0) + n for key, n in plan.items()}), f"Round {rnd}")
+                
+                widths = relative_ci(checkpoint.rows())
+                counts = count_done()
+                for key in groups:
+                    if widths.get(key, math.inf) > target_ci:
+                        print(f"  {key[0]} {key[1]}: CI +-{widths.get(key, math.inf) * 100:.1f}% with {counts.get(key, 0)} mazes (budget or --iterations reached)")
+    except KeyboardInterrupt:
+        signal.signal(signal.SIGINT, signal.SIG_IGN) # A second Ctrl-C must not cut the save short
+        checkpoint.flush()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        print(f"\nInterrupted. {len(checkpoint.done)} finished iterations are saved in {parts_dir}; run the same command again to resume.")
+        return
+    finally:
+        # Also on a crash: keep everything that finished
+        checkpoint.flush()
+    
+    print(f"Benchmarking complete in {time.perf_counter() - started:.1f}s. Saving results...")
+    rows = checkpoint.merge(out)
+    print(f"Results saved to {out} ({rows} rows)")
+    if db and checkpoint.unstored:
+        earlier = checkpoint.stored
+        store = ResultsStore(db)
+        run_id = store.add_run(checkpoint.rows(earlier), seed, config)
+        store.close()
+        checkpoint.mark_stored()
+        extends = f" (extends a run already stored: {earlier} earlier chunks left out)" if earlier else ""
+        print(f"Stored as run {run_id} in {db}{extends}")
+    print_summary(checkpoint.rows())
+    print_op_mix(checkpoint.rows())
+
+def run_portfolio(sizes=[100, 250, 500], iterations=10, solver_names=("DFS", "AStar", "WallFollower")):
+    """Races the portfolio solvers on fresh mazes and prints the accumulated win-rate table."""
+    generators = {"RecursiveBacktracker": RecursiveBacktracker(), "Prims": PrimsAlgorithm()}
+    portfolio = SolverPortfolio(solver_names)
+    print(f"Racing {', '.join(solver_names)} on {len(generators) * len(sizes) * iterations} mazes...")
+    
+    try:
+        for gen_name, generator in generators.items():
+            for size in sizes:
+                for i in range(iterations):
+                    grid = Grid(size, size)
+                    generator.run(grid)
+                    res = portfolio.solve(grid, grid.get_cell(0, 0), grid.get_cell(size - 1, size - 1), gen_name)
+                    winner = res["winner"] if res else "none"
+                    latency = f"{res['latency_ms']:.1f}ms" if res else "-"
+                    print(f"{gen_name} {size}x{size} #{i+1}: {winner} ({latency})")
+    finally:
+        portfolio.close()
+    
+    print(f"\nWin rates ({portfolio.log_path}):")
+    for gen_name, rates in win_rate_table(portfolio.log_path).items():
+        print(f"  {gen_name}: " + ", ".join(f"{name} {rate*100:.0f}%" for name, rate in rates.items()))
+
+def run_parallel_bfs(sizes=[250, 500, 1000], worker_counts=(1, 2, 4, 8), repeats=3):
+    """
+    Reports speedup and parallel efficiency of the strip-partitioned BFS against
+    BFS.run (object grid) and the single-process vectorized BFS (wall array).
+    Times are the median of `repeats` runs and include worker process startup.
+    """
+    generators = {"RecursiveBacktracker": RecursiveBacktracker(), "Prims": PrimsAlgorithm()}
+    rows_out = []
+    print(f"Parallel BFS scaling ({multiprocessing.cpu_count()} cores)")
+    print(f"{'generator':<22}{'size':>6}{'solver':>14}{'time_ms':>11}{'vs BFS':>9}{'vs vec':>9}{'eff':>7}")
+    
+    def median_ms(fn):
+        times = []
+        for _ in range(repeats):
+            start_time = time.perf_counter_ns()
+            fn()
+            times.append((time.perf_counter_ns() - start_time) / 1_000_000)
+        return sorted(times)[len(times) // 2]
+    
+    for gen_name, generator in generators.items():
         for size in sizes:
-            for i in range(iterations):
-                tasks.append((gen_name, size, i))
+            grid = Grid(size, size)
+            generator.run(grid)
+            start_cell, end_cell = grid.get_cell(0, 0), grid.get_cell(size - 1, size - 1)
+            walls = grid.wall_array().ravel()
+            
+            bfs_ms = median_ms(lambda: BFS().run(grid, start_cell, end_cell))
+            vec_ms = median_ms(lambda: bfs_distances(walls, size, start_cell.id, end_cell.id))
+            timings = [("BFS", 0, bfs_ms), ("Vectorized", 1, vec_ms)]
+            for workers in worker_counts:
+                par_ms = median_ms(lambda: parallel_bfs_distances(walls, size, size, start_cell.id, end_cell.id, workers))
+                timings.append(("ParallelBFS", workers, par_ms))
+            
+            for algo, workers, ms in timings:
+                vs_vec = vec_ms / ms
+                row = {
+                    "generator": gen_name, "size": size, "algorithm": algo, "workers": workers, "time_ms": ms,
+                    "speedup_vs_bfs": bfs_ms / ms, "speedup_vs_vectorized": vs_vec,
+                    "efficiency": vs_vec / workers if algo == "ParallelBFS" else ""
+                }
+                rows_out.append(row)
+                eff = f"{row['efficiency']:.2f}" if row["efficiency"] != "" else "-"
+                label = f"{workers} workers" if algo == "ParallelBFS" else algo
+                print(f"{gen_name:<22}{size:>6}{label:>14}{ms:>11.1f}{row['speedup_vs_bfs']:>9.2f}{vs_vec:>9.2f}{eff:>7}")
+    
+    with open("parallel_bfs.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows_out[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows_out)
+    print("Results saved to parallel_bfs.csv")
+
+def run_render(sizes=[100, 250, 500, 750, 1000], repeats=5):
+    """
+    Compares full-frame draw time of the per-cell renderer against the NumPy raster
+    renderer on a headless window, with a maze half explored by BFS and the view fitted
+    to the window. Both paths only draw the cells inside the viewport.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from view.renderer import Renderer
+    from model.events import DeltaStream
     
-    total_tasks = len(tasks)
-    print(f"Starting Scalability Benchmark with {multiprocessing.cpu_count()} cores...")
-    print(f"Total iterations to run: {total_tasks}")
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    rows_out = []
+    print(f"{'size':>6}{'cells':>10}{'zoom':>8}{'cells_ms':>11}{'raster_ms':>11}{'speedup':>9}")
     
-    results = []
+    for size in sizes:
+        grid = Grid(size, size)
+        RecursiveBacktracker().run(grid)
+        renderer = Renderer(screen)
+        events = DeltaStream()
+        events.subscribe(renderer.state_array(grid))
+        solve_gen = BFS().solve(grid, grid.get_cell(0, 0), grid.get_cell(size - 1, size - 1), events=events, step_size=size * size // 2)
+        next(solve_gen, None)
+        
+        renderer.MIN_CELL_SIZE = 1 # Keep the per-cell path measurable below 4px cells
+        times = {}
+        for raster in (False, True):
+            renderer.set_raster_mode(raster)
+            renderer.fit_view()
+            renderer.draw_grid(grid) # Builds the retained layers / raster surfaces once
+            if not raster and renderer.block > 1:
+                # The per-cell path has no overview: draw 1px cells, off-screen ones are culled
+                renderer.camera.fitted = False
+                renderer.camera.cell_size, renderer.camera.block = 1, 1
+                renderer.draw_grid(grid)
+            samples = []
+            for _ in range(repeats):
+                if not raster:
+                    renderer.invalidate() # Per-cell path: the cost of redrawing every cell
+                start_time = time.perf_counter_ns()
+                renderer.draw_grid(grid)
+                samples.append((time.perf_counter_ns() - start_time) / 1_000_000)
+            times[raster] = sorted(samples)[len(samples) // 2]
+        
+        zoom = f"1/{renderer.block}" if renderer.block > 1 else f"{renderer.cell_size}px"
+        row = {"size": size, "cells": size * size, "zoom": zoom,
+               "cells_ms": times[False], "raster_ms": times[True], "speedup": times[False] / times[True]}
+        rows_out.append(row)
+        print(f"{size:>6}{row['cells']:>10}{zoom:>8}{row['cells_ms']:>11.1f}{row['raster_ms']:>11.1f}{row['speedup']:>9.1f}")
     
-    # Use a Process Pool to run tasks in parallel
-    with multiprocessing.Pool() as pool:
-        # Use imap_unordered for slightly better performance and to show progress
-        count = 0
-        for task_results in pool.imap_unordered(run_single_iteration, tasks):
-            results.extend(task_results)
-            count += 1
-            if count % 10 == 0 or count == total_tasks:
-                print(f"Progress: {count}/{total_tasks} iterations complete ({(count/total_tasks)*100:.1f}%)", end='\r')
-    
-    print("\nBenchmarking complete. Saving results...")
-    
-    # Save to CSV
-    with open("results.csv", "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["generator", "size", "iteration", "algorithm", "time_ms", "path_len", "visited_count", "peak_frontier", "memory_kb"])
+    pygame.quit()
+    with open("render_times.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows_out[0].keys()))
         writer.writeheader()
-        writer.writerows(results)
+        writer.writerows(rows_out)
+    print("Results saved to render_times.csv")
+
+def parse_profile_spec(spec):
+    """'GENERATOR:SOLVER:SIZE' with '*' for any; SOLVER may be 'generate' to profile the generator."""
+    parts = spec.split(":")
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"profile spec must be GENERATOR:SOLVER:SIZE (use * for any), got {spec!r}")
+    return tuple(parts)
+
+def _spec_matches(spec, gen_name, name, size):
+    return all(want == "*" or want == have for want, have in zip(spec, (gen_name, name, str(size))))
+
+def profile_task(args):
+    """
+    Worker for --profile: builds the seeded maze, then runs each selected solver once under
+    cProfile (stats dumped to out_dir/tasks/) and repeatedly under the sampling profiler for
+    at least `sample_seconds`. Returns {name: (pstats path, collapsed stacks, sampled runs)}.
+    """
+    gen_name, size, seed, names, out_dir, sample_seconds, interval = args
+    random.seed(seed)
+    generator = GENERATORS[gen_name]()
+    tag = f"{gen_name}_{size}_{seed}"
+    profiled = {}
+    
+    def generate(_=None):
+        grid = Grid(size, size)
+        generator.run(grid)
+        return grid
     
-    print("Results saved to results.csv")
+    if "generate" in names:
+        path = os.path.join(out_dir, "tasks", f"generate_{tag}.prof")
+        profile_call(generate, path)
+        sampler = SamplingProfiler(interval)
+        runs = sample_for(sampler, generate, sample_seconds)
+        profiled["generate"] = (path, sampler.collapsed(), runs)
+    
+    # Profiling generate() used up the seeded random stream: reseed so the solvers get the benchmark's maze
+    random.seed(seed)
+    grid = generate()
+    start_cell, end_cell = grid.get_cell(0, 0), grid.get_cell(size - 1, size - 1)
+    for name in names:
+        if name == "generate":
+            continue
+        solver = SOLVERS[name]()
+        def solve():
+            grid.reset_visited()
+            return solver.run(grid, start_cell, end_cell)
+        path = os.path.join(out_dir, "tasks", f"{name}_{tag}.prof")
+        profile_call(solve, path)
+        sampler = SamplingProfiler(interval)
+        runs = sample_for(sampler, solve, sample_seconds)
+        profiled[name] = (path, sampler.collapsed(), runs)
+    return profiled
+
+def _short_name(func):
+    """pstats key (file, line, function) -> module.function, or the builtin's own description."""
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{os.path.splitext(os.path.basename(filename))[0]}.{name}:{line}"
+
+def run_profile(specs, sizes=[100, 250, 500], iterations=2, seed=0, out_dir="profiles", sample_seconds=0.5,
+                interval=0.001, top=8):
+    """
+    Profiles the (generator, solver, size) combinations matched by `specs` on `iterations`
+    seeded mazes each, in the process pool. Per algorithm, the workers' profiles are merged:
+    cProfile stats into out_dir/<algorithm>.prof and sampled stacks into
+    out_dir/<algorithm>.collapsed (for flamegraph tools), and the top hotspots are printed.
+    """
+    tasks = []
+    for gen_name in GENERATOR_NAMES:
+        for size in sizes:
+            names = [n for n in ["generate"] + SOLVER_NAMES if any(_spec_matches(sp, gen_name, n, size) for sp in specs)]
+            if names:
+                tasks += [(gen_name, size, seed + i, names, out_dir, sample_seconds, interval) for i in range(iterations)]
+    if not tasks:
+        print("No task matches the profile specs.")
+        return
+    
+    print(f"Profiling {len(tasks)} mazes...")
+    prof_files, stacks, runs = {}, {}, {}
+    with multiprocessing.Pool() as pool:
+        for profiled in pool.imap_unordered(profile_task, tasks, chunksize=1):
+            for name, (path, collapsed, n) in profiled.items():
+                prof_files.setdefault(name, []).append(path)
+                stacks.setdefault(name, Counter()).update(collapsed)
+                runs[name] = runs.get(name, 0) + n
+    
+    for name in ["generate"] + SOLVER_NAMES:
+        if name not in prof_files:
+            continue
+        stats = pstats.Stats(*prof_files[name])
+        stats.dump_stats(os.path.join(out_dir, f"{name}.prof"))
+        write_collapsed(os.path.join(out_dir, f"{name}.collapsed"), stacks[name])
+        
+        print(f"\n{name}: {len(prof_files[name])} profiled runs, {runs[name]} sampled runs")
+        print(f"  {'cProfile (exclusive)':<62}{'calls':>10}{'tottime s':>11}{'cumtime s':>11}")
+        hot = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        for func, (_, calls, tottime, cumtime, _) in hot:
+            print(f"  {_short_name(func)[:60]:<62}{calls:>10}{tottime:>11.3f}{cumtime:>11.3f}")
+        leaves = self_counts(stacks[name])
+        total = sum(leaves.values())
+        if not total:
+            print(f"  WARNING: no samples were collected for {name}; raise --sample-seconds or profile a larger size")
+            continue
+        print(f"  {'sampled (self)':<62}{'samples':>10}{'share':>11}")
+        for leaf, count in leaves.most_common(top):
+            print(f"  {leaf[:60]:<62}{count:>10}{count / total:>11.1%}")
+    print(f"\nMerged profiles in {out_dir}/: <algorithm>.prof (pstats, e.g. snakeviz) and "
+          "<algorithm>.collapsed (flamegraph.pl, speedscope)")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless scalability benchmark for all solvers.")
     # Testing sizes as requested
-    run_benchmark(sizes=[100, 250, 500, 750, 1000], iterations=5)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500, 750, 1000])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--mode", choices=EXECUTION_MODES, default="run",
+                        help="run: non-generator fast path, step: yield per expansion, chunk: yield every --chunk-size expansions")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before timing each generator/solver")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per generator/solver and maze (the median is recorded)")
+    parser.add_argument("--pin", action="store_true", help="Pin each pool worker to its own CPU")
+    parser.add_argument("--seed", type=int, default=0, help="Maze seed of the first iteration (iteration i uses seed + i)")
+    parser.add_argument("--out", default="results.csv")
+    parser.add_argument("--flush-every", type=int, default=10, help="Finished iterations per checkpoint chunk")
+    parser.add_argument("--fresh", action="store_true", help="Discard the checkpoint of an earlier run instead of resuming it")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Wall-clock seconds: choose mazes per size adaptively (--iterations is then the maximum)")
+    parser.add_argument("--target-ci", type=float, default=0.05,
+                        help="With --budget: stop adding mazes once every median's 95%% CI is within this fraction")
+    parser.add_argument("--min-iterations", type=int, default=3, help="With --budget: mazes per generator and size before adapting")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Seconds per solve; a solver over it is skipped on that generator's larger mazes")
+    parser.add_argument("--db", default="results.db", help="SQLite results store that keeps every run (empty to skip)")
+    parser.add_argument("--profile", type=parse_profile_spec, nargs="*", metavar="GEN:SOLVER:SIZE",
+                        help="Profile the matching tasks instead of benchmarking (e.g. '*:AStar:500'; no spec = all)")
+    parser.add_argument("--profile-dir", default="profiles")
+    parser.add_argument("--sample-seconds", type=float, default=0.5,
+                        help="With --profile: minimum time each solver is run under the sampling profiler per maze")
+    parser.add_argument("--portfolio", action="store_true",
+                        help="Race DFS/AStar/WallFollower per maze and log the winner instead of benchmarking")
+    parser.add_argument("--parallel-bfs", action="store_true",
+                        help="Report ParallelBFS speedup/efficiency for 1, 2, 4 and 8 workers")
+    parser.add_argument("--render", action="store_true",
+                        help="Compare per-cell and NumPy raster frame times per grid size (headless)")
+    args = parser.parse_args()
+    
+    if args.profile is not None:
+        run_profile(args.profile or [("*", "*", "*")], sizes=args.sizes, iterations=args.iterations, seed=args.seed,
+                    out_dir=args.profile_dir, sample_seconds=args.sample_seconds)
+        sys.exit(0)
+    if args.render:
+        run_render(sizes=args.sizes)
+        sys.exit(0)
+    if args.parallel_bfs:
+        run_parallel_bfs(sizes=args.sizes)
+        sys.exit(0)
+    if args.portfolio:
+        run_portfolio(sizes=args.sizes, iterations=args.iterations)
+        sys.exit(0)
+    
+    run_benchmark(sizes=args.sizes, iterations=args.iterations, mode=args.mode, chunk_size=args.chunk_size,
+                  warmup=args.warmup, repeats=args.repeats, pin=args.pin, seed=args.seed, out=args.out,
+                  flush_every=args.flush_every, fresh=args.fresh, budget=args.budget, target_ci=args.target_ci,
+                  min_iterations=args.min_iterations, timeout=args.timeout, db=args.db)
@@ -0,0 +1,195 @@
+import sys
+import json
+import random
+import statistics
+import platform
+import argparse
+from model.grid import Grid
+from model.registry import GENERATORS, SOLVERS
+from model.execution import execute_generator
+from model.microbench import (measure, bench_solver, peak_alloc_kb, solver_peak_kb, summarize,
+                              mann_whitney_greater)
+
+# Increased recursion limit for deep mazes
+sys.setrecursionlimit(10**7)
+
+# Fixed, seeded workload: the same mazes are generated and solved on every run. The matrix is
+# run `rounds` times, so the timed samples are spread out instead of coming from one stretch.
+WORKLOAD = {
+    "generators": list(GENERATORS),
+    "solvers": list(SOLVERS),
+    "sizes": [40, 80],
+    "seeds": [1, 2, 3],
+    "rounds": 3,
+    "warmup": 1,
+    "repeats": 3,
+}
+
+def calibration_loop(_):
+    """Fixed pure-Python work (dict and list traffic, like the solvers) that never changes with the code."""
+    seen = {}
+    order = []
+    for i in range(50_000):
+        key = (i * 7919) % 50_021
+        if key not in seen:
+            seen[key] = i
+            order.append(key)
+    return len(order)
+
+def calibrate(warmup, repeats):
+    """Median ms of the calibration loop: the machine's current speed."""
+    samples, _ = measure(calibration_loop, None, warmup, repeats)
+    return summarize(samples)["median"]
+
+def seeded_grid(seed, size):
+    random.seed(seed)
+    return Grid(size, size)
+
+def collect(workload):
+    """
+    Runs the workload and returns {"<generator>/<size>/<algorithm>": metrics}, where metrics
+    holds the timed samples of every seed and round (time_ms), nodes expanded summed over the
+    seeds (visited, solvers only) and the largest peak allocation of any seed (peak_kb, each
+    the smallest of three traced runs).
+    Generation itself is measured under the algorithm name "generate".
+
+    Every generator/size block is bracketed by runs of a fixed calibration loop; each sample's
+    block calibration is kept alongside it (calibration_ms), so timings can be compared
+    across machine speed drift.
+    """
+    entries = {}
+    warmup, repeats = workload["warmup"], workload["repeats"]
+    for rnd in range(workload["rounds"]):
+        first = rnd == 0 # Deterministic metrics are taken once
+        for gen_name in workload["generators"]:
+            generator = GENERATORS[gen_name]()
+            def run(grid):
+                execute_generator(generator, grid)
+                return grid
+            for size in workload["sizes"]:
+                calibration = calibrate(warmup, repeats)
+                block = {}
+                gen_entry = block[f"{gen_name}/{size}/generate"] = entries.setdefault(
+                    f"{gen_name}/{size}/generate", {"time_ms": [], "calibration_ms": [], "peak_kb": 0.0})
+                for seed in workload["seeds"]:
+                    setup = lambda: seeded_grid(seed, size)
+                    samples, grid = measure(run, setup, warmup, repeats)
+                    gen_entry["time_ms"].extend(samples)
+                    if first:
+                        gen_entry["peak_kb"] = max(gen_entry["peak_kb"], peak_alloc_kb(run, setup, runs=3))
+
+                    start_cell, end_cell = grid.get_cell(0, 0), grid.get_cell(size - 1, size - 1)
+                    for name in workload["solvers"]:
+                        solver = SOLVERS[name]()
+                        entry = block[f"{gen_name}/{size}/{name}"] = entries.setdefault(
+                            f"{gen_name}/{size}/{name}", {"time_ms": [], "calibration_ms": [], "visited": 0, "peak_kb": 0.0})
+                        samples, res = bench_solver(solver, grid, start_cell, end_cell, warmup=warmup, repeats=repeats)
+                        entry["time_ms"].extend(samples)
+                        if first:
+                            entry["visited"] += res["visited_count"]
+                            entry["peak_kb"] = max(entry["peak_kb"], solver_peak_kb(solver, grid, start_cell, end_cell, runs=3))
+
+                calibration = (calibration + calibrate(warmup, repeats)) / 2
+                for entry in block.values():
+                    entry["calibration_ms"].extend([calibration] * (len(entry["time_ms"]) - len(entry["calibration_ms"])))
+        print(f"  round {rnd + 1}/{workload['rounds']} done", file=sys.stderr)
+    return entries
+
+def normalized(entry, reference):
+    """Samples scaled to a machine whose calibration loop takes `reference` ms."""
+    return [t * reference / c for t, c in zip(entry["time_ms"], entry["calibration_ms"])]
+
+def compare(baseline, current, time_threshold, memory_threshold, alpha):
+    """
+    Returns one row per (workload, metric): (key, metric, baseline, current, change, p, status).
+    Both sides' samples are first scaled by their block's calibration time to the baseline's
+    mean calibration, which cancels a faster, slower or busier machine. Time regresses when the
+    scaled median is more than `time_threshold` slower AND a one-sided Mann-Whitney test says the
+    slowdown is significant at `alpha`. Nodes expanded are deterministic for the seeded mazes and
+    regress on any increase. Peak memory regresses beyond `memory_threshold` (plus 1 KB of
+    allocator noise).
+    """
+    rows = []
+    for key, base in baseline.items():
+        cur = current.get(key)
+        if cur is None:
+            rows.append((key, "-", "", "", "", "", "missing"))
+            continue
+
+        reference = statistics.fmean(base["calibration_ms"])
+        base_times = normalized(base, reference)
+        cur_times = normalized(cur, reference)
+        base_med = summarize(base_times)["median"]
+        cur_med = summarize(cur_times)["median"]
+        change = cur_med / base_med - 1 if base_med else 0.0
+        p_slower = mann_whitney_greater(cur_times, base_times)
+        p_faster = mann_whitney_greater(base_times, cur_times)
+        if change > time_threshold and p_slower < alpha:
+            status, p = "REGRESSED", p_slower
+        elif change < -time_threshold and p_faster < alpha:
+            status, p = "faster", p_faster
+        else:
+            status, p = "ok", min(p_slower, p_faster)
+        rows.append((key, "time_ms (scaled median)", f"{base_med:.3f}", f"{cur_med:.3f}", f"{change * 100:+.1f}%", f"{p:.4f}", status))
+
+        if "visited" in base:
+            change = cur["visited"] / base["visited"] - 1 if base["visited"] else 0.0
+            status = "REGRESSED" if cur["visited"] > base["visited"] else ("fewer" if cur["visited"] < base["visited"] else "ok")
+            rows.append((key, "nodes expanded", str(base["visited"]), str(cur["visited"]), f"{change * 100:+.1f}%", "", status))
+
+        change = cur["peak_kb"] / base["peak_kb"] - 1 if base["peak_kb"] else 0.0
+        status = "REGRESSED" if cur["peak_kb"] > base["peak_kb"] * (1 + memory_threshold) + 1 else "ok"
+        rows.append((key, "peak_kb", f"{base['peak_kb']:.1f}", f"{cur['peak_kb']:.1f}", f"{change * 100:+.1f}%", "", status))
+    return rows
+
+def print_table(rows):
+    headers = ("workload", "metric", "baseline", "current", "change", "p", "status")
+    widths = [max(len(str(r[i])) for r in [headers] + rows) for i in range(len(headers))]
+    for row in [headers] + rows:
+        print("  ".join(str(v).ljust(w) if i < 2 else str(v).rjust(w) for i, (v, w) in enumerate(zip(row, widths))))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the seeded benchmark workload and compare it with the stored baseline; exits 1 on a regression.")
+    parser.add_argument("--baseline", default="regression_baseline.json")
+    parser.add_argument("--update", action="store_true", help="Run the workload and overwrite the baseline instead of comparing")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="Allowed median slowdown (fraction, default 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10, help="Allowed peak allocation growth (fraction, default 0.10)")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level of the timing test")
+    parser.add_argument("--all", action="store_true", help="Print every comparison, not just the changed ones")
+    args = parser.parse_args()
+
+    if args.update:
+        print("Running regression workload...", file=sys.stderr)
+        baseline = {
+            "workload": WORKLOAD,
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "entries": collect(WORKLOAD),
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=1)
+        print(f"Baseline saved to {args.baseline} ({len(baseline['entries'])} workloads)")
+        return
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"{args.baseline} not found. Create it with --update.")
+        sys.exit(2)
+
+    # The baseline's own workload, so both sides measure the same mazes
+    print(f"Running regression workload (baseline: Python {baseline['python']} on {baseline['machine']})...", file=sys.stderr)
+    current = collect(baseline["workload"])
+    rows = compare(baseline["entries"], current, args.time_threshold, args.memory_threshold, args.alpha)
+
+    regressions = [r for r in rows if r[-1] in ("REGRESSED", "missing")]
+    shown = rows if args.all else [r for r in rows if r[-1] != "ok"]
+    if shown:
+        print_table(shown)
+    print(f"\n{len(rows)} checks, {len(regressions)} regressions")
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
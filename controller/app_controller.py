@@ -1,5 +1,8 @@
 import os
-import psutil
+import glob
+import time
+import math
+import threading
 import pygame
 from model.grid import Grid
 from model.generators.recursive_backtracker import RecursiveBacktracker
@@ -10,14 +13,22 @@ from model.solvers.astar import AStar
 from model.solvers.dijkstra import Dijkstra
 from model.solvers.wall_follower import WallFollower
 from model.benchmark_service import BenchmarkService
+from model.execution import EXECUTION_MODES
+from model.portfolio import SolverPortfolio
+from model.registry import GENERATORS
+from model.events import DeltaStream, CellStateApplier
+from model.live_stats import MemorySampler
+from model.algorithm_worker import AlgorithmWorker
+from model.trace import TraceRecorder, TracePlayer
 from view.renderer import Renderer
+from controller.frame_profiler import FrameProfiler
 
 class AppController:
     def __init__(self, rows=30, cols=40):
         pygame.init()
         self.rows = rows
         self.cols = cols
-        self.process = psutil.Process(os.getpid())
+        self.memory_sampler = MemorySampler() # RSS sampled in the background, read every frame
         
         # Fixed Window Size
         self.WINDOW_WIDTH = 1280
@@ -28,10 +39,39 @@ class AppController:
         # Speed control
         self.target_fps = 60
         self.steps_per_frame = 1
+        self.chunk_size = 1 # Algorithm steps per generator resume (C toggles chunked stepping)
+        self.CHUNK_SIZE = 10
+        
+        # Stepping mode (TAB cycles): fixed steps per frame, as many steps as fit in a per-frame
+        # compute budget, or a pace that finishes the run in about `finish_seconds`
+        self.STEP_MODES = ["fixed", "budget", "finish"]
+        self.step_mode = "fixed"
+        self.frame_budget_ms = 12 # Of the 16.6ms frame at 60 FPS; the rest is rendering
+        self.finish_seconds = 10
+        self.steps_per_sec = 0.0 # Smoothed achieved rate, shown in the sidebar
+        
+        # Worker process mode (X): algorithms run in a child process that writes shared memory;
+        # the frame loop only reads it and sends pause/resume/speed messages
+        self.use_worker = False
+        self.worker = None
+        self._worker_speed = None
+        
+        # Trace recording (T) and replay (L)
+        self.TRACE_DIR = "traces"
+        self.record_traces = False
+        self.recorder = None
+        self.player = None
+        self.replay_playing = False
+        self.replay_speed = 60.0 # Steps per second ([ / ] halve/double)
+        self.replay_cursor = 0.0
         
         self.clock = pygame.time.Clock()
         self.renderer = Renderer(self.screen)
         
+        # Frame profiler (F11, F10 exports CSV): per-phase timings of the frame loop
+        self.profiler = FrameProfiler()
+        self.PROFILE_CSV = "frame_profile.csv"
+        
         self.grid = Grid(rows, cols)
         
         self.generators = {
@@ -49,6 +89,8 @@ class AppController:
         
         self.current_algo_gen = None
         self.current_algo_name = "None"
+        self.events = None # Delta stream of the running algorithm
+        self.generator_name = "Unknown" # Generator that built the current maze (for portfolio win stats)
         self.running = True
         self.paused = False
         self.elapsed_time = 0.0
@@ -57,8 +99,14 @@ class AppController:
         
         # Benchmark State
         self.benchmark_service = BenchmarkService()
-        self.state = "NORMAL" # NORMAL, BENCHMARKING, BENCHMARK_RESULTS
+        self.state = "NORMAL" # NORMAL, BENCHMARKING, BENCHMARK_RESULTS, REPLAY
         self.benchmark_iterations = 5
+        self.benchmark_mode = "run"
+        
+        # Portfolio race (8): runs in a background thread, result applied by the frame loop
+        self.portfolio = SolverPortfolio()
+        self.portfolio_thread = None
+        self.portfolio_result = None
         
         self.update_grid_endpoints()
 
@@ -73,107 +121,422 @@ class AppController:
         self.rows = max(5, self.rows)
         self.cols = max(5, self.cols)
         
+        self.stop_worker()
+        self.stop_recording()
         self.grid = Grid(self.rows, self.cols)
         self.update_grid_endpoints()
         self.current_algo_gen = None
         self.current_algo_name = "None"
+        self.generator_name = "Unknown"
         self.elapsed_time = 0.0
         self.total_steps = 0
+        self.steps_per_sec = 0.0
+        self.computation_time = 0.0
+
+    def new_event_stream(self):
+        """Creates the delta stream for a new algorithm run and attaches its consumers."""
+        self.events = DeltaStream()
+        self.events.subscribe(CellStateApplier(self.grid))
+        self.events.subscribe(self.renderer.on_deltas)
+        self.events.subscribe(self.renderer.state_array(self.grid))
+        return self.events
+
+    def trace_path(self):
+        """File name for recording the run that is about to start, or None when not recording."""
+        if not self.record_traces:
+            return None
+        os.makedirs(self.TRACE_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.TRACE_DIR, f"{self.current_algo_name}_{self.cols}x{self.rows}_{stamp}.trace")
+
+    def start_recording(self, kind):
+        """Subscribes a TraceRecorder to the new run's stream (call before its first step)."""
+        self.stop_recording()
+        path = self.trace_path()
+        if path:
+            self.recorder = TraceRecorder(path, self.grid, kind, self.current_algo_name,
+                                          self.start_cell.id, self.end_cell.id, self.chunk_size)
+            self.events.subscribe(self.recorder)
+
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close()
+            print(f"Trace saved: {self.recorder.path} ({self.recorder.total_steps} steps)")
+            self.recorder = None
+
+    def start_worker(self, kind, name):
+        """Runs the generator/solver `name` in a worker process, drawing from its shared state."""
+        self.stop_worker()
+        self.current_algo_gen = None
+        self.worker = AlgorithmWorker(kind, name, self.grid, self.start_cell, self.end_cell, self.chunk_size,
+                                      trace_path=self.trace_path())
+        self.renderer.attach_states(self.worker.state)
+        self._worker_speed = None
+        if self.paused:
+            self.worker.pause()
+
+    def stop_worker(self):
+        if self.worker:
+            self.renderer.detach_states()
+            self.worker.close()
+            self.worker = None
+
+    def finish_worker(self):
+        """Copies the worker's final state onto the grid and returns to in-process drawing."""
+        self.worker.apply_to_grid(self.grid)
+        self.stop_worker()
+
+    def start_replay(self, path):
+        """Opens a trace file and switches to replay: the maze is drawn from the player's state."""
+        try:
+            player = TracePlayer(path)
+        except (OSError, ValueError) as e:
+            print(f"Cannot replay {path}: {e}")
+            return
+        self.stop_worker()
+        self.stop_recording()
+        self.current_algo_gen = None
+        self.player = player
+        self.rows, self.cols = player.rows, player.cols
+        self.grid = player.grid
+        self.start_cell = self.grid.cells_by_id[player.meta["start"]]
+        self.end_cell = self.grid.cells_by_id[player.meta["end"]]
+        self.renderer.attach_states(player.state)
+        self.replay_playing = True
+        self.replay_speed = max(60.0, player.total_steps / self.finish_seconds) # Whole trace in about finish_seconds
+        self.elapsed_time = 0.0
         self.computation_time = 0.0
+        self.replay_seek(0)
+        self.state = "REPLAY"
+
+    def open_latest_trace(self):
+        traces = glob.glob(os.path.join(self.TRACE_DIR, "*.trace"))
+        if not traces:
+            print(f"No traces in {self.TRACE_DIR}/ (press T to record the next run)")
+            return
+        self.start_replay(max(traces, key=os.path.getmtime))
+
+    def stop_replay(self):
+        self.renderer.detach_states()
+        self.player.close()
+        self.player = None
+        self.state = "NORMAL"
+        self.reset_grid()
+
+    def replay_seek(self, step):
+        self.replay_cursor = float(self.player.seek(step))
+        self.sync_replay_stats()
+
+    def update_replay(self, dt):
+        if self.replay_playing:
+            self.elapsed_time += dt
+            self.replay_cursor = min(self.replay_cursor + self.replay_speed * dt, float(self.player.total_steps))
+            self.player.seek(int(self.replay_cursor))
+            if self.player.position >= self.player.total_steps:
+                self.replay_playing = False
+        self.sync_replay_stats()
+
+    def sync_replay_stats(self):
+        player = self.player
+        self.total_steps = player.position * player.meta["chunk_size"]
+        self.steps_per_sec = self.replay_speed if self.replay_playing else 0.0
+        current_id = player.state.current_id
+        self.grid.current = self.grid.cells_by_id[current_id] if current_id >= 0 else None
+
+    def replay_info(self):
+        return f"replay {self.replay_speed:.0f} steps/s" + ("" if self.replay_playing else " (paused)")
+
+    def worker_speed(self):
+        """Steps per second for the worker in the current step mode (0: as fast as possible)."""
+        if self.step_mode == "fixed":
+            return self.steps_per_frame * self.target_fps
+        if self.step_mode == "finish":
+            remaining_time = self.finish_seconds - self.elapsed_time
+            if remaining_time <= 0:
+                return 0 # Overdue: flat out
+            return max(1.0, self.estimated_remaining_steps() / remaining_time)
+        return 0
+
+    def update_worker(self, dt):
+        """Frame-loop side of worker mode: read progress, forward speed changes, collect the result."""
+        if not self.paused:
+            self.elapsed_time += dt
+        speed = self.worker_speed()
+        # Finish mode re-estimates every frame; only resend on a noticeable change
+        if self._worker_speed is None or abs(speed - self._worker_speed) > 0.1 * self._worker_speed or (speed == 0) != (self._worker_speed == 0):
+            self.worker.set_speed(speed)
+            self._worker_speed = speed
+        
+        done = self.worker.done # Read before the counters, so a finished run is fully shown
+        steps = self.worker.steps
+        if dt > 0:
+            rate = (steps - self.total_steps) / dt
+            self.steps_per_sec = rate if self.steps_per_sec == 0 else 0.9 * self.steps_per_sec + 0.1 * rate
+        self.total_steps = steps
+        current_id = self.worker.state.current_id
+        self.grid.current = self.grid.cells_by_id[current_id] if current_id >= 0 else None
+        if done:
+            self.finish_worker()
+
+    def is_solver_active(self):
+        return self.current_algo_name in ["BFS", "DFS", "AStar", "Dijkstra", "WallFollower"] or self.current_algo_name.startswith("Portfolio")
+
+    def frame_step_quota(self, dt):
+        """Algorithm steps to run this frame in the current step mode; None means until the budget is spent."""
+        if self.step_mode == "fixed":
+            return self.steps_per_frame
+        if self.step_mode == "budget":
+            return None
+        
+        # Finish mode: spread the estimated remaining steps over the remaining time.
+        # The estimate assumes every cell gets touched, at the steps-per-cell rate observed so far.
+        remaining_time = self.finish_seconds - self.elapsed_time
+        if remaining_time <= dt:
+            return None # Overdue: run flat out within the budget
+        return max(1, math.ceil(self.estimated_remaining_steps() * dt / remaining_time))
+
+    def estimated_remaining_steps(self):
+        """Assumes every cell gets touched, at the steps-per-cell rate observed so far."""
+        states = self.renderer.state_array(self.grid)
+        solving = self.is_solver_active() or (self.worker is not None and self.worker.kind == "solver")
+        touched = states.visited_count if solving else states.gen_visited_count
+        steps_per_cell = max(1.0, self.total_steps / touched) if touched else 1.0
+        return max(0.0, self.rows * self.cols * steps_per_cell - self.total_steps)
+
+    def speed_info(self):
+        if self.step_mode == "fixed":
+            info = f"{self.steps_per_frame} steps/frame"
+        elif self.step_mode == "budget":
+            info = f"budget {self.frame_budget_ms}ms"
+        else:
+            info = f"finish in {self.finish_seconds}s"
+        if self.chunk_size > 1:
+            info += f" (chunk {self.chunk_size})"
+        if self.use_worker:
+            info += " [worker]"
+        return info
+
+    def start_portfolio(self):
+        if self.portfolio_thread and self.portfolio_thread.is_alive():
+            return
+        self.stop_worker()
+        self.stop_recording()
+        self.grid.reset_visited()
+        self.renderer.invalidate()
+        self.current_algo_gen = None
+        self.current_algo_name = "Portfolio..."
+        self.portfolio_result = None
+        grid, start_cell, end_cell, gen_name = self.grid, self.start_cell, self.end_cell, self.generator_name
+        
+        def race():
+            res = self.portfolio.solve(grid, start_cell, end_cell, gen_name)
+            self.portfolio_result = (grid, res)
+        
+        self.portfolio_thread = threading.Thread(target=race)
+        self.portfolio_thread.daemon = True
+        self.portfolio_thread.start()
+
+    def apply_portfolio_result(self):
+        grid, res = self.portfolio_result
+        self.portfolio_result = None
+        if grid is not self.grid:
+            return # Grid was reset while racing
+        if res is None:
+            self.current_algo_name = "Portfolio: no path"
+            return
+        for cell in res["path"]:
+            cell.is_path = True
+        self.renderer.invalidate()
+        self.current_algo_name = f"Portfolio: {res['winner']}"
+        self.computation_time = res["latency_ms"]
 
     def run(self):
         import time # Ensure time is available
+        self.memory_sampler.start()
+        profiler = self.profiler
         while self.running:
             # Time delta in seconds
             dt = self.clock.tick(self.target_fps) / 1000.0
+            profiler.begin_frame()
             
             self.handle_events()
+            profiler.mark("events")
             
             if self.state == "NORMAL":
-                if not self.paused and self.current_algo_gen:
+                if self.worker:
+                    self.update_worker(dt)
+                elif not self.paused and self.current_algo_gen:
                     self.elapsed_time += dt
+                    quota = self.frame_step_quota(dt)
+                    budget_ns = self.frame_budget_ms * 1_000_000
+                    steps_before = self.total_steps
+                    # Measure CPU Time for the steps taken in this frame
+                    start_comp = time.perf_counter_ns()
                     try:
-                        # Measure CPU Time for the steps taken in this frame
-                        start_comp = time.perf_counter_ns()
-                        for _ in range(self.steps_per_frame):
-                            next(self.current_algo_gen)
-                            self.total_steps += 1
-                        end_comp = time.perf_counter_ns()
-                        self.computation_time += (end_comp - start_comp) / 1_000_000 # to ms
+                        # Each resume advances `chunk_size` steps
+                        if self.step_mode == "fixed":
+                            for _ in range(max(1, self.steps_per_frame // self.chunk_size)):
+                                next(self.current_algo_gen)
+                                self.total_steps += self.chunk_size
+                        else:
+                            # Stop at the quota (finish mode) or when the frame's compute budget is spent
+                            while True:
+                                next(self.current_algo_gen)
+                                self.total_steps += self.chunk_size
+                                if quota is not None and self.total_steps - steps_before >= quota:
+                                    break
+                                if time.perf_counter_ns() - start_comp >= budget_ns:
+                                    break
                     except StopIteration as e:
                         # Extract final path and metrics if available
                         self.current_algo_gen = None
+                        self.stop_recording()
                         if isinstance(e.value, dict):
                             # We could update final stats here if needed
                             pass
+                    end_comp = time.perf_counter_ns()
+                    self.computation_time += (end_comp - start_comp) / 1_000_000 # to ms
+                    if dt > 0:
+                        rate = (self.total_steps - steps_before) / dt
+                        self.steps_per_sec = rate if self.steps_per_sec == 0 else 0.9 * self.steps_per_sec + 0.1 * rate
+                
+                if self.portfolio_result:
+                    self.apply_portfolio_result()
+                profiler.mark("algorithm")
                 
                 self.renderer.draw_grid(self.grid)
                 if self.grid.current:
                     self.renderer.draw_current(self.grid.current)
+                profiler.mark("draw_grid")
                 
-                # Calculate Stats
-                visited_count = 0
-                path_len = 0
-                frontier_count = 0
-                
-                total_cells = self.rows * self.cols
-                
-                is_solver = self.current_algo_name in ["BFS", "DFS", "AStar", "Dijkstra", "WallFollower"]
-                
-                if is_solver:
-                    visited_count = sum(1 for col in self.grid.cells for cell in col if cell.visited_by_solver)
-                    path_len = sum(1 for col in self.grid.cells for cell in col if cell.is_path)
-                    frontier_count = sum(1 for col in self.grid.cells for cell in col if cell.in_frontier)
-                else:
-                    # Generator or None (show generator visited)
-                    visited_count = sum(1 for col in self.grid.cells for cell in col if cell.visited)
-                
-                coverage = (visited_count / total_cells) * 100 if total_cells > 0 else 0
-                
-                stats = {
-                    "visited": visited_count, 
-                    "path": path_len,
-                    "total": total_cells,
-                    "coverage": coverage,
-                    "frontier": frontier_count,
-                    "time": self.elapsed_time,
-                    "comp_time": self.computation_time,
-                    "steps": self.total_steps,
-                    "memory": self.process.memory_info().rss / 1024 # KB
-                }
-
-                speed_info = f"{self.steps_per_frame} steps/frame"
-                self.renderer.draw_info(self.current_algo_name, speed_info, (self.cols, self.rows), stats)
+                self.draw_stats(self.current_algo_name, self.speed_info(), self.is_solver_active())
                 
                 if self.paused:
                     self.renderer.draw_pause_overlay()
             
+            elif self.state == "REPLAY":
+                self.update_replay(dt)
+                profiler.mark("algorithm")
+                self.renderer.draw_grid(self.grid)
+                if self.grid.current:
+                    self.renderer.draw_current(self.grid.current)
+                profiler.mark("draw_grid")
+                self.draw_stats(f"Replay: {self.player.name}", self.replay_info(), self.player.is_solver)
+                self.renderer.draw_replay_bar(self.player.position, self.player.total_steps, self.replay_playing)
+            
             elif self.state == "BENCHMARKING":
                 if not self.benchmark_service.is_running:
                     if self.benchmark_service.error:
                         # Stay in this state to show error
-                        self.renderer.draw_benchmark_progress(self.benchmark_service.progress, self.benchmark_service.status_message, self.benchmark_service.current_memory)
+                        self.renderer.draw_benchmark_progress(self.benchmark_service.progress, self.benchmark_service.status_message, self.benchmark_service.current_memory,
+                                                              self.benchmark_service.telemetry)
                     elif self.benchmark_service.progress > 0:
                         # Success
                         self.state = "BENCHMARK_RESULTS"
                 else:
-                    self.renderer.draw_benchmark_progress(self.benchmark_service.progress, self.benchmark_service.status_message, self.benchmark_service.current_memory)
+                    self.renderer.draw_benchmark_progress(self.benchmark_service.progress, self.benchmark_service.status_message, self.benchmark_service.current_memory,
+                                                          self.benchmark_service.telemetry)
 
             elif self.state == "BENCHMARK_RESULTS":
-                self.renderer.draw_benchmark_results(self.benchmark_service.get_averages(), self.benchmark_iterations)
+                self.renderer.draw_benchmark_results(self.benchmark_service.get_averages(), self.benchmark_iterations, self.benchmark_mode,
+                                                     self.benchmark_service.results_version)
 
-            pygame.display.flip()
+            profiler.mark("other")
+            if self.renderer.debug_overlay:
+                self.renderer.draw_debug_overlay()
+            if profiler.enabled:
+                self.renderer.draw_frame_profile(profiler)
+            profiler.mark("overlay")
+            self.renderer.present()
+            profiler.mark("flip")
+            profiler.end_frame()
             
+        self.stop_worker()
+        self.stop_recording()
+        self.benchmark_service.cancel()
+        if self.player:
+            self.player.close()
+        self.memory_sampler.stop()
+        self.portfolio.close()
         pygame.quit()
 
+    def draw_stats(self, algo_name, speed_info, solving):
+        """Sidebar statistics from the running counts of the cell state array (O(1) per frame)."""
+        visited_count = 0
+        path_len = 0
+        frontier_count = 0
+        
+        total_cells = self.rows * self.cols
+        states = self.renderer.state_array(self.grid)
+        
+        if solving:
+            visited_count = states.visited_count
+            path_len = states.path_count
+            frontier_count = states.frontier_count
+        else:
+            # Generator or None (show generator visited)
+            visited_count = states.gen_visited_count
+        
+        coverage = (visited_count / total_cells) * 100 if total_cells > 0 else 0
+        
+        stats = {
+            "visited": visited_count, 
+            "path": path_len,
+            "total": total_cells,
+            "coverage": coverage,
+            "frontier": frontier_count,
+            "time": self.elapsed_time,
+            "comp_time": self.computation_time,
+            "steps": self.total_steps,
+            "rate": self.steps_per_sec,
+            "memory": self.memory_sampler.current_kb
+        }
+        self.profiler.mark("stats")
+        self.renderer.draw_info(algo_name, speed_info, (self.cols, self.rows), stats)
+        self.profiler.mark("sidebar")
+
+    def handle_camera_key(self, key):
+        """Camera: WASD pan, -/= zoom, 0 fits the whole maze. Returns False for other keys."""
+        if key in (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d):
+            dx = {pygame.K_a: -1, pygame.K_d: 1}.get(key, 0)
+            dy = {pygame.K_w: -1, pygame.K_s: 1}.get(key, 0)
+            self.renderer.pan(dx, dy)
+        elif key in (pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.renderer.zoom(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.renderer.zoom(-1)
+        elif key == pygame.K_0:
+            self.renderer.fit_view()
+        else:
+            return False
+        return True
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
             
+            if event.type == pygame.MOUSEWHEEL and self.state in ("NORMAL", "REPLAY"):
+                # Zoom around the mouse pointer
+                self.renderer.zoom(event.y, pygame.mouse.get_pos())
+            
+            if self.state == "REPLAY" and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+                # Click or drag on the timeline to scrub
+                pressed = event.button == 1 if event.type == pygame.MOUSEBUTTONDOWN else event.buttons[0]
+                bar = self.renderer.replay_bar_rect
+                if pressed and bar and bar.collidepoint(event.pos):
+                    self.replay_seek(round((event.pos[0] - bar.x) / bar.w * self.player.total_steps))
+            
             if event.type == pygame.KEYDOWN:
                 # Global Keys
-                if event.key == pygame.K_b:
+                if event.key == pygame.K_F12:
+                    self.renderer.debug_overlay = not self.renderer.debug_overlay
+                if event.key == pygame.K_F11:
+                    self.profiler.toggle()
+                if event.key == pygame.K_F10 and self.profiler.enabled:
+                    count = self.profiler.export_csv(self.PROFILE_CSV)
+                    print(f"Frame profile: {count} frames saved to {self.PROFILE_CSV}")
+                if event.key == pygame.K_b and self.state != "REPLAY":
                     if self.state == "NORMAL":
                         self.state = "BENCHMARK_RESULTS" # Jump to results view (initially empty)
                     else:
@@ -186,16 +549,46 @@ class AppController:
                     
                     if event.key == pygame.K_SPACE:
                         self.paused = not self.paused
+                        if self.worker:
+                            self.worker.pause() if self.paused else self.worker.resume()
                     elif event.key == pygame.K_r:
                         self.reset_grid()
+                    elif event.key == pygame.K_c:
+                        # Toggle chunked stepping (applies to the next algorithm started)
+                        self.chunk_size = self.CHUNK_SIZE if self.chunk_size == 1 else 1
+                    elif self.handle_camera_key(event.key):
+                        pass
+                    elif event.key == pygame.K_t:
+                        # Toggle trace recording (applies to the next algorithm started)
+                        self.record_traces = not self.record_traces
+                    elif event.key == pygame.K_l:
+                        self.open_latest_trace()
+                    elif event.key == pygame.K_x:
+                        # Toggle worker process mode (applies to the next algorithm started)
+                        self.use_worker = not self.use_worker
+                    elif event.key == pygame.K_v:
+                        # Toggle the NumPy raster renderer (per-cell drawing otherwise)
+                        self.renderer.set_raster_mode(not self.renderer.raster_mode)
                     
                     # Speed Control
-                    elif event.key == pygame.K_LEFTBRACKET: # [
+                    elif event.key == pygame.K_TAB:
+                        self.step_mode = self.STEP_MODES[(self.STEP_MODES.index(self.step_mode) + 1) % len(self.STEP_MODES)]
+                    elif event.key == pygame.K_LEFTBRACKET: # [ (adjusts the active step mode)
                         decrement = 5 if is_shift else 1
-                        self.steps_per_frame = max(1, self.steps_per_frame - decrement)
+                        if self.step_mode == "budget":
+                            self.frame_budget_ms = max(1, self.frame_budget_ms - decrement)
+                        elif self.step_mode == "finish":
+                            self.finish_seconds = max(1, self.finish_seconds - decrement)
+                        else:
+                            self.steps_per_frame = max(1, self.steps_per_frame - decrement)
                     elif event.key == pygame.K_RIGHTBRACKET: # ]
                         increment = 5 if is_shift else 1
-                        self.steps_per_frame = min(100, self.steps_per_frame + increment)
+                        if self.step_mode == "budget":
+                            self.frame_budget_ms = min(50, self.frame_budget_ms + increment)
+                        elif self.step_mode == "finish":
+                            self.finish_seconds = min(600, self.finish_seconds + increment)
+                        else:
+                            self.steps_per_frame = min(100, self.steps_per_frame + increment)
                         
                     # Size Control (Independent Width/Height)
                     elif event.key == pygame.K_LEFT:
@@ -226,15 +619,62 @@ class AppController:
                         self.reset_grid()
                         algo = self.generators[event.key]
                         self.current_algo_name = algo.__class__.__name__
-                        self.current_algo_gen = algo.generate(self.grid)
+                        self.generator_name = next(name for name, cls in GENERATORS.items() if isinstance(algo, cls))
+                        if self.use_worker:
+                            self.start_worker("generator", self.generator_name)
+                        else:
+                            self.current_algo_gen = algo.generate(self.grid, step_size=self.chunk_size, events=self.new_event_stream())
+                            self.start_recording("generator")
                     elif event.key in self.solvers:
+                        self.stop_worker()
+                        self.stop_recording()
                         self.grid.reset_visited()
+                        self.renderer.invalidate()
                         self.elapsed_time = 0.0 # Reset time for solver
                         self.total_steps = 0
+                        self.steps_per_sec = 0.0
                         self.computation_time = 0.0
                         algo = self.solvers[event.key]
                         self.current_algo_name = algo.__class__.__name__
-                        self.current_algo_gen = algo.solve(self.grid, self.start_cell, self.end_cell)
+                        if self.use_worker:
+                            self.start_worker("solver", self.current_algo_name)
+                        else:
+                            self.current_algo_gen = algo.solve(self.grid, self.start_cell, self.end_cell, step_size=self.chunk_size, events=self.new_event_stream())
+                            self.start_recording("solver")
+                    elif event.key == pygame.K_8:
+                        self.start_portfolio()
+
+                elif self.state == "REPLAY":
+                    is_shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+                    # SHIFT moves by 1% of the trace instead of one step
+                    jump = max(1, self.player.total_steps // 100) if is_shift else 1
+                    
+                    if event.key == pygame.K_SPACE:
+                        if self.player.position >= self.player.total_steps:
+                            self.replay_seek(0) # Replay from the start
+                        self.replay_playing = not self.replay_playing
+                    elif event.key == pygame.K_RIGHT:
+                        self.replay_seek(self.player.position + jump)
+                    elif event.key == pygame.K_LEFT:
+                        self.replay_seek(self.player.position - jump)
+                    elif event.key == pygame.K_HOME:
+                        self.replay_seek(0)
+                    elif event.key == pygame.K_END:
+                        self.replay_seek(self.player.total_steps)
+                    elif event.key == pygame.K_LEFTBRACKET:
+                        self.replay_speed = max(1.0, self.replay_speed / 2)
+                    elif event.key == pygame.K_RIGHTBRACKET:
+                        self.replay_speed = min(1e8, self.replay_speed * 2)
+                    elif event.key in (pygame.K_l, pygame.K_ESCAPE):
+                        self.stop_replay()
+                    else:
+                        self.handle_camera_key(event.key)
+
+                elif self.state == "BENCHMARKING":
+                    if event.key == pygame.K_ESCAPE:
+                        # Cancel: stops the workers, keeps the mazes finished so far
+                        self.benchmark_service.cancel()
+                        self.state = "BENCHMARK_RESULTS"
 
                 elif self.state == "BENCHMARK_RESULTS":
                     mods = pygame.key.get_mods()
@@ -243,7 +683,11 @@ class AppController:
                     
                     if event.key == pygame.K_RETURN:
                         self.state = "BENCHMARKING"
-                        self.benchmark_service.start_benchmark(self.rows, self.cols, self.benchmark_iterations)
+                        self.benchmark_service.start_benchmark(self.rows, self.cols, self.benchmark_iterations, self.benchmark_mode)
+                    elif event.key == pygame.K_m:
+                        # Cycle execution mode (run / step / chunk)
+                        idx = EXECUTION_MODES.index(self.benchmark_mode)
+                        self.benchmark_mode = EXECUTION_MODES[(idx + 1) % len(EXECUTION_MODES)]
                     elif event.key == pygame.K_UP:
                         self.benchmark_iterations = min(100, self.benchmark_iterations + step)
                     elif event.key == pygame.K_DOWN:
@@ -0,0 +1,137 @@
+import sys
+import csv
+import time
+from collections import deque
+import pygame
+
+# Frame phases in drawing order; time between two marks is charged to the second one
+PHASES = ("events", "algorithm", "draw_grid", "stats", "sidebar", "other", "overlay", "flip")
+
+# What counts as a draw call: Surface blits/fills, the pygame.draw and transform modules,
+# array blits and pushes to the display
+SURFACE_CALLS = frozenset(("blit", "blits", "fblits", "fill"))
+DRAW_MODULES = frozenset(("pygame.draw", "pygame.gfxdraw", "pygame.transform"))
+OTHER_CALLS = frozenset((("pygame.surfarray", "blit_array"), ("pygame.display", "flip"), ("pygame.display", "update")))
+
+def _noop(*args):
+    pass
+
+class FrameProfiler:
+    """
+    Per-phase frame timings from perf_counter_ns marks, kept for the last `history` frames.
+    While disabled, begin_frame / mark / end_frame are bound to a no-op, so the frame loop's
+    instrumentation costs one empty call per mark.
+
+    Draw calls are counted with a sys.setprofile hook, which slows down the frame it watches.
+    It only runs on every `draw_sample_every`-th frame; those frames report the draw count
+    and are left out of the timing histogram and averages.
+    """
+    def __init__(self, history: int = 240, draw_sample_every: int = 10):
+        self.enabled = False
+        self.frames = deque(maxlen=history)
+        self.draw_sample_every = draw_sample_every
+        self.draw_calls = 0 # Count from the latest sampled frame
+        self.frame_count = 0
+        self._current = None
+        self._sampling = False
+        self._draws = 0
+        self._previous_hook = None
+        self.begin_frame = self.mark = self.end_frame = _noop
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def enable(self):
+        self.enabled = True
+        self.begin_frame = self._begin_frame
+        self.mark = self._mark
+        self.end_frame = self._end_frame
+        self._current = None # Enabled mid-frame: timing starts with the next frame
+
+    def disable(self):
+        self.enabled = False
+        self._stop_sampling()
+        self.begin_frame = self.mark = self.end_frame = _noop
+
+    def _begin_frame(self):
+        now = time.perf_counter_ns()
+        self._current = dict.fromkeys(PHASES, 0)
+        self._start = self._last = now
+        self.frame_count += 1
+        if self.frame_count % self.draw_sample_every == 0:
+            self._draws = 0
+            self._sampling = True
+            self._previous_hook = sys.getprofile()
+            sys.setprofile(self._count_draw_calls)
+
+    def _mark(self, phase: str):
+        now = time.perf_counter_ns()
+        if self._current is not None:
+            self._current[phase] += now - self._last
+        self._last = now
+
+    def _end_frame(self):
+        sampled = self._sampling
+        self._stop_sampling()
+        if self._current is None:
+            return
+        frame = self._current
+        frame["busy"] = self._last - self._start
+        frame["frame"] = self.frame_count
+        frame["draw_calls"] = self._draws if sampled else None
+        if sampled:
+            self.draw_calls = self._draws
+        self.frames.append(frame)
+        self._current = None
+
+    def _stop_sampling(self):
+        if self._sampling:
+            sys.setprofile(self._previous_hook)
+            self._sampling = False
+
+    def _count_draw_calls(self, frame, event, arg):
+        if event != "c_call":
+            return
+        module = arg.__module__
+        if module is None:
+            # Builtin method: only Surface drawing counts
+            if arg.__name__ in SURFACE_CALLS and isinstance(arg.__self__, pygame.Surface):
+                self._draws += 1
+        elif module in DRAW_MODULES or (module, arg.__name__) in OTHER_CALLS:
+            self._draws += 1
+
+    def timed_frames(self) -> list:
+        """Frames whose timings were not slowed down by draw-call sampling."""
+        return [f for f in self.frames if f["draw_calls"] is None]
+
+    def phase_averages(self) -> dict:
+        """Average ms per phase over the timed frames."""
+        frames = self.timed_frames()
+        if not frames:
+            return dict.fromkeys(PHASES, 0.0)
+        return {p: sum(f[p] for f in frames) / len(frames) / 1e6 for p in PHASES}
+
+    def busy_times(self) -> list:
+        """Busy ms (everything but the wait in clock.tick) of the timed frames, oldest first."""
+        return [f["busy"] / 1e6 for f in self.timed_frames()]
+
+    def histogram(self, bin_ms: float = 1.0, bins: int = 34) -> list:
+        """Counts of busy frame times per `bin_ms` bucket; the last bucket holds everything slower."""
+        counts = [0] * bins
+        for ms in self.busy_times():
+            counts[min(bins - 1, int(ms / bin_ms))] += 1
+        return counts
+
+    def export_csv(self, path: str) -> int:
+        """Writes the kept frames (ms per phase, busy ms, sampled draw calls) to `path`."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", *(f"{p}_ms" for p in PHASES), "busy_ms", "draw_calls"])
+            for frame in self.frames:
+                draws = frame["draw_calls"]
+                writer.writerow([frame["frame"], *(f"{frame[p] / 1e6:.4f}" for p in PHASES),
+                                 f"{frame['busy'] / 1e6:.4f}", "" if draws is None else draws])
+        return len(self.frames)
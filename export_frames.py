@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import multiprocessing
+
+# Headless: no window is ever opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from model.grid import Grid
+from model.events import DeltaStream
+from model.registry import GENERATORS, SOLVERS
+from model.trace import TracePlayer, record_run
+from view.frame_export import (FrameExporter, frame_path, frame_steps, init_trace_worker,
+                               render_trace_frames, split_tasks)
+
+# Increased recursion limit for deep mazes
+sys.setrecursionlimit(10**7)
+
+def log(message):
+    # stdout may be the raw frame pipe
+    print(message, file=sys.stderr)
+
+def make_grid(args):
+    grid = Grid(args.rows, args.cols)
+    start_cell = grid.get_cell(0, 0)
+    end_cell = grid.get_cell(args.cols - 1, args.rows - 1)
+    start_cell.is_entry = True
+    end_cell.is_exit = True
+    return grid, start_cell, end_cell
+
+def make_run(args, grid, start_cell, end_cell, events):
+    """The algorithm step generator to export; a solver runs on a maze generated without frames."""
+    generator = GENERATORS[args.generator]()
+    if args.solver:
+        generator.run(grid)
+        return SOLVERS[args.solver]().solve(grid, start_cell, end_cell, events=events)
+    return generator.generate(grid, events=events)
+
+def export_live(args, every, emit):
+    """Steps the algorithm in this process and renders every `every`-th step."""
+    grid, start_cell, end_cell = make_grid(args)
+    exporter = FrameExporter(*args.size)
+    events = DeltaStream()
+    run = make_run(args, grid, start_cell, end_cell, events)
+    events.subscribe(exporter.renderer.state_array(grid)) # After make_run: a solver's maze is already carved
+
+    index = 0
+    emit(exporter, exporter.render(grid), index)
+    steps = 0
+    for _ in run:
+        steps += 1
+        if steps % every == 0:
+            index += 1
+            emit(exporter, exporter.render(grid), index)
+    if steps % every:
+        index += 1
+        emit(exporter, exporter.render(grid), index)
+    return index + 1
+
+def export_trace(args, trace_path, every, emit):
+    """Replays a trace in this process, rendering the selected steps."""
+    player = TracePlayer(trace_path)
+    exporter = FrameExporter(*args.size)
+    steps = frame_steps(player.total_steps, every)
+    for index, step in enumerate(steps):
+        player.seek(step)
+        emit(exporter, exporter.render(player.grid, player.state), index)
+    player.close()
+    return len(steps)
+
+def export_parallel(args, trace_path, every, out_dir, pipe):
+    """Renders contiguous frame ranges of a trace in a process pool; pipe output stays in order."""
+    player = TracePlayer(trace_path)
+    steps = frame_steps(player.total_steps, every)
+    player.close()
+
+    # A few tasks per worker keeps the pool busy; each task replays forward from its first frame
+    tasks = split_tasks(steps, args.workers * 4, out_dir)
+    with multiprocessing.Pool(args.workers, initializer=init_trace_worker, initargs=(trace_path, *args.size)) as pool:
+        for frames in pool.imap(render_trace_frames, tasks):
+            for frame in frames:
+                pipe.write(frame)
+    return len(steps)
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a generator/solver run to a PNG sequence or raw RGB frames without a display.")
+    parser.add_argument("--trace", help="Render this recorded trace (see record_trace.py) instead of running an algorithm")
+    parser.add_argument("--generator", choices=list(GENERATORS), default="RecursiveBacktracker")
+    parser.add_argument("--solver", choices=list(SOLVERS), help="Export this solver on the generated maze instead of the generation")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--every", type=int, help="Render every Nth step (default: about --frames frames)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=int, nargs=2, default=[720, 720], metavar=("W", "H"))
+    parser.add_argument("--out", default="frames", help="Directory for frame_NNNNNN.png")
+    parser.add_argument("--pipe", action="store_true",
+                        help="Write raw RGB24 frames to stdout instead, e.g. | ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -r 30 -i - out.mp4")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Render frame ranges in N processes (records a temporary trace first when no --trace is given)")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    out_dir = None if args.pipe else args.out
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    pipe = sys.stdout.buffer
+
+    def emit(exporter, surface, index):
+        if out_dir:
+            exporter.save(frame_path(out_dir, index))
+        else:
+            pipe.write(exporter.frame_bytes())
+
+    start_time = time.perf_counter()
+    trace_path = args.trace
+    temp_trace = None
+    if args.workers > 1 and not trace_path:
+        # Frame ranges can only be rendered independently from a recording
+        fd, temp_trace = tempfile.mkstemp(suffix=".trace")
+        os.close(fd)
+        grid, start_cell, end_cell = make_grid(args)
+        generator = GENERATORS[args.generator]()
+        if args.solver:
+            generator.run(grid)
+            record_run(temp_trace, "solver", SOLVERS[args.solver](), grid, start_cell, end_cell)
+        else:
+            record_run(temp_trace, "generator", generator, grid, start_cell, end_cell)
+        trace_path = temp_trace
+        log(f"Recorded run in {time.perf_counter() - start_time:.2f}s")
+
+    try:
+        if trace_path:
+            player = TracePlayer(trace_path)
+            total = player.total_steps
+            player.close()
+        else:
+            total = args.rows * args.cols # Estimate: about one step per cell
+        every = args.every or max(1, total // args.frames)
+
+        if args.workers > 1:
+            count = export_parallel(args, trace_path, every, out_dir, pipe)
+        elif trace_path:
+            count = export_trace(args, trace_path, every, emit)
+        else:
+            count = export_live(args, every, emit)
+        pipe.flush()
+    finally:
+        if temp_trace:
+            os.remove(temp_trace)
+
+    duration = time.perf_counter() - start_time
+    target = "stdout" if args.pipe else f"{out_dir}/"
+    log(f"Exported {count} frames ({args.size[0]}x{args.size[1]}, every {every} steps) to {target} in {duration:.2f}s")
+
+if __name__ == "__main__":
+    main()
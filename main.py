@@ -1,7 +1,11 @@
+import sys
 from controller.app_controller import AppController
 
 def main():
     app = AppController()
+    if len(sys.argv) > 1:
+        # python main.py <file.trace>: start in replay mode
+        app.start_replay(sys.argv[1])
     app.run()
 
 if __name__ == "__main__":
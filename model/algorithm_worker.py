@@ -0,0 +1,221 @@
+"""
+Runs one generator or solver in a separate process so algorithm steps never compete
+with the render loop for the GIL.
+
+The worker applies its delta stream to a cell state array and a wall array that live in
+shared memory, and publishes progress through a small int64 counter block. The worker is
+the only writer; it updates the counters after the arrays and bumps STEP last, so the UI
+process can read everything without locks (a frame may show a step that is still being
+applied, which is harmless for drawing). Pause, resume, speed and stop are control
+messages sent over a pipe.
+"""
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Any
+import numpy as np
+from model.grid import Grid
+from model.events import DeltaStream, CellStateArray, ST_GEN_VISITED, ST_VISITED, ST_FRONTIER, ST_PATH
+from model.registry import GENERATORS, SOLVERS
+from model.trace import TraceRecorder
+
+# Slots of the shared counter block
+STEP, GEN_VISITED, VISITED, FRONTIER, PATH, CURRENT, WALL_VERSION, DONE = range(8)
+COUNTER_SLOTS = 8
+
+# --- Worker side ---
+
+def _worker_main(kind: str, name: str, rows: int, cols: int, start_id: int, end_id: int, chunk_size: int,
+                 shm_names, control, trace_path=None):
+    shms = [shared_memory.SharedMemory(name=n) for n in shm_names]
+    n = rows * cols
+    counters = np.ndarray((COUNTER_SLOTS,), dtype=np.int64, buffer=shms[2].buf)
+
+    if kind == "solver":
+        grid = Grid.from_wall_array(np.ndarray((cols, rows), dtype=np.uint8, buffer=shms[1].buf).copy())
+        # Keep the generator's visited bits the UI handed over
+        for cell, flags in zip(grid.cells_by_id, shms[0].buf[:n].tolist()):
+            cell.visited = bool(flags & ST_GEN_VISITED)
+    else:
+        grid = Grid(rows, cols)
+    grid.cells_by_id[start_id].is_entry = True
+    grid.cells_by_id[end_id].is_exit = True
+
+    states = CellStateArray(grid, shms[0].buf[:n], shms[1].buf[:n])
+
+    def publish(step, deltas):
+        counters[GEN_VISITED] = states.gen_visited_count
+        counters[VISITED] = states.visited_count
+        counters[FRONTIER] = states.frontier_count
+        counters[PATH] = states.path_count
+        counters[CURRENT] = states.current_id
+        counters[WALL_VERSION] = states.wall_version
+        counters[STEP] = step + 1 # Last: flushes published so far
+
+    events = DeltaStream()
+    events.subscribe(states)
+    events.subscribe(publish)
+    recorder = None
+    if trace_path:
+        recorder = TraceRecorder(trace_path, grid, kind, name, start_id, end_id, chunk_size)
+        events.subscribe(recorder)
+    counters[WALL_VERSION] = states.wall_version
+
+    if kind == "solver":
+        cells = grid.cells_by_id
+        run = SOLVERS[name]().solve(grid, cells[start_id], cells[end_id], step_size=chunk_size, events=events)
+    else:
+        run = GENERATORS[name]().generate(grid, step_size=chunk_size, events=events)
+
+    paused = False
+    steps_per_sec = 0.0 # 0: unthrottled
+    next_time = time.perf_counter()
+    try:
+        while True:
+            # Block on the pipe while paused, otherwise only drain pending messages
+            while paused or control.poll():
+                msg = control.recv()
+                if msg[0] == "pause":
+                    paused = True
+                elif msg[0] == "resume":
+                    paused = False
+                    next_time = time.perf_counter()
+                elif msg[0] == "speed":
+                    steps_per_sec = msg[1]
+                    next_time = time.perf_counter()
+                elif msg[0] == "stop":
+                    return
+
+            try:
+                next(run)
+            except StopIteration:
+                break
+
+            if steps_per_sec > 0:
+                next_time += chunk_size / steps_per_sec
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.perf_counter() # Fell behind: don't burst to catch up
+        counters[DONE] = 1
+    except (EOFError, BrokenPipeError):
+        pass # UI process went away
+    finally:
+        if recorder:
+            recorder.close() # A stopped run still leaves a valid (shorter) trace
+        # Views must go before the shared memory can be closed
+        del run, events, publish, states, counters
+        for shm in shms:
+            try:
+                shm.close()
+            except BufferError:
+                pass
+
+# --- UI side ---
+
+class SharedCellState:
+    """
+    Read-only view of a worker's shared state, with the attributes the Renderer and the live
+    statistics read from a CellStateArray.
+    """
+    def __init__(self, grid: Grid, flags: np.ndarray, walls: np.ndarray, counters: np.ndarray):
+        self.grid = grid
+        self.flags = flags
+        self.walls = walls
+        self.counters = counters
+
+    gen_visited_count = property(lambda self: int(self.counters[GEN_VISITED]))
+    visited_count = property(lambda self: int(self.counters[VISITED]))
+    frontier_count = property(lambda self: int(self.counters[FRONTIER]))
+    path_count = property(lambda self: int(self.counters[PATH]))
+    current_id = property(lambda self: int(self.counters[CURRENT]))
+    wall_version = property(lambda self: int(self.counters[WALL_VERSION]))
+
+    def sync(self):
+        pass # The worker owns the state
+
+    def sync_walls(self):
+        pass
+
+class AlgorithmWorker:
+    """
+    Starts `name` (a GENERATORS key for kind "generator", a SOLVERS key for kind "solver")
+    on a copy of `grid` in a child process. `state` is the live SharedCellState.
+    With `trace_path`, the worker also records the run to that trace file.
+    """
+    def __init__(self, kind: str, name: str, grid: Grid, start_cell: Any, end_cell: Any, chunk_size: int = 1,
+                 trace_path: str = None):
+        self.kind = kind
+        self.name = name
+        self.chunk_size = chunk_size
+        n = grid.rows * grid.cols
+
+        self._shms = [shared_memory.SharedMemory(create=True, size=n),
+                      shared_memory.SharedMemory(create=True, size=n),
+                      shared_memory.SharedMemory(create=True, size=COUNTER_SLOTS * 8)]
+        flags = np.ndarray((n,), dtype=np.uint8, buffer=self._shms[0].buf)
+        walls = np.ndarray((n,), dtype=np.uint8, buffer=self._shms[1].buf)
+        counters = np.ndarray((COUNTER_SLOTS,), dtype=np.int64, buffer=self._shms[2].buf)
+        flags[:] = CellStateArray(grid).flags
+        walls[:] = grid.wall_array().ravel()
+        counters[:] = 0
+        counters[CURRENT] = -1
+        self.state = SharedCellState(grid, flags, walls, counters)
+
+        self.control, child_control = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main,
+            args=(kind, name, grid.rows, grid.cols, start_cell.id, end_cell.id, chunk_size,
+                  [shm.name for shm in self._shms], child_control, trace_path))
+        self.process.daemon = True
+        self.process.start()
+
+    @property
+    def steps(self) -> int:
+        return int(self.state.counters[STEP]) * self.chunk_size
+
+    @property
+    def done(self) -> bool:
+        return bool(self.state.counters[DONE]) or not self.process.is_alive()
+
+    def pause(self):
+        self.control.send(("pause",))
+
+    def resume(self):
+        self.control.send(("resume",))
+
+    def set_speed(self, steps_per_sec: float):
+        """Throttles the worker to about `steps_per_sec` algorithm steps per second (0: as fast as possible)."""
+        self.control.send(("speed", steps_per_sec))
+
+    def apply_to_grid(self, grid: Grid):
+        """Copies the final walls and cell states back onto the UI's Grid."""
+        cols, rows = grid.cols, grid.rows
+        grid.load_wall_array(self.state.walls.reshape(cols, rows))
+        for cell, flags in zip(grid.cells_by_id, self.state.flags.tolist()):
+            cell.visited = bool(flags & ST_GEN_VISITED)
+            cell.visited_by_solver = bool(flags & ST_VISITED)
+            cell.in_frontier = bool(flags & ST_FRONTIER)
+            cell.is_path = bool(flags & ST_PATH)
+        current_id = self.state.current_id
+        grid.current = grid.cells_by_id[current_id] if current_id >= 0 else None
+
+    def close(self):
+        """Stops the worker (if still running) and releases the shared memory."""
+        if self.process.is_alive():
+            try:
+                self.control.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.control.close()
+
+        self.state.flags = self.state.walls = self.state.counters = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
@@ -1,7 +1,8 @@
 import time
+import signal
 import threading
-import os
-import psutil
+import multiprocessing
+from queue import Empty
 from model.grid import Grid
 from model.generators.recursive_backtracker import RecursiveBacktracker
 from model.solvers.bfs import BFS
@@ -9,103 +10,183 @@ from model.solvers.dfs import DFS
 from model.solvers.astar import AStar
 from model.solvers.dijkstra import Dijkstra
 from model.solvers.wall_follower import WallFollower
+from model.execution import execute_solver, execute_generator
+from model.microbench import solver_peak_kb
+from model.telemetry import EVENT_KINDS, TelemetryState, init_telemetry, publish
+
+SOLVER_NAMES = ["BFS", "DFS", "AStar", "Dijkstra", "WallFollower"]
+
+_queue = None # This worker's message queue, set by _init_benchmark_worker
+
+def _init_benchmark_worker(queue):
+    global _queue
+    # Forked from the UI process: SDL's handler turns SIGTERM into a quit event, which would
+    # keep Pool.terminate() (cancel) from stopping the worker
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _queue = queue
+    init_telemetry(queue)
+
+def _benchmark_maze(task):
+    """
+    One maze of the benchmark, run in a pool worker: generates it and times every solver on it.
+    Pool workers run outside the UI process so timing loops don't compete with rendering for the
+    GIL. Results go back on the shared queue as ("result", name, sample) messages, next to the
+    worker's telemetry events (start, current step and end of the maze, worker RSS).
+    """
+    index, iterations, rows, cols, mode = task
+    solvers = {
+        "BFS": BFS(),
+        "DFS": DFS(),
+        "AStar": AStar(),
+        "Dijkstra": Dijkstra(),
+        "WallFollower": WallFollower()
+    }
+    publish("task_start", f"Maze {index + 1}/{iterations}: generating")
+    grid = Grid(rows, cols)
+    execute_generator(RecursiveBacktracker(), grid, mode)
+    
+    start_cell = grid.get_cell(0, 0)
+    end_cell = grid.get_cell(cols - 1, rows - 1)
+    
+    for name, solver in solvers.items():
+        publish("task_step", f"Maze {index + 1}/{iterations}: {name}")
+        grid.reset_visited()
+        
+        # Timing
+        start_time = time.perf_counter_ns()
+        
+        res = execute_solver(solver, grid, start_cell, end_cell, mode)
+        
+        end_time = time.perf_counter_ns()
+        duration_ms = (end_time - start_time) / 1_000_000
+        
+        # Memory: the solver's own peak allocation, from a second run under tracemalloc
+        # (untimed; tracing slows it down). Worker RSS only feeds the live view.
+        peak_kb = solver_peak_kb(solver, grid, start_cell, end_cell, mode)
+        
+        _queue.put(("result", name, {
+            'time': duration_ms,
+            'visited': res['visited_count'],
+            'path': len(res['path']),
+            'frontier': res['peak_frontier'],
+            'memory': peak_kb,
+            'working_set': res['working_set'],
+        }))
+    publish("task_end")
 
 class BenchmarkService:
     def __init__(self):
         self.is_running = False
         self.progress = 0.0
-        self.current_memory = 0.0
+        self.current_memory = 0.0 # Sum of the workers' RSS in KB
         self.results = {} # {algo_name: {'time': [], 'visited': [], 'path': [], 'frontier': []}}
-        self.thread = None
+        self.thread = None # Listener for the workers' messages
+        self.pool = None
+        self.telemetry = TelemetryState() # Per-worker lanes, throughput and ETA of the current run
         self.status_message = "Ready"
         self.error = None
+        self.cancelled = False
+        self.mode = "run" # Execution mode used for the last/current run (see model.execution)
+        self.results_version = 0 # Bumped whenever `results` changes (views redraw their charts on change)
+        self._averages = None
+        self._averages_version = -1
+        self._cancel = threading.Event()
 
-    def start_benchmark(self, rows=30, cols=40, iterations=5):
+    def start_benchmark(self, rows=30, cols=40, iterations=5, mode="run"):
         if self.is_running:
             return
         
         self.is_running = True
         self.progress = 0.0
-        self.results = {}
+        self.results = {name: {'time': [], 'visited': [], 'path': [], 'frontier': [], 'memory': [], 'working_set': []} for name in SOLVER_NAMES}
+        self.results_version += 1
+        self.telemetry = TelemetryState(iterations)
         self.status_message = "Initializing..."
         self.error = None
+        self.cancelled = False
+        self.mode = mode
+        self._cancel.clear()
+        
+        # One core is left to the UI; each task is one maze, so workers pick up mazes as they free up
+        workers = max(1, min(iterations, multiprocessing.cpu_count() - 1))
+        queue = multiprocessing.Queue()
+        self.pool = multiprocessing.Pool(workers, initializer=_init_benchmark_worker, initargs=(queue,))
+        tasks = [(i, iterations, rows, cols, mode) for i in range(iterations)]
+        pending = self.pool.map_async(_benchmark_maze, tasks, chunksize=1)
         
-        self.thread = threading.Thread(target=self._run, args=(rows, cols, iterations))
+        self.thread = threading.Thread(target=self._listen, args=(queue, self.pool, pending, iterations))
         self.thread.daemon = True
         self.thread.start()
 
-    def _run(self, rows, cols, iterations):
-        solvers = {
-            "BFS": BFS(),
-            "DFS": DFS(),
-            "AStar": AStar(),
-            "Dijkstra": Dijkstra(),
-            "WallFollower": WallFollower()
-        }
-        generator = RecursiveBacktracker()
-        
-        # Initialize results storage
-        for name in solvers:
-            self.results[name] = {'time': [], 'visited': [], 'path': [], 'frontier': [], 'memory': []}
-
-        total_steps = iterations * len(solvers)
-        step_count = 0
-        process = psutil.Process(os.getpid())
+    def cancel(self):
+        """Stops a running benchmark: the workers are terminated; results received so far are kept."""
+        if self.is_running:
+            self.status_message = "Cancelling..."
+            self._cancel.set()
 
+    def _listen(self, queue, pool, pending, iterations):
+        """Applies the workers' results and telemetry to the attributes the UI reads."""
+        total_steps = iterations * len(SOLVER_NAMES)
+        received = 0
+        
+        def apply(msg):
+            nonlocal received
+            if msg[0] in EVENT_KINDS:
+                state = self.telemetry
+                state.apply(msg)
+                self.current_memory = state.rss_kb
+                self.status_message = f"{state.completed}/{iterations} mazes on {len(state.lanes)} workers"
+            elif msg[0] == "result":
+                samples = self.results[msg[1]]
+                for key, value in msg[2].items():
+                    samples[key].append(value)
+                self.results_version += 1
+                received += 1
+                self.progress = received / total_steps
+        
         try:
-            for i in range(iterations):
-                self.status_message = f"Generating Maze {i+1}/{iterations}..."
-                grid = Grid(rows, cols)
-                gen = generator.generate(grid)
-                for _ in gen: pass
+            while True:
+                if self._cancel.is_set():
+                    pool.terminate()
+                    self.cancelled = True
+                    self.status_message = f"Cancelled after {self.telemetry.completed}/{iterations} mazes"
+                    break
+                try:
+                    apply(queue.get(timeout=0.2))
+                    continue
+                except Empty:
+                    if not pending.ready():
+                        continue
                 
-                start_cell = grid.get_cell(0, 0)
-                end_cell = grid.get_cell(cols - 1, rows - 1)
-                
-                for name, solver in solvers.items():
-                    self.status_message = f"Maze {i+1}/{iterations}: Running {name}..."
-                    grid.reset_visited()
-                    
-                    # Timing
-                    start_time = time.perf_counter_ns()
-                    
-                    solve_gen = solver.solve(grid, start_cell, end_cell, visualize=False)
+                if pending.successful():
+                    # Messages put just before a task returned can still be on their way
+                    while received < total_steps or self.telemetry.completed < iterations:
+                        try:
+                            apply(queue.get(timeout=1.0))
+                        except Empty:
+                            break
+                    self.status_message = "Done"
+                else:
                     try:
-                        while True:
-                            next(solve_gen)
-                    except StopIteration as e:
-                        res = e.value
-                    
-                    end_time = time.perf_counter_ns()
-                    duration_ms = (end_time - start_time) / 1_000_000
-                    
-                    # Memory (RSS in KB)
-                    mem_kb = process.memory_info().rss / 1024
-                    self.current_memory = mem_kb
-                    
-                    # Store
-                    self.results[name]['time'].append(duration_ms)
-                    self.results[name]['visited'].append(res['visited_count'])
-                    self.results[name]['path'].append(len(res['path']))
-                    self.results[name]['frontier'].append(res['peak_frontier'])
-                    self.results[name]['memory'].append(mem_kb)
-                    
-                    step_count += 1
-                    self.progress = step_count / total_steps
-            
-            self.status_message = "Done"
-            
-        except Exception as e:
-            self.error = str(e)
-            self.status_message = f"Error: {str(e)}"
-            print(f"Benchmark Error: {e}")
+                        pending.get()
+                    except Exception as e:
+                        self.error = str(e)
+                        self.status_message = f"Error: {e}"
+                        print(f"Benchmark Error: {e}")
+                break
         finally:
+            pool.close()
+            pool.join()
+            queue.close()
             self.is_running = False
 
     def get_averages(self):
+        # Recomputed only when new results arrived
+        if self._averages_version == self.results_version:
+            return self._averages
+        version = self.results_version
         stats = {}
-        order = ["BFS", "DFS", "AStar", "Dijkstra", "WallFollower"]
-        for name in order:
+        for name in SOLVER_NAMES:
             if name not in self.results or not self.results[name]['time']:
                 continue
             
@@ -115,6 +196,7 @@ class BenchmarkService:
             paths = metrics['path']
             frontier = metrics['frontier']
             memory = metrics['memory']
+            working_set = metrics['working_set']
             
             stats[name] = {
                 'time_avg': sum(times) / len(times),
@@ -132,7 +214,10 @@ class BenchmarkService:
                 'memory_avg': sum(memory) / len(memory),
                 'memory_max': max(memory),
                 
+                'working_set_avg': sum(working_set) / len(working_set),
+                
                 'efficiency': (sum(visited) / sum(times)) if sum(times) > 0 else 0
             }
+        self._averages, self._averages_version = stats, version
         return stats
 
@@ -2,6 +2,7 @@ class Cell:
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
+        self.id = 0 # Flat index (x * rows + y), assigned by Grid
         self.walls = {'top': True, 'right': True, 'bottom': True, 'left': True}
         self.visited = False  # Used during generation
         self.is_entry = False
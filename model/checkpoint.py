@@ -0,0 +1,126 @@
+import io
+import os
+import csv
+import json
+import glob
+from typing import Iterator, List
+
+def atomic_write(path: str, text: str):
+    """Writes `text` to `path` through a temporary file and a rename: readers see the old or the new file, never half of one."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class BenchmarkCheckpoint:
+    """
+    On-disk state of a benchmark run, kept in `directory`:
+        manifest.json       run config, finished task keys, the chunk files holding their rows and
+                            how many of those chunks are already in the results store
+        chunk_NNNNNN.csv    result rows of the tasks finished since the previous flush
+
+    flush() writes the pending rows as a new chunk and then the manifest, each atomically, so a
+    crash or Ctrl-C loses at most the unflushed tasks. A chunk the manifest doesn't list (crash
+    between the two writes) is discarded on load and its tasks run again.
+    """
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str, config: dict, fieldnames: List[str], fresh: bool = False):
+        self.directory = directory
+        self.config = config
+        self.fieldnames = fieldnames
+        self.done = set()
+        self.chunks = []
+        self.stored = 0
+        self._pending_keys = []
+        self._pending_rows = []
+
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, self.MANIFEST)
+        if os.path.exists(manifest_path) and not fresh:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest["config"] != config or manifest["fieldnames"] != fieldnames:
+                raise ValueError(f"{directory} holds a run with different settings ({manifest['config']}); "
+                                 "use the same settings to resume or start fresh")
+            self.done = {tuple(key) for key in manifest["done"]}
+            self.chunks = manifest["chunks"]
+            self.stored = manifest.get("stored", 0)
+        # Leftovers: unlisted chunks, temporary files, or everything when starting fresh
+        for path in glob.glob(os.path.join(directory, "chunk_*")):
+            if os.path.basename(path) not in self.chunks:
+                os.remove(path)
+        if fresh or not os.path.exists(manifest_path):
+            self._write_manifest()
+
+    def is_done(self, key: tuple) -> bool:
+        return tuple(key) in self.done
+
+    def add(self, key: tuple, rows: List[dict]):
+        """Records a finished task's rows; they reach the disk on the next flush()."""
+        self._pending_keys.append(list(key))
+        self._pending_rows.extend(rows)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending_keys)
+
+    def flush(self):
+        if not self._pending_keys:
+            return
+        name = f"chunk_{len(self.chunks) + 1:06d}.csv"
+        atomic_write(os.path.join(self.directory, name), self._to_csv(self._pending_rows))
+        self.chunks.append(name)
+        self.done.update(tuple(key) for key in self._pending_keys)
+        self._write_manifest()
+        self._pending_keys = []
+        self._pending_rows = []
+
+    def _write_manifest(self):
+        manifest = {
+            "config": self.config,
+            "fieldnames": self.fieldnames,
+            "done": sorted(list(key) for key in self.done),
+            "chunks": self.chunks,
+            "stored": self.stored,
+        }
+        atomic_write(os.path.join(self.directory, self.MANIFEST), json.dumps(manifest, indent=1))
+
+    def _to_csv(self, rows: List[dict]) -> str:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    @property
+    def unstored(self) -> int:
+        return len(self.chunks) - self.stored
+
+    def mark_stored(self):
+        """Records that every flushed chunk is in the results store, so a later extension of the run adds only its own rows."""
+        self.stored = len(self.chunks)
+        self._write_manifest()
+
+    def rows(self, first_chunk: int = 0) -> Iterator[dict]:
+        """Every flushed row (as strings), chunk by chunk, starting at chunk index `first_chunk`."""
+        for name in self.chunks[first_chunk:]:
+            with open(os.path.join(self.directory, name), newline="") as f:
+                yield from csv.DictReader(f)
+
+    def merge(self, path: str) -> int:
+        """Writes all flushed rows to one CSV at `path`, atomically. Returns the row count."""
+        tmp = f"{path}.tmp"
+        count = 0
+        with open(tmp, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            writer.writeheader()
+            for row in self.rows():
+                writer.writerow(row)
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return count
@@ -0,0 +1,54 @@
+"""
+Empirical complexity of benchmark metrics against the maze's cell count n.
+
+loglog_fit regresses log(metric) on log(n) over every measured maze; the slope is the scaling
+exponent (1.0 = linear), with a t-based 95% confidence interval from the residuals.
+best_model compares fixed-shape candidates (c*n, c*n log n, c*n^2) by their squared log
+error, which judges every size by relative error rather than letting the largest dominate.
+"""
+import math
+from typing import Dict, Tuple
+import numpy as np
+
+CANDIDATES = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * np.log(n),
+    "n^2": lambda n: n * n,
+}
+
+def t_quantile(df: int, z: float = 1.959964) -> float:
+    """Two-sided 95% Student t quantile (Cornish-Fisher expansion of the normal one; within 1% from 3 df)."""
+    if df <= 0:
+        return math.inf
+    return (z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+def loglog_fit(n: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    """
+    Least squares fit of log y = log c + b log n. Returns exponent b, its 95% CI (ci_low, ci_high),
+    c and the number of points. Needs positive values at two or more distinct n.
+    """
+    x, ly = np.log(n), np.log(y)
+    dx = x - x.mean()
+    sxx = float(dx @ dx)
+    b = float(dx @ (ly - ly.mean())) / sxx
+    a = ly.mean() - b * x.mean()
+    df = len(x) - 2
+    if df > 0:
+        residuals = ly - (a + b * x)
+        se = math.sqrt(float(residuals @ residuals) / df / sxx)
+        half = t_quantile(df) * se
+    else:
+        half = math.inf
+    return {"exponent": b, "ci_low": b - half, "ci_high": b + half, "c": math.exp(a), "points": len(x)}
+
+def best_model(n: np.ndarray, y: np.ndarray) -> Tuple[str, float]:
+    """The candidate with the smallest mean squared log error (each with its best constant), and that error."""
+    ly = np.log(y)
+    errors = {}
+    for name, f in CANDIDATES.items():
+        residuals = ly - np.log(f(n))
+        residuals -= residuals.mean() # Best log c
+        errors[name] = float(residuals @ residuals) / len(ly)
+    name = min(errors, key=errors.get)
+    return name, errors[name]
@@ -0,0 +1,182 @@
+"""
+Per-step delta stream emitted by solvers and generators when visualizing.
+
+Each delta is one packed unsigned integer: (cell_id << CODE_BITS) | code.
+Algorithms append deltas while they run and flush once per yielded step;
+subscribers receive (step, deltas) and apply only what changed.
+"""
+from array import array
+from typing import Any, Callable, List, Optional
+import numpy as np
+from .grid import WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+
+CODE_BITS = 4
+CODE_MASK = (1 << CODE_BITS) - 1
+
+# Solver transitions
+EV_FRONTIER = 1       # Cell entered the open set
+EV_VISITED = 2        # Cell was expanded (left the open set, joined the closed set)
+EV_PATH = 3           # Cell joined the solution path
+EV_UNPATH = 4         # Cell left the solution path (wall follower backtracking)
+
+# Generator transitions
+EV_GEN_VISITED = 5    # Generator reached the cell
+EV_CURRENT = 6        # Generator head moved to the cell
+EV_CURRENT_CLEAR = 7  # Generator finished; no head (cell id unused)
+EV_CARVE = 8          # EV_CARVE + d: wall on side d (0 top, 1 right, 2 bottom, 3 left) removed, and the neighbour's opposite wall
+
+# (dx, dy) -> side index, matching the order of Grid.get_neighbors
+_SIDES = {(0, -1): 0, (1, 0): 1, (0, 1): 2, (-1, 0): 3}
+
+def carve_code(a: Any, b: Any) -> int:
+    """Event code for removing the wall between neighbouring cells a and b (emitted on a)."""
+    return EV_CARVE + _SIDES[(b.x - a.x, b.y - a.y)]
+
+class DeltaStream:
+    def __init__(self):
+        self.buffer = array('Q')
+        self.subscribers: List[Callable[[int, array], None]] = []
+        self.step = 0
+
+    def subscribe(self, callback: Callable[[int, array], None]):
+        self.subscribers.append(callback)
+
+    def emit(self, cell_id: int, code: int):
+        self.buffer.append((cell_id << CODE_BITS) | code)
+
+    def flush(self):
+        """Publishes the deltas of the current step. Subscribers must not keep the array."""
+        for callback in self.subscribers:
+            callback(self.step, self.buffer)
+        del self.buffer[:]
+        self.step += 1
+
+class CellStateApplier:
+    """Subscriber that mirrors the delta stream onto the Cell flags read by the Renderer."""
+    def __init__(self, grid: Any):
+        self.grid = grid
+
+    def __call__(self, step: int, deltas: array):
+        cells = self.grid.cells_by_id
+        for packed in deltas:
+            code = packed & CODE_MASK
+            cell = cells[packed >> CODE_BITS]
+            if code == EV_FRONTIER:
+                cell.in_frontier = True
+            elif code == EV_VISITED:
+                cell.in_frontier = False
+                cell.visited_by_solver = True
+            elif code == EV_PATH:
+                cell.is_path = True
+            elif code == EV_UNPATH:
+                cell.is_path = False
+            elif code == EV_CURRENT:
+                self.grid.current = cell
+            elif code == EV_CURRENT_CLEAR:
+                self.grid.current = None
+            # EV_GEN_VISITED / EV_CARVE: the generator already updated the cell
+
+# Cell state bits kept by CellStateArray
+ST_GEN_VISITED = 1
+ST_VISITED = 2
+ST_FRONTIER = 4
+ST_PATH = 8
+ST_ENTRY = 16
+ST_EXIT = 32
+
+# Wall bit removed from the cell and from its neighbour, per carve side
+_CARVE_BITS = [(WALL_TOP, WALL_BOTTOM), (WALL_RIGHT, WALL_LEFT), (WALL_BOTTOM, WALL_TOP), (WALL_LEFT, WALL_RIGHT)]
+
+class CellStateArray:
+    """
+    Subscriber that mirrors the delta stream into one byte of state bits per cell,
+    indexed by cell id, plus the packed wall bits (as Grid.wall_array) kept current from carve deltas.
+    `flags` and `walls` are NumPy views for vectorized readers (the raster renderer).
+    
+    It also keeps running counts of cells per state, updated only on actual bit transitions,
+    so live statistics cost O(1) per frame instead of a rescan of the grid.
+    
+    The two arrays can live in caller-provided writable buffers (e.g. shared memory).
+    """
+    def __init__(self, grid: Any, flags_buffer: Any = None, walls_buffer: Any = None):
+        self.grid = grid
+        self.current_id = -1 # Generator head, -1 for none
+        self._bytes = flags_buffer if flags_buffer is not None else bytearray(grid.rows * grid.cols)
+        self.flags = np.frombuffer(self._bytes, dtype=np.uint8)
+        self._wall_bytes = walls_buffer if walls_buffer is not None else bytearray(grid.rows * grid.cols)
+        self.walls = np.frombuffer(self._wall_bytes, dtype=np.uint8)
+        # Neighbour id offset per carve side (ids are x * rows + y)
+        self._side_offsets = [-1, grid.rows, 1, -grid.rows]
+        self.sync()
+        self.sync_walls()
+
+    def sync_walls(self):
+        """Reloads the wall bits from the grid (after walls changed outside the stream)."""
+        self.walls[:] = self.grid.wall_array().ravel()
+        self.wall_version = self.grid.version
+
+    def sync(self):
+        """Rebuilds every cell's bits and the counts from the Cell flags (after changes made outside the stream)."""
+        b = self._bytes
+        for cell in self.grid.cells_by_id:
+            b[cell.id] = ((ST_GEN_VISITED if cell.visited else 0) |
+                          (ST_VISITED if cell.visited_by_solver else 0) |
+                          (ST_FRONTIER if cell.in_frontier else 0) |
+                          (ST_PATH if cell.is_path else 0) |
+                          (ST_ENTRY if cell.is_entry else 0) |
+                          (ST_EXIT if cell.is_exit else 0))
+        self.recount()
+
+    def recount(self):
+        """Recomputes the per-state counts from `flags` (after it was overwritten wholesale)."""
+        flags = self.flags
+        self.gen_visited_count = int(np.count_nonzero(flags & ST_GEN_VISITED))
+        self.visited_count = int(np.count_nonzero(flags & ST_VISITED))
+        self.frontier_count = int(np.count_nonzero(flags & ST_FRONTIER))
+        self.path_count = int(np.count_nonzero(flags & ST_PATH))
+
+    def __call__(self, step: int, deltas: array):
+        b = self._bytes
+        for packed in deltas:
+            code = packed & CODE_MASK
+            cell_id = packed >> CODE_BITS
+            flags = b[cell_id]
+            if code == EV_FRONTIER:
+                if not flags & ST_FRONTIER:
+                    b[cell_id] = flags | ST_FRONTIER
+                    self.frontier_count += 1
+            elif code == EV_VISITED:
+                if flags & ST_FRONTIER:
+                    self.frontier_count -= 1
+                if not flags & ST_VISITED:
+                    self.visited_count += 1
+                b[cell_id] = (flags & ~ST_FRONTIER) | ST_VISITED
+            elif code == EV_PATH:
+                if not flags & ST_PATH:
+                    b[cell_id] = flags | ST_PATH
+                    self.path_count += 1
+            elif code == EV_UNPATH:
+                if flags & ST_PATH:
+                    b[cell_id] = flags & ~ST_PATH
+                    self.path_count -= 1
+            elif code == EV_GEN_VISITED:
+                if not flags & ST_GEN_VISITED:
+                    b[cell_id] = flags | ST_GEN_VISITED
+                    self.gen_visited_count += 1
+            elif code == EV_CURRENT:
+                self.current_id = cell_id
+            elif code == EV_CURRENT_CLEAR:
+                self.current_id = -1
+            elif code >= EV_CARVE:
+                side = code - EV_CARVE
+                own, opposite = _CARVE_BITS[side]
+                self._wall_bytes[cell_id] &= ~own
+                self._wall_bytes[cell_id + self._side_offsets[side]] &= ~opposite
+                self.wall_version += 1
+
+def stream_for(grid: Any, events: Optional[DeltaStream]) -> DeltaStream:
+    """Returns `events`, or a fresh stream that applies straight to the grid's cells."""
+    if events is None:
+        events = DeltaStream()
+        events.subscribe(CellStateApplier(grid))
+    return events
@@ -0,0 +1,50 @@
+"""
+Headless execution helpers shared by the in-app BenchmarkService and benchmark_runner.
+
+Modes:
+    run   - call the non-generator `run()` entry point (no per-step overhead).
+    step  - drive `solve()` / `generate()` with one yield per step (visualizer-style).
+    chunk - drive `solve()` / `generate()` with one yield every `chunk_size` steps.
+"""
+import inspect
+from typing import Any
+
+EXECUTION_MODES = ("run", "step", "chunk")
+DEFAULT_CHUNK_SIZE = 64
+
+def _step_size(mode: str, chunk_size: int) -> int:
+    if mode == "step":
+        return 1
+    if mode == "chunk":
+        return max(1, chunk_size)
+    raise ValueError(f"Unknown execution mode: {mode}")
+
+def takes_workspace(solver: Any) -> bool:
+    """Whether the solver's run()/solve() accept a SolverWorkspace (the graph searches; not the wall follower)."""
+    return "workspace" in inspect.signature(solver.run).parameters
+
+def execute_solver(solver: Any, grid: Any, start_cell: Any, end_cell: Any, mode: str = "run", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   workspace: Any = None) -> dict:
+    """
+    Runs a solver to completion in the given mode and returns its result dict. `workspace` is
+    passed on to solvers that take one (otherwise they use the pooled workspace) and ignored
+    for the others.
+    """
+    kwargs = {"workspace": workspace} if workspace is not None and takes_workspace(solver) else {}
+    if mode == "run":
+        return solver.run(grid, start_cell, end_cell, **kwargs)
+    
+    solve_gen = solver.solve(grid, start_cell, end_cell, visualize=False, step_size=_step_size(mode, chunk_size), **kwargs)
+    try:
+        while True:
+            next(solve_gen)
+    except StopIteration as e:
+        return e.value
+
+def execute_generator(generator: Any, grid: Any, mode: str = "run", chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """Runs a generator to completion in the given mode."""
+    if mode == "run":
+        generator.run(grid)
+        return
+    
+    for _ in generator.generate(grid, visualize=False, step_size=_step_size(mode, chunk_size)): pass
@@ -1,10 +1,11 @@
 import random
-from typing import Generator
+from typing import Generator, Optional
 from ..interfaces import IGenerator
 from ..grid import Grid
+from ..events import DeltaStream, stream_for, carve_code, EV_GEN_VISITED, EV_CURRENT, EV_CURRENT_CLEAR
 
 class PrimsAlgorithm(IGenerator):
-    def generate(self, grid: Grid, visualize: bool = True) -> Generator[None, None, None]:
+    def generate(self, grid: Grid, visualize: bool = True, step_size: int = 1, events: Optional[DeltaStream] = None) -> Generator[None, None, None]:
         # Start at a random cell
         start_x = random.randint(0, grid.cols - 1)
         start_y = random.randint(0, grid.rows - 1)
@@ -12,13 +13,16 @@ class PrimsAlgorithm(IGenerator):
         
         start_cell.visited = True
         if visualize:
-            grid.current = start_cell
+            events = stream_for(grid, events)
+            events.emit(start_cell.id, EV_GEN_VISITED)
+            events.emit(start_cell.id, EV_CURRENT)
         
         # Frontier cells: unvisited cells that have at least one visited neighbor
         # Use a list for random selection and a set for fast lookup
         initial_frontier = grid.get_unvisited_neighbors(start_cell)
         frontier_list = list(initial_frontier)
         frontier_set = set(initial_frontier)
+        steps = 0
         
         while frontier_list:
             # Pick a random cell from the frontier list (O(1))
@@ -44,7 +48,8 @@ class PrimsAlgorithm(IGenerator):
             current.visited = True
 
             if visualize:
-                grid.current = current
+                events.emit(current.id, EV_GEN_VISITED)
+                events.emit(current.id, EV_CURRENT)
             
             # Find all visited neighbors of this cell
             neighbors = grid.get_neighbors(current)
@@ -54,6 +59,8 @@ class PrimsAlgorithm(IGenerator):
                 # Pick a random visited neighbor and remove the wall
                 neighbor = random.choice(visited_neighbors)
                 grid.remove_wall(current, neighbor)
+                if visualize:
+                    events.emit(current.id, carve_code(current, neighbor))
             
             # Add its unvisited neighbors to the frontier
             new_neighbors = grid.get_unvisited_neighbors(current)
@@ -62,8 +69,47 @@ class PrimsAlgorithm(IGenerator):
                     frontier_set.add(n)
                     frontier_list.append(n)
             
-            if visualize:
+            steps += 1
+            if steps == step_size:
+                steps = 0
+                if visualize:
+                    events.flush()
                 yield # Update visualization
             
         if visualize:
-            grid.current = None
+            events.emit(0, EV_CURRENT_CLEAR)
+            events.flush()
+
+    def run(self, grid: Grid) -> None:
+        # Same carving as `generate`, as a plain loop with no visualization or yields
+        start_cell = grid.get_cell(random.randint(0, grid.cols - 1), random.randint(0, grid.rows - 1))
+        start_cell.visited = True
+        
+        initial_frontier = grid.get_unvisited_neighbors(start_cell)
+        frontier_list = list(initial_frontier)
+        frontier_set = set(initial_frontier)
+        randint = random.randint
+        choice = random.choice
+        
+        while frontier_list:
+            idx = randint(0, len(frontier_list) - 1)
+            current = frontier_list[idx]
+            frontier_list[idx] = frontier_list[-1]
+            frontier_list.pop()
+            
+            if current not in frontier_set:
+                continue
+            frontier_set.remove(current)
+            if current.visited:
+                continue
+
+            current.visited = True
+            
+            visited_neighbors = [n for n in grid.get_neighbors(current) if n.visited]
+            if visited_neighbors:
+                grid.remove_wall(current, choice(visited_neighbors))
+            
+            for n in grid.get_unvisited_neighbors(current):
+                if n not in frontier_set:
+                    frontier_set.add(n)
+                    frontier_list.append(n)
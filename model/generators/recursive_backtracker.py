@@ -1,10 +1,11 @@
 import random
-from typing import Generator
+from typing import Generator, Optional
 from ..interfaces import IGenerator
 from ..grid import Grid
+from ..events import DeltaStream, stream_for, carve_code, EV_GEN_VISITED, EV_CURRENT, EV_CURRENT_CLEAR
 
 class RecursiveBacktracker(IGenerator):
-    def generate(self, grid: Grid, visualize: bool = True) -> Generator[None, None, None]:
+    def generate(self, grid: Grid, visualize: bool = True, step_size: int = 1, events: Optional[DeltaStream] = None) -> Generator[None, None, None]:
         # Start at the top-left cell (0,0)
         current = grid.get_cell(0, 0)
         if not current:
@@ -12,11 +13,16 @@ class RecursiveBacktracker(IGenerator):
             
         current.visited = True
         stack = [current]
+        steps = 0
+        
+        if visualize:
+            events = stream_for(grid, events)
+            events.emit(current.id, EV_GEN_VISITED)
         
         while stack:
             current = stack[-1]
             if visualize:
-                grid.current = current # For visualization
+                events.emit(current.id, EV_CURRENT) # For visualization
             
             # Step 1: Get unvisited neighbors
             neighbors = grid.get_unvisited_neighbors(current)
@@ -32,14 +38,45 @@ class RecursiveBacktracker(IGenerator):
                 neighbor.visited = True
                 stack.append(neighbor)
                 
-                # Yield to let the view update
                 if visualize:
-                    yield
+                    events.emit(current.id, carve_code(current, neighbor))
+                    events.emit(neighbor.id, EV_GEN_VISITED)
             else:
                 # Backtrack
                 stack.pop()
+            
+            # Yield to let the view update
+            steps += 1
+            if steps == step_size:
+                steps = 0
                 if visualize:
-                    yield
+                    events.flush()
+                yield
         
         if visualize:
-            grid.current = None # Reset pointer when done
+            events.emit(0, EV_CURRENT_CLEAR) # Reset pointer when done
+            events.flush()
+
+    def run(self, grid: Grid) -> None:
+        # Same carving as `generate`, as a plain loop with no visualization or yields
+        current = grid.get_cell(0, 0)
+        if not current:
+            return
+            
+        current.visited = True
+        stack = [current]
+        get_unvisited = grid.get_unvisited_neighbors
+        remove_wall = grid.remove_wall
+        choice = random.choice
+        
+        while stack:
+            current = stack[-1]
+            neighbors = get_unvisited(current)
+            
+            if neighbors:
+                neighbor = choice(neighbors)
+                remove_wall(current, neighbor)
+                neighbor.visited = True
+                stack.append(neighbor)
+            else:
+                stack.pop()
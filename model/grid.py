@@ -1,13 +1,25 @@
 import random
 from typing import List, Optional
+import numpy as np
 from .cell import Cell
 
+# Bit flags used by the packed wall array (one uint8 per cell)
+WALL_TOP = 1
+WALL_RIGHT = 2
+WALL_BOTTOM = 4
+WALL_LEFT = 8
+
 class Grid:
     def __init__(self, rows: int, cols: int):
         self.rows = rows
         self.cols = cols
         self.cells = [[Cell(c, r) for r in range(rows)] for c in range(cols)]
+        # Flat view indexed by cell id (x * rows + y), used by array-based solver state
+        self.cells_by_id = [cell for col in self.cells for cell in col]
+        for i, cell in enumerate(self.cells_by_id):
+            cell.id = i
         self.current = self.cells[0][0] # Pointer for visualization (e.g., current generator head)
+        self.version = 0 # Incremented on every wall change (lets views cache the wall layer)
     
     def get_cell(self, x: int, y: int) -> Optional[Cell]:
         if 0 <= x < self.cols and 0 <= y < self.rows:
@@ -40,6 +52,7 @@ class Grid:
         return accessible
 
     def remove_wall(self, a: Cell, b: Cell):
+        self.version += 1
         x = a.x - b.x
         y = a.y - b.y
         
@@ -56,6 +69,34 @@ class Grid:
             a.walls['bottom'] = False
             b.walls['top'] = False
 
+    def wall_array(self) -> np.ndarray:
+        """
+        Packs the walls into a uint8 array of shape (cols, rows).
+        Indexed [x, y]; the flattened index equals the cell id.
+        """
+        codes = []
+        for cell in self.cells_by_id:
+            w = cell.walls
+            codes.append((w['top'] and WALL_TOP) | (w['right'] and WALL_RIGHT) | (w['bottom'] and WALL_BOTTOM) | (w['left'] and WALL_LEFT))
+        return np.array(codes, dtype=np.uint8).reshape(self.cols, self.rows)
+
+    def load_wall_array(self, walls: np.ndarray):
+        """Overwrites all walls from an array produced by wall_array()."""
+        self.version += 1
+        for cell, code in zip(self.cells_by_id, walls.ravel().tolist()):
+            w = cell.walls
+            w['top'] = bool(code & WALL_TOP)
+            w['right'] = bool(code & WALL_RIGHT)
+            w['bottom'] = bool(code & WALL_BOTTOM)
+            w['left'] = bool(code & WALL_LEFT)
+
+    @classmethod
+    def from_wall_array(cls, walls: np.ndarray) -> "Grid":
+        cols, rows = walls.shape
+        grid = cls(rows, cols)
+        grid.load_wall_array(walls)
+        return grid
+
     def reset_visited(self):
         """Resets solver state for all cells."""
         for col in self.cells:
@@ -63,3 +104,65 @@ class Grid:
                 cell.visited_by_solver = False
                 cell.in_frontier = False
                 cell.is_path = False
+
+class WallCell:
+    """Cell of a WallArrayGrid: position, id and the walls of one wall-array code."""
+    __slots__ = ("x", "y", "id", "code", "walls")
+
+    def __init__(self, x: int, y: int, cell_id: int, code: int):
+        self.x = x
+        self.y = y
+        self.id = cell_id
+        self.code = code
+        self.walls = {'top': bool(code & WALL_TOP), 'right': bool(code & WALL_RIGHT),
+                      'bottom': bool(code & WALL_BOTTOM), 'left': bool(code & WALL_LEFT)}
+
+class _CellsById:
+    def __init__(self, grid: "WallArrayGrid"):
+        self.grid = grid
+
+    def __getitem__(self, cell_id: int) -> WallCell:
+        return self.grid.cell(cell_id)
+
+    def __len__(self) -> int:
+        return self.grid.rows * self.grid.cols
+
+class WallArrayGrid:
+    """
+    Read-only view of a packed wall array (see Grid.wall_array) with the Grid methods the
+    solvers' search loops use. Cells are created on first access, so a search pays for the
+    cells it reaches instead of a full Grid of Cells. No generator or visualization state.
+    """
+    def __init__(self, walls: np.ndarray):
+        self.cols, self.rows = walls.shape
+        self.codes = walls.ravel().tolist()
+        self._cells: List[Optional[WallCell]] = [None] * len(self.codes)
+        self.cells_by_id = _CellsById(self)
+
+    def cell(self, cell_id: int) -> WallCell:
+        cell = self._cells[cell_id]
+        if cell is None:
+            cell = self._cells[cell_id] = WallCell(cell_id // self.rows, cell_id % self.rows, cell_id, self.codes[cell_id])
+        return cell
+
+    def get_cell(self, x: int, y: int) -> Optional[WallCell]:
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return self.cell(x * self.rows + y)
+        return None
+
+    def get_accessible_neighbors(self, cell: WallCell) -> List[WallCell]:
+        """Open neighbors in Grid.get_neighbors order (top, right, bottom, left)."""
+        code, cell_id, rows = cell.code, cell.id, self.rows
+        accessible = []
+        if not code & WALL_TOP and cell.y > 0:
+            accessible.append(self.cell(cell_id - 1))
+        if not code & WALL_RIGHT and cell.x < self.cols - 1:
+            accessible.append(self.cell(cell_id + rows))
+        if not code & WALL_BOTTOM and cell.y < rows - 1:
+            accessible.append(self.cell(cell_id + 1))
+        if not code & WALL_LEFT and cell.x > 0:
+            accessible.append(self.cell(cell_id - rows))
+        return accessible
+
+    def reset_visited(self):
+        pass # No per-cell solver state
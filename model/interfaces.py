@@ -6,24 +6,38 @@ class IGenerator(ABC):
     Interface for Maze Generation Algorithms.
     """
     @abstractmethod
-    def generate(self, grid: Any) -> Generator[None, None, None]:
+    def generate(self, grid: Any, visualize: bool = True, step_size: int = 1, events: Any = None) -> Generator[None, None, None]:
         """
         Generates the maze structure.
         
         Args:
             grid: The Grid object to modify.
+            visualize: Whether to emit visualization deltas.
+            step_size: Number of algorithm steps between yields (chunked stepping).
+            events: Optional DeltaStream receiving per-step deltas when visualizing
+                    (defaults to a stream that applies them to the grid's cells).
             
         Yields:
             None: Yields control back to the caller for visualization updates.
         """
         pass
 
+    def run(self, grid: Any) -> None:
+        """
+        Generates the maze to completion without ever suspending.
+        Intended for headless use (benchmarks, batch jobs).
+        
+        The default implementation drains `generate`; concrete generators
+        override it with a plain loop.
+        """
+        for _ in self.generate(grid, visualize=False, step_size=2**62): pass
+
 class ISolver(ABC):
     """
     Interface for Maze Solving Algorithms.
     """
     @abstractmethod
-    def solve(self, grid: Any, start_cell: Any, end_cell: Any) -> Generator[None, None, list[Any]]:
+    def solve(self, grid: Any, start_cell: Any, end_cell: Any, visualize: bool = True, step_size: int = 1, events: Any = None) -> Generator[int, None, dict]:
         """
         Solves the maze.
 
@@ -31,11 +45,32 @@ class ISolver(ABC):
             grid: The Grid object.
             start_cell: The starting Cell.
             end_cell: The goal Cell.
+            visualize: Whether to emit visualization deltas.
+            step_size: Number of node expansions between yields (chunked stepping).
+            events: Optional DeltaStream receiving per-step deltas when visualizing
+                    (defaults to a stream that applies them to the grid's cells).
 
         Yields:
-            None: Yields control back to the caller for visualization updates.
+            int: Current frontier size, yielded back to the caller for visualization updates.
             
         Returns:
-            list[Cell]: The path from start to end.
+            dict: {"path": list[Cell], "visited_count": int, "peak_frontier": int, "working_set": int}
+            working_set counts the entries the search created in its own structures
+            (frontier insertions, each with a labelled workspace slot).
         """
         pass
+
+    def run(self, grid: Any, start_cell: Any, end_cell: Any) -> dict:
+        """
+        Solves the maze to completion without ever suspending.
+        Intended for headless use (benchmarks, batch queries).
+        
+        The default implementation drains `solve`; concrete solvers
+        override it with a plain loop.
+        """
+        solve_gen = self.solve(grid, start_cell, end_cell, visualize=False, step_size=2**62)
+        try:
+            while True:
+                next(solve_gen)
+        except StopIteration as e:
+            return e.value
@@ -0,0 +1,39 @@
+import os
+import threading
+import psutil
+
+class MemorySampler:
+    """
+    Samples this process's resident memory on a background thread at a low rate,
+    so the visualizer can show it every frame without a psutil call per frame.
+    """
+    def __init__(self, interval=0.5):
+        self.interval = interval # Seconds between samples
+        self.current_kb = 0.0
+        self.peak_kb = 0.0
+        self.process = psutil.Process(os.getpid())
+        self.thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.sample() # First value available immediately
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        self.current_kb = self.process.memory_info().rss / 1024
+        self.peak_kb = max(self.peak_kb, self.current_kb)
+
+    def stop(self):
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
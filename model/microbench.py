@@ -0,0 +1,195 @@
+"""
+Repeatable timing of generators and solvers for benchmark_runner.
+
+Each measurement runs `warmup` untimed calls first, then `repeats` timed calls. Before every
+timed call the setup (fresh grid, reset_visited) runs untimed and the garbage collector is
+run; it stays disabled while the call is timed, so a collection triggered by earlier garbage
+is never charged to the algorithm. Results are summarized with the median, the interquartile
+range, a distribution-free 95% confidence interval of the median and Tukey outlier fences.
+
+Memory is measured in a separate, untimed run under tracemalloc (which slows Python code
+down several times): the peak size of the blocks allocated during that one call.
+"""
+import gc
+import math
+import time
+import tracemalloc
+import statistics
+from typing import Any, Callable, Optional
+import psutil
+from model.grid import Grid
+from model.workspace import SolverWorkspace
+from model.execution import DEFAULT_CHUNK_SIZE, execute_solver, execute_generator, takes_workspace
+
+def measure(fn: Callable, setup: Optional[Callable] = None, warmup: int = 1, repeats: int = 5):
+    """
+    Times fn(setup()) `repeats` times after `warmup` untimed calls.
+    Returns (samples in ms, result of the last call).
+    """
+    result = None
+    for _ in range(warmup):
+        result = fn(setup() if setup else None)
+
+    samples = []
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            arg = setup() if setup else None
+            gc.collect() # Earlier garbage (previous runs, setup) is collected untimed
+            start_time = time.perf_counter_ns()
+            result = fn(arg)
+            samples.append((time.perf_counter_ns() - start_time) / 1_000_000)
+    finally:
+        if was_enabled:
+            gc.enable()
+    return samples, result
+
+def peak_alloc_kb(fn: Callable, setup: Optional[Callable] = None, runs: int = 1) -> float:
+    """
+    Peak KB allocated (and still alive at the peak) during a call of fn(setup()); the
+    smallest of `runs` calls, since an occasional resize or free-list miss inflates one.
+    """
+    peaks = []
+    for _ in range(runs):
+        arg = setup() if setup else None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn(arg)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peaks.append(peak)
+    return min(peaks) / 1024
+
+def median_ci(ordered: list, z: float = 1.96):
+    """Distribution-free confidence interval of the median from order statistics (normal approximation)."""
+    n = len(ordered)
+    half = z * math.sqrt(n) / 2
+    lo = max(0, math.floor(n / 2 - half) - 1)
+    hi = min(n - 1, math.ceil(n / 2 + half))
+    return ordered[lo], ordered[hi]
+
+def summarize(samples: list) -> dict:
+    """Median, quartiles, 95% CI of the median and Tukey outliers (beyond 1.5 IQR) of `samples`."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    if n == 1:
+        q1 = median = q3 = ordered[0]
+    else:
+        q1, median, q3 = statistics.quantiles(ordered, n=4, method="inclusive")
+    iqr = q3 - q1
+    low_fence, high_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    ci_low, ci_high = median_ci(ordered)
+    return {
+        "n": n,
+        "median": median,
+        "q1": q1,
+        "q3": q3,
+        "iqr": iqr,
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "outliers": [x for x in samples if x < low_fence or x > high_fence],
+    }
+
+def mann_whitney_greater(current: list, baseline: list) -> float:
+    """
+    One-sided Mann-Whitney U test: p-value for "`current` tends to be larger than `baseline`"
+    (normal approximation with tie and continuity correction; no distribution assumed).
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    # Midranks of the pooled samples
+    pooled = sorted([(x, 0) for x in current] + [(x, 1) for x in baseline])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    u = sum(r for r, (_, group) in zip(ranks, pooled) if group == 0) - n1 * (n1 + 1) / 2
+    
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0 # All values equal
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def bench_generator(generator: Any, rows: int, cols: int, mode: str = "run", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    warmup: int = 1, repeats: int = 5):
+    """
+    Times an IGenerator on fresh rows x cols grids (grid allocation is not timed).
+    Returns (samples in ms, the grid generated by the last timed run).
+    """
+    def generate(grid):
+        execute_generator(generator, grid, mode, chunk_size)
+        return grid
+    return measure(generate, lambda: Grid(rows, cols), warmup, repeats)
+
+def bench_solver(solver: Any, grid: Grid, start_cell: Any, end_cell: Any, mode: str = "run",
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, warmup: int = 1, repeats: int = 5):
+    """
+    Times an ISolver on `grid` (visited flags are reset before every call, untimed).
+    Returns (samples in ms, the result dict of the last timed run).
+    """
+    return measure(lambda _: execute_solver(solver, grid, start_cell, end_cell, mode, chunk_size),
+                   grid.reset_visited, warmup, repeats)
+
+def solver_peak_kb(solver: Any, grid: Grid, start_cell: Any, end_cell: Any, mode: str = "run",
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, runs: int = 1) -> float:
+    """
+    Peak KB a solver allocates in a run on `grid` (see peak_alloc_kb). Solvers that take a
+    workspace get a fresh one, allocated inside the traced call: timed runs reuse the pooled
+    workspace, but its arrays are the search's main memory and belong in the figure.
+    """
+    fresh_workspace = takes_workspace(solver)
+    def run(_):
+        workspace = SolverWorkspace.for_grid(grid) if fresh_workspace else None
+        return execute_solver(solver, grid, start_cell, end_cell, mode, chunk_size, workspace)
+    return peak_alloc_kb(run, grid.reset_visited, runs)
+
+def pin_worker(counter: Any):
+    """
+    Pool initializer: pins each worker process to its own CPU, round robin over the CPUs this
+    process may use, so workers don't migrate between cores mid-measurement. `counter` is a
+    shared multiprocessing.Value('i'). No-op where affinity is unsupported (macOS).
+    """
+    process = psutil.Process()
+    if not hasattr(process, "cpu_affinity"):
+        return
+    cpus = process.cpu_affinity()
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    process.cpu_affinity([cpus[index % len(cpus)]])
+
+def solve_within(solver: Any, grid: Grid, start_cell: Any, end_cell: Any, timeout_s: float,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Optional[dict]:
+    """
+    Runs `solver.solve()` in chunks of `chunk_size` expansions, checking the clock between
+    chunks. Returns the result dict, or None once the solve has taken longer than `timeout_s`
+    (the generator is closed and the grid's visited flags are left dirty).
+    """
+    grid.reset_visited()
+    deadline = time.perf_counter() + timeout_s
+    solve_gen = solver.solve(grid, start_cell, end_cell, visualize=False, step_size=max(1, chunk_size))
+    try:
+        while True:
+            next(solve_gen)
+            if time.perf_counter() > deadline:
+                solve_gen.close()
+                return None
+    except StopIteration as e:
+        return e.value
@@ -0,0 +1,132 @@
+"""
+Operation counts of a solver's run(), for explaining time differences between solvers.
+
+Nothing in the solvers counts anything: count_ops runs the same run() loop with counting
+stand-ins for its collaborators (a CountingGrid, a CountingWorkspace and, for the heap-based
+solvers, counting heappush/heappop set on the instance). Normal runs use the plain grid,
+the pooled workspace and heapq's C functions, so they pay nothing for this.
+
+Counters (per solve):
+    neighbor_queries  get_neighbors / get_accessible_neighbors calls
+    cell_lookups      get_cell calls made by the solver itself
+    wall_checks       wall tests inside get_accessible_neighbors
+    frontier_pushes   queue / stack / heap insertions
+    frontier_pops     queue / stack / heap removals
+    stale_pops        heap pops of a cell that was already expanded (outdated entries)
+    label_writes      predecessor (parent) writes: new or improved labels
+    path_steps        cells walked back when reconstructing the path
+"""
+import heapq
+from collections import deque
+from typing import Any, Dict
+from model.workspace import SolverWorkspace
+from model.execution import takes_workspace
+
+OP_COUNTERS = ("neighbor_queries", "cell_lookups", "wall_checks", "frontier_pushes", "frontier_pops",
+               "stale_pops", "label_writes", "path_steps")
+
+class CountingGrid:
+    """Wraps a Grid, counting the queries a solver makes; everything else is passed through."""
+    def __init__(self, grid: Any, counts: Dict[str, int]):
+        self._grid = grid
+        self.counts = counts
+
+    def __getattr__(self, name):
+        return getattr(self._grid, name)
+
+    def get_cell(self, x: int, y: int):
+        self.counts["cell_lookups"] += 1
+        return self._grid.get_cell(x, y)
+
+    def get_neighbors(self, cell: Any):
+        self.counts["neighbor_queries"] += 1
+        return self._grid.get_neighbors(cell)
+
+    def get_accessible_neighbors(self, cell: Any):
+        self.counts["neighbor_queries"] += 1
+        neighbors = self._grid.get_neighbors(cell)
+        self.counts["wall_checks"] += len(neighbors)
+        return [n for n in neighbors if not cell.check_walls(n)]
+
+class _CountingStack(list):
+    def __init__(self, counts):
+        super().__init__()
+        self.counts = counts
+
+    def append(self, item):
+        self.counts["frontier_pushes"] += 1
+        super().append(item)
+
+    def pop(self, *args):
+        self.counts["frontier_pops"] += 1
+        return super().pop(*args)
+
+class _CountingQueue(deque):
+    def __init__(self, counts):
+        super().__init__()
+        self.counts = counts
+
+    def append(self, item):
+        self.counts["frontier_pushes"] += 1
+        super().append(item)
+
+    def popleft(self):
+        self.counts["frontier_pops"] += 1
+        return super().popleft()
+
+class _CountingLabels(list):
+    def __init__(self, items, counts):
+        super().__init__(items)
+        self.counts = counts
+
+    def __setitem__(self, index, value):
+        self.counts["label_writes"] += 1
+        super().__setitem__(index, value)
+
+class CountingWorkspace(SolverWorkspace):
+    """A private SolverWorkspace whose frontier containers and parent labels count their use."""
+    def __init__(self, size: int, counts: Dict[str, int]):
+        super().__init__(size)
+        self.counts = counts
+        self.queue = _CountingQueue(counts)
+        self.stack = _CountingStack(counts)
+        self.heap = _CountingStack(counts) # Only the start entry is appended; heappush is counted separately
+        self.parent = _CountingLabels(self.parent, counts)
+
+    def build_path(self, end_cell: Any):
+        path = super().build_path(end_cell)
+        self.counts["path_steps"] += len(path)
+        return path
+
+def counting_heap_ops(counts: Dict[str, int]):
+    """heappush / heappop that count frontier operations; a pop of an already popped cell id is stale."""
+    popped = set()
+    def heappush(heap, item):
+        counts["frontier_pushes"] += 1
+        heapq.heappush(heap, item)
+    def heappop(heap):
+        item = heapq.heappop(heap)
+        counts["frontier_pops"] += 1
+        if item[-1] in popped:
+            counts["stale_pops"] += 1
+        else:
+            popped.add(item[-1])
+        return item
+    return heappush, heappop
+
+def count_ops(solver: Any, grid: Any, start_cell: Any, end_cell: Any) -> Dict[str, int]:
+    """Runs solver.run() once with counting collaborators and returns the counters (see OP_COUNTERS)."""
+    counts = dict.fromkeys(OP_COUNTERS, 0)
+    grid.reset_visited()
+    kwargs = {}
+    if takes_workspace(solver):
+        kwargs["workspace"] = CountingWorkspace(grid.rows * grid.cols, counts)
+    has_heap = hasattr(solver, "heappush")
+    if has_heap:
+        solver.heappush, solver.heappop = counting_heap_ops(counts)
+    try:
+        solver.run(CountingGrid(grid, counts), start_cell, end_cell, **kwargs)
+    finally:
+        if has_heap:
+            del solver.heappush, solver.heappop # Back to the class's heapq functions
+    return counts
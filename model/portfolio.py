@@ -0,0 +1,247 @@
+import csv
+import os
+import time
+import queue
+import weakref
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from model.grid import Grid, WallArrayGrid
+from model.registry import SOLVERS
+
+# Expansions between cancellation checks inside a racing worker
+CANCEL_CHECK_INTERVAL = 256
+
+# Longest wait (seconds) for the next racer to report; a broken pool ends the race instead of hanging it
+RACE_TIMEOUT = 600.0
+
+# Shared wait (seconds) for the cancelled losers of earlier races before a new race starts.
+# Losers stop within CANCEL_CHECK_INTERVAL expansions; one that doesn't is left running.
+DRAIN_TIMEOUT = 0.05
+
+# Solvers that explore every reachable cell, so an empty result proves there is no path.
+# The wall follower is not one of them: it can circle an island forever.
+EXHAUSTIVE_SOLVERS = {"BFS", "DFS", "AStar", "Dijkstra"}
+
+# --- Worker side (module level so it can be pickled by multiprocessing) ---
+
+_current_race = None # Shared id of the race in progress; racers of any other race give up
+_grid_cache: Tuple[Optional[str], Optional[WallArrayGrid]] = (None, None)
+
+def _init_worker(current_race):
+    global _current_race
+    _current_race = current_race
+
+def _load_grid(shm_name: str, shape: Tuple[int, int]) -> WallArrayGrid:
+    """
+    A search view of the shared wall array (cells are created as the search reaches them),
+    reused for repeated queries on one maze. Segment names are unique per maze.
+    """
+    global _grid_cache
+    if _grid_cache[0] != shm_name:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            walls = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            grid = WallArrayGrid(walls) # Copies the codes out of the segment
+            del walls
+        finally:
+            shm.close()
+        _grid_cache = (shm_name, grid)
+    return _grid_cache[1]
+
+def _race(args):
+    """Runs one solver, giving up as soon as another worker has won."""
+    name, shm_name, shape, race_id, start, end = args
+    if _current_race.value != race_id:
+        return name, None
+    
+    grid = _load_grid(shm_name, shape)
+    start_time = time.perf_counter_ns()
+    
+    # Chunked stepping lets the solver notice cancellation without killing the pool
+    solve_gen = SOLVERS[name]().solve(grid, grid.get_cell(*start), grid.get_cell(*end), visualize=False, step_size=CANCEL_CHECK_INTERVAL)
+    try:
+        while True:
+            next(solve_gen)
+            if _current_race.value != race_id:
+                return name, None
+    except StopIteration as e:
+        res = e.value
+    
+    return name, {
+        "path": [(c.x, c.y) for c in res["path"]],
+        "visited_count": res["visited_count"],
+        "peak_frontier": res["peak_frontier"],
+        "time_ms": (time.perf_counter_ns() - start_time) / 1_000_000
+    }
+
+# --- Parent side ---
+
+class SolverPortfolio:
+    """
+    Races several solvers on the same maze across a process pool and returns
+    the first valid path. Losers are cancelled cooperatively.
+    
+    The maze is published once per wall change (Grid.version) as a shared uint8 wall array;
+    racers search it through a WallArrayGrid instead of rebuilding a Grid of Cells.
+    
+    Every race is appended to a CSV log so per-generator win rates accumulate
+    across sessions (see win_rate_table).
+    """
+    LOG_FIELDS = ["timestamp", "generator", "cols", "rows", "winner", "time_ms", "latency_ms", "path_len", "visited_count"]
+
+    def __init__(self, solver_names=("DFS", "AStar", "WallFollower"), log_path="portfolio_wins.csv"):
+        self.solver_names = list(solver_names)
+        self.log_path = log_path
+        self.pool = None
+        self.current_race = None
+        self.race_id = 0
+        self._maze = None # (weak ref to the grid, its version, shared memory, shape) of the published maze
+        self._pending = [] # (async results, shared memory) of earlier races still winding down
+        self._retired = [] # Segments of earlier mazes, unlinked once no pending race uses them
+
+    def _ensure_pool(self):
+        if self.pool is None:
+            # Started before the fork so the workers share it: a worker that attaches a segment
+            # would otherwise start its own tracker, which unlinks the parent's segments on exit
+            resource_tracker.ensure_running()
+            self.current_race = multiprocessing.RawValue('i', 0)
+            self.pool = multiprocessing.Pool(len(self.solver_names), initializer=_init_worker, initargs=(self.current_race,))
+
+    def _publish(self, grid: Grid):
+        """The shared segment and shape holding `grid`'s walls, repacked only when the walls changed."""
+        if self._maze is not None:
+            ref, version, shm, shape = self._maze
+            if ref() is grid and version == grid.version:
+                return shm, shape
+            self._retired.append(shm)
+        walls = grid.wall_array()
+        shm = shared_memory.SharedMemory(create=True, size=walls.nbytes)
+        np.ndarray(walls.shape, dtype=np.uint8, buffer=shm.buf)[:] = walls
+        self._maze = (weakref.ref(grid), grid.version, shm, walls.shape)
+        return shm, walls.shape
+
+    def _drain(self, timeout: float = DRAIN_TIMEOUT):
+        """
+        Gives the cancelled losers of earlier races one shared `timeout` to finish, then unlinks
+        retired segments no unfinished race still uses. Losers still running are kept for a
+        later drain; the new race doesn't wait for them.
+        """
+        deadline = time.perf_counter() + timeout
+        unfinished = []
+        for async_results, shm in self._pending:
+            for r in async_results:
+                r.wait(max(0.0, deadline - time.perf_counter()))
+            if not all(r.ready() for r in async_results):
+                unfinished.append((async_results, shm))
+        self._pending = unfinished
+        in_use = {id(shm) for _, shm in unfinished}
+        for shm in [s for s in self._retired if id(s) not in in_use]:
+            shm.close()
+            shm.unlink()
+            self._retired.remove(shm)
+
+    def solve(self, grid: Grid, start_cell: Any, end_cell: Any, generator_name: str = "Unknown") -> Optional[dict]:
+        """
+        Returns {"winner", "path" (list[Cell] on `grid`), "visited_count", "peak_frontier",
+        "time_ms" (winner's solve time), "latency_ms" (end-to-end)}, or None if no solver found a path.
+        """
+        self._ensure_pool()
+        self._drain()
+        race_start = time.perf_counter_ns()
+        
+        shm, shape = self._publish(grid)
+        self.race_id += 1
+        race_id = self.race_id
+        self.current_race.value = race_id
+        
+        results = queue.Queue()
+        start, end = (start_cell.x, start_cell.y), (end_cell.x, end_cell.y)
+        async_results = [
+            self.pool.apply_async(_race, ((name, shm.name, shape, race_id, start, end),), callback=results.put,
+                                  error_callback=lambda e, name=name: results.put((name, e)))
+            for name in self.solver_names
+        ]
+        self._pending.append((async_results, shm))
+        
+        winner = None
+        for _ in async_results:
+            try:
+                name, res = results.get(timeout=RACE_TIMEOUT)
+            except queue.Empty:
+                print(f"Portfolio: no solver reported within {RACE_TIMEOUT:.0f}s, giving up")
+                break
+            if isinstance(res, Exception):
+                print(f"Portfolio: {name} failed: {res!r}")
+                continue # The others may still win
+            if res and res["path"] and res["path"][0] == start and res["path"][-1] == end:
+                winner = (name, res)
+                break
+            if res and name in EXHAUSTIVE_SOLVERS:
+                break # Unreachable goal; don't wait on solvers that may never finish
+        self.current_race.value = 0 # Cancels the losers
+        
+        if winner is None:
+            return None
+        
+        name, res = winner
+        latency_ms = (time.perf_counter_ns() - race_start) / 1_000_000
+        result = {
+            "winner": name,
+            "path": [grid.get_cell(x, y) for x, y in res["path"]],
+            "visited_count": res["visited_count"],
+            "peak_frontier": res["peak_frontier"],
+            "time_ms": res["time_ms"],
+            "latency_ms": latency_ms
+        }
+        self._log(generator_name, grid, result)
+        return result
+
+    def _log(self, generator_name: str, grid: Grid, result: dict):
+        is_new = not os.path.exists(self.log_path)
+        with open(self.log_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.LOG_FIELDS)
+            if is_new:
+                writer.writeheader()
+            writer.writerow({
+                "timestamp": time.time(),
+                "generator": generator_name,
+                "cols": grid.cols,
+                "rows": grid.rows,
+                "winner": result["winner"],
+                "time_ms": result["time_ms"],
+                "latency_ms": result["latency_ms"],
+                "path_len": len(result["path"]),
+                "visited_count": result["visited_count"]
+            })
+
+    def close(self):
+        if self.pool is not None:
+            self.current_race.value = 0
+            self._drain(timeout=1.0)
+            self.pool.terminate() # Stops losers that never noticed the cancellation
+            self.pool.join()
+            self.pool = None
+            if self._maze is not None:
+                self._retired.append(self._maze[2])
+                self._maze = None
+            self._pending = []
+            self._drain()
+
+def win_rate_table(log_path="portfolio_wins.csv") -> Dict[str, Dict[str, float]]:
+    """Reads the race log and returns {generator: {solver: win rate}}."""
+    wins = defaultdict(lambda: defaultdict(int))
+    try:
+        with open(log_path, "r") as f:
+            for row in csv.DictReader(f):
+                wins[row["generator"]][row["winner"]] += 1
+    except FileNotFoundError:
+        return {}
+    
+    table = {}
+    for gen, counts in wins.items():
+        total = sum(counts.values())
+        table[gen] = {name: count / total for name, count in sorted(counts.items())}
+    return table
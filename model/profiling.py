@@ -0,0 +1,126 @@
+"""
+Profilers for benchmark_runner --profile.
+
+SamplingProfiler interrupts the process every `interval` seconds of CPU time (SIGPROF) and
+counts the Python stack it lands in; the cost is one stack walk per sample, so the profiled
+code runs at close to full speed. Stacks are kept as collapsed lines ("a;b;c count", root
+first), the input format of flamegraph.pl, speedscope and inferno. Where SIGPROF is missing
+(Windows) a thread samples the main thread's frame instead.
+
+profile_call runs a callable under cProfile for exact call counts and per-function times.
+"""
+import os
+import sys
+import time
+import signal
+import cProfile
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict
+
+def frame_name(code: Any, module: str) -> str:
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples = Counter() # Tuple of (code, module) from root to leaf -> count
+        self._stop_code = None
+        self._previous = None
+        self._thread = None
+        self._done = None
+
+    def run(self, fn: Callable, *args) -> Any:
+        """Calls fn(*args) while sampling; only frames below this call are recorded."""
+        self.start()
+        try:
+            return fn(*args)
+        finally:
+            self.stop()
+
+    def start(self):
+        """
+        Starts sampling; only frames below the caller's are recorded. A run shorter than one
+        interval is only sampled if the timer keeps running across runs, so loops of short runs
+        should be bracketed by one start()/stop() (see sample_for) rather than run() each.
+        """
+        self._stop_code = sys._getframe(1).f_code
+        if hasattr(signal, "setitimer"):
+            self._previous = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            return
+
+        # No SIGPROF: sample from a thread (coarser, wall-clock based)
+        target = threading.get_ident()
+        self._done = done = threading.Event()
+        def sampler():
+            while not done.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                if frame is not None:
+                    self._record(frame)
+        self._thread = threading.Thread(target=sampler, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous)
+        else:
+            self._done.set()
+            self._thread.join()
+
+    def _on_signal(self, signum, frame):
+        self._record(frame)
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None and frame.f_code is not self._stop_code:
+            stack.append((frame.f_code, frame.f_globals.get("__name__", "?")))
+            frame = frame.f_back
+        if stack:
+            self.samples[tuple(reversed(stack))] += 1
+
+    def collapsed(self) -> Counter:
+        """{"root;...;leaf": count} with readable names (mergeable across processes)."""
+        out = Counter()
+        for stack, count in self.samples.items():
+            out[";".join(frame_name(code, module) for code, module in stack)] += count
+        return out
+
+def self_counts(collapsed: Dict[str, int]) -> Counter:
+    """Samples per leaf function: where the time was spent, not what called it."""
+    out = Counter()
+    for stack, count in collapsed.items():
+        out[stack.rsplit(";", 1)[-1]] += count
+    return out
+
+def write_collapsed(path: str, collapsed: Dict[str, int]):
+    with open(path, "w") as f:
+        for stack, count in sorted(collapsed.items()):
+            f.write(f"{stack} {count}\n")
+
+def profile_call(fn: Callable, path: str, *args) -> Any:
+    """Calls fn(*args) under cProfile and dumps the stats to `path` (pstats format)."""
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        profiler.dump_stats(path)
+
+def sample_for(profiler: SamplingProfiler, fn: Callable, min_seconds: float, *args) -> int:
+    """
+    Runs fn(*args) repeatedly until `min_seconds` of wall time has passed, sampled by `profiler`
+    across all runs (one timer for the whole loop, so runs shorter than the interval are sampled
+    too); returns the run count.
+    """
+    runs = 0
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        while runs == 0 or time.perf_counter() - start < min_seconds:
+            fn(*args)
+            runs += 1
+    finally:
+        profiler.stop()
+    return runs
@@ -0,0 +1,21 @@
+from model.generators.recursive_backtracker import RecursiveBacktracker
+from model.generators.prims import PrimsAlgorithm
+from model.solvers.bfs import BFS
+from model.solvers.dfs import DFS
+from model.solvers.astar import AStar
+from model.solvers.dijkstra import Dijkstra
+from model.solvers.wall_follower import WallFollower
+
+# Name -> class, so algorithms can be instantiated by name inside worker processes
+GENERATORS = {
+    "RecursiveBacktracker": RecursiveBacktracker,
+    "Prims": PrimsAlgorithm
+}
+
+SOLVERS = {
+    "BFS": BFS,
+    "DFS": DFS,
+    "AStar": AStar,
+    "Dijkstra": Dijkstra,
+    "WallFollower": WallFollower
+}
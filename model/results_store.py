@@ -0,0 +1,130 @@
+"""
+SQLite store of benchmark results across runs.
+
+Every benchmark_runner run is one row in `runs` (start time, git revision, machine, Python,
+seed base and settings) and its result rows go to `results` under that run id. `results` is
+indexed on (generator, algorithm, size) and on run_id, and load() returns columns as NumPy
+arrays, so analysis works on whole columns instead of row by row.
+"""
+import os
+import json
+import sqlite3
+import platform
+import subprocess
+import multiprocessing
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from model.opcount import OP_COUNTERS
+
+TEXT_COLUMNS = ("generator", "algorithm", "mode", "status")
+INT_COLUMNS = ("size", "iteration", "seed", "repeats")
+# Everything else is REAL: NULL for solvers that timed out or were skipped
+REAL_COLUMNS = ("time_ms", "time_q1_ms", "time_q3_ms", "gen_time_ms", "path_len", "visited_count",
+                "peak_frontier", "working_set", "peak_alloc_kb", "memory_kb", "task_ms", *OP_COUNTERS)
+COLUMNS = TEXT_COLUMNS + INT_COLUMNS + REAL_COLUMNS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT,
+    git_rev TEXT,
+    machine TEXT,
+    python TEXT,
+    seed INTEGER,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER REFERENCES runs(run_id),
+    {", ".join(f"{c} TEXT" for c in TEXT_COLUMNS)},
+    {", ".join(f"{c} INTEGER" for c in INT_COLUMNS)},
+    {", ".join(f"{c} REAL" for c in REAL_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS results_by_workload ON results (generator, algorithm, size);
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id);
+"""
+
+def git_revision() -> str:
+    """Short HEAD hash of this checkout, with "-dirty" for uncommitted changes; "unknown" without git."""
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo, capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def machine_info() -> str:
+    return f"{platform.platform()} | {platform.processor() or platform.machine()} | {multiprocessing.cpu_count()} CPUs"
+
+class ResultsStore:
+    def __init__(self, path: str = "results.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        # Stores created before a column was added: older runs read it as NULL
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        for column in REAL_COLUMNS:
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {column} REAL")
+
+    def close(self):
+        self.conn.close()
+
+    def add_run(self, rows: Iterable[dict], seed: int, config: dict) -> int:
+        """Stores one run's result rows (values may be strings, as read back from CSV) and returns its run id."""
+        def value(row, column, kind):
+            v = row.get(column)
+            if v is None or v == "":
+                return None
+            return kind(v)
+
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (started, git_rev, machine, python, seed, config) VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), git_revision(), machine_info(),
+                 platform.python_version(), seed, json.dumps(config)))
+            run_id = cur.lastrowid
+            kinds = [(c, str) for c in TEXT_COLUMNS] + [(c, int) for c in INT_COLUMNS] + [(c, float) for c in REAL_COLUMNS]
+            self.conn.executemany(
+                f"INSERT INTO results (run_id, {', '.join(COLUMNS)}) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                ((run_id, *(value(row, c, kind) for c, kind in kinds)) for row in rows))
+        return run_id
+
+    def runs(self) -> List[dict]:
+        cur = self.conn.execute(
+            "SELECT r.run_id, r.started, r.git_rev, r.machine, r.python, r.seed, r.config, COUNT(x.run_id) "
+            "FROM runs r LEFT JOIN results x ON x.run_id = r.run_id GROUP BY r.run_id ORDER BY r.run_id")
+        keys = ("run_id", "started", "git_rev", "machine", "python", "seed", "config", "rows")
+        return [dict(zip(keys, row)) for row in cur]
+
+    def latest_run(self) -> Optional[int]:
+        return self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+
+    def load(self, run_id: int, columns: Iterable[str] = COLUMNS, generator: Optional[str] = None,
+             algorithm: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        One run's results as {column: array}: text columns as str arrays, size/iteration/seed/
+        repeats as int64, the rest float64 with NaN for NULL. Optional generator/algorithm
+        filters use the workload index.
+        """
+        columns = list(columns)
+        where, params = ["run_id = ?"], [run_id]
+        if generator is not None:
+            where.append("generator = ?")
+            params.append(generator)
+        if algorithm is not None:
+            where.append("algorithm = ?")
+            params.append(algorithm)
+        rows = self.conn.execute(f"SELECT {', '.join(columns)} FROM results WHERE {' AND '.join(where)}", params).fetchall()
+
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        out = {}
+        for column, vals in zip(columns, values):
+            if column in TEXT_COLUMNS:
+                out[column] = np.array(vals, dtype=str)
+            elif column in INT_COLUMNS:
+                out[column] = np.array(vals, dtype=np.int64)
+            else:
+                out[column] = np.array(vals, dtype=np.float64) # None -> NaN
+        return out
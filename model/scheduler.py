@@ -0,0 +1,117 @@
+"""
+Cost-aware scheduling for benchmark_runner.
+
+CostModel fits task runtime against maze cells per generator (a power law on a log-log scale)
+from the tasks finished so far, so the pool can be fed the most expensive tasks first and the
+short ones fill in the gaps at the end. plan_round decides how many more mazes each
+(generator, size) group needs: until the median times have a confidence interval narrower
+than the target, as far as the wall-clock budget allows.
+"""
+import math
+from typing import Dict, List, Tuple
+import numpy as np
+from model.microbench import summarize
+
+class CostModel:
+    """Predicted task wall time (ms) per generator: a * cells ** b."""
+    def __init__(self):
+        self.fits = {}
+
+    def fit(self, rows: List[dict]):
+        """Fits every generator from finished rows (task_ms is the same on all rows of a task)."""
+        tasks = {}
+        for row in rows:
+            if row.get("task_ms"):
+                tasks[(row["generator"], int(row["size"]), row["seed"])] = float(row["task_ms"])
+
+        per_size = {}
+        for (gen_name, size, _), ms in tasks.items():
+            per_size.setdefault(gen_name, {}).setdefault(size * size, []).append(ms)
+
+        self.fits = {}
+        for gen_name, sizes in per_size.items():
+            cells = sorted(sizes)
+            medians = [float(np.median(sizes[c])) for c in cells]
+            if len(cells) == 1:
+                # One size measured: assume linear scaling through it
+                b = 1.0
+            else:
+                b, _ = np.polyfit(np.log(cells), np.log(medians), 1)
+                b = max(float(b), 0.5) # Noise at tiny sizes can flatten the fit; nothing here is sublinear
+            # Anchor the curve at the largest measured size, where it matters most
+            self.fits[gen_name] = (medians[-1] / cells[-1] ** b, b)
+
+    def predict(self, gen_name: str, size: int) -> float:
+        """Predicted ms; before anything was measured, the cell count stands in (relative order only)."""
+        a, b = self.fits.get(gen_name, (1.0, 1.0))
+        return a * (size * size) ** b
+
+    @property
+    def fitted(self) -> bool:
+        return bool(self.fits)
+
+    def describe(self) -> str:
+        return ", ".join(f"{g}: {a:.2e} * cells^{b:.2f} ms" for g, (a, b) in sorted(self.fits.items()))
+
+def order_tasks(tasks: List[tuple], model: CostModel) -> List[tuple]:
+    """Largest predicted cost first; task[0] is the generator name and task[1] the size."""
+    return sorted(tasks, key=lambda t: model.predict(t[0], t[1]), reverse=True)
+
+def relative_ci(rows: List[dict]) -> Dict[Tuple[str, int], float]:
+    """
+    Per (generator, size): the widest half-width of a median's 95% confidence interval relative
+    to the median, over generation and every solver that never timed out in that group.
+    inf with fewer than 3 mazes.
+    """
+    samples = {}
+    dropped = set()
+    for row in rows:
+        key = (row["generator"], int(row["size"]))
+        group = samples.setdefault(key, {})
+        group.setdefault("(generate)", {})[row["seed"]] = float(row["gen_time_ms"])
+        if row.get("status", "ok") == "ok":
+            group.setdefault(row["algorithm"], {})[row["seed"]] = float(row["time_ms"])
+        else:
+            dropped.add((key, row["algorithm"]))
+
+    widths = {}
+    for key, group in samples.items():
+        worst = 0.0
+        for name, times in group.items():
+            if (key, name) in dropped:
+                continue # Timed out here: more mazes won't give it a median
+            if len(times) < 3:
+                worst = math.inf
+                break
+            st = summarize(list(times.values()))
+            if st["median"] > 0:
+                worst = max(worst, (st["ci_high"] - st["ci_low"]) / 2 / st["median"])
+        widths[key] = worst
+    return widths
+
+def plan_round(groups: List[Tuple[str, int]], counts: Dict[Tuple[str, int], int], widths: Dict[Tuple[str, int], float],
+               model: CostModel, capacity_ms: float, target: float, min_iterations: int, max_iterations: int) -> Dict[Tuple[str, int], int]:
+    """
+    Iterations to add per group for the next round. Groups below `min_iterations` are topped up
+    first; then every group whose relative CI is still above `target` gets its count doubled
+    (up to `max_iterations`), widest interval first, while the predicted cost fits in
+    `capacity_ms` (remaining wall time x workers).
+    """
+    plan = {}
+    def take(key, n):
+        nonlocal capacity_ms
+        cost = n * model.predict(*key)
+        if n <= 0 or cost > capacity_ms:
+            return
+        plan[key] = plan.get(key, 0) + n
+        capacity_ms -= cost
+
+    # Smallest first, so a tight budget still covers the cheap sizes
+    for key in sorted(groups, key=lambda k: model.predict(*k)):
+        take(key, min_iterations - counts.get(key, 0))
+
+    pending = [k for k in groups if k not in plan and widths.get(k, math.inf) > target]
+    for key in sorted(pending, key=lambda k: widths.get(k, math.inf), reverse=True):
+        n = counts.get(key, 0)
+        take(key, min(n, max_iterations - n))
+    return plan
@@ -1,67 +1,137 @@
 import heapq
-from typing import Generator, List
+from typing import Generator, List, Optional
 from ..interfaces import ISolver
 from ..grid import Grid
 from ..cell import Cell
+from ..workspace import SolverWorkspace, get_workspace, acquire_workspace, release_workspace
+from ..events import DeltaStream, stream_for, EV_FRONTIER, EV_VISITED, EV_PATH
 
 class AStar(ISolver):
+    # Heap functions used by run(); model.opcount swaps in counting ones per instance
+    heappush = staticmethod(heapq.heappush)
+    heappop = staticmethod(heapq.heappop)
+
     def heuristic(self, a: Cell, b: Cell) -> int:
         """Manhattan distance heuristic."""
         return abs(a.x - b.x) + abs(a.y - b.y)
 
-    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True) -> Generator[int, None, dict]:
-        # Priority queue stores (priority, count, cell)
+    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True, step_size: int = 1, workspace: Optional[SolverWorkspace] = None, events: Optional[DeltaStream] = None) -> Generator[int, None, dict]:
+        # Leased, not the thread's run() workspace: a suspended generator must not share it
+        ws = workspace.bind(grid) if workspace else acquire_workspace(grid)
+        gen = ws.reset()
+        stamp, g_score, parent = ws.stamp, ws.dist, ws.parent
+        
+        # Priority queue stores (priority, count, cell id)
         count = 0
-        frontier = [(0, count, start_cell)]
-        came_from = {start_cell: None}
-        g_score = {start_cell: 0}
+        frontier = ws.heap
+        frontier.append((0, count, start_cell.id))
+        stamp[start_cell.id] = gen
+        g_score[start_cell.id] = 0
+        parent[start_cell.id] = None
+        cells_by_id = grid.cells_by_id
         
         visited_count = 0
         max_frontier = 1
+        steps = 0
         
         if visualize:
-            start_cell.in_frontier = True
+            events = stream_for(grid, events)
+            events.emit(start_cell.id, EV_FRONTIER)
         
         while frontier:
             max_frontier = max(max_frontier, len(frontier))
-            _, _, current = heapq.heappop(frontier)
+            _, _, current_id = heapq.heappop(frontier)
+            current = cells_by_id[current_id]
             visited_count += 1
             
             if visualize:
-                current.in_frontier = False
-                current.visited_by_solver = True
+                events.emit(current.id, EV_VISITED)
             
             if current == end_cell:
                 break
                 
             for neighbor in grid.get_accessible_neighbors(current):
-                new_g_score = g_score[current] + 1
+                new_g_score = g_score[current_id] + 1
+                nid = neighbor.id
                 
-                if neighbor not in g_score or new_g_score < g_score[neighbor]:
-                    g_score[neighbor] = new_g_score
+                if stamp[nid] != gen or new_g_score < g_score[nid]:
+                    stamp[nid] = gen
+                    g_score[nid] = new_g_score
                     priority = new_g_score + self.heuristic(neighbor, end_cell)
                     count += 1
-                    heapq.heappush(frontier, (priority, count, neighbor))
-                    came_from[neighbor] = current
+                    heapq.heappush(frontier, (priority, count, nid))
+                    parent[nid] = current
                     if visualize:
-                        neighbor.in_frontier = True
+                        events.emit(nid, EV_FRONTIER)
             
-            if visualize:
+            steps += 1
+            if steps == step_size:
+                steps = 0
+                if visualize:
+                    events.flush()
                 yield len(frontier)
             
         # Reconstruct path
-        path = []
-        if end_cell in came_from:
-            temp = end_cell
-            while temp:
-                path.append(temp)
-                if visualize:
-                    temp.is_path = True
-                temp = came_from[temp]
-            path.reverse()
+        path = ws.build_path(end_cell)
+        if visualize:
+            for cell in path:
+                events.emit(cell.id, EV_PATH)
+            events.flush()
             
+        if workspace is None:
+            release_workspace(ws)
         return {
             "path": path,
             "visited_count": visited_count,
-            "peak_frontier": max_frontier
+            "peak_frontier": max_frontier,
+            "working_set": visited_count + len(frontier) # Heap pushes (popped or still queued)
+        }
+
+    def run(self, grid: Grid, start_cell: Cell, end_cell: Cell, workspace: Optional[SolverWorkspace] = None) -> dict:
+        # Same search as `solve`, as a plain loop with no visualization or yields
+        ws = workspace.bind(grid) if workspace else get_workspace(grid)
+        gen = ws.reset()
+        stamp, g_score, parent = ws.stamp, ws.dist, ws.parent
+        heappush = self.heappush
+        heappop = self.heappop
+        get_neighbors = grid.get_accessible_neighbors
+        cells_by_id = grid.cells_by_id
+        end_x, end_y = end_cell.x, end_cell.y
+        
+        count = 0
+        frontier = ws.heap
+        frontier.append((0, count, start_cell.id))
+        stamp[start_cell.id] = gen
+        g_score[start_cell.id] = 0
+        parent[start_cell.id] = None
+        
+        visited_count = 0
+        max_frontier = 1
+        
+        while frontier:
+            if len(frontier) > max_frontier:
+                max_frontier = len(frontier)
+            _, _, current_id = heappop(frontier)
+            current = cells_by_id[current_id]
+            visited_count += 1
+            
+            if current == end_cell:
+                break
+                
+            new_g_score = g_score[current_id] + 1
+            for neighbor in get_neighbors(current):
+                nid = neighbor.id
+                if stamp[nid] != gen or new_g_score < g_score[nid]:
+                    stamp[nid] = gen
+                    g_score[nid] = new_g_score
+                    priority = new_g_score + abs(neighbor.x - end_x) + abs(neighbor.y - end_y)
+                    count += 1
+                    heappush(frontier, (priority, count, nid))
+                    parent[nid] = current
+            
+        return {
+            "path": ws.build_path(end_cell),
+            "visited_count": visited_count,
+            "peak_frontier": max_frontier,
+            "working_set": visited_count + len(frontier) # Heap pushes (popped or still queued)
         }
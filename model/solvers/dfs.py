@@ -1,18 +1,29 @@
-from typing import Generator, List
+from typing import Generator, List, Optional
 from ..interfaces import ISolver
 from ..grid import Grid
 from ..cell import Cell
+from ..workspace import SolverWorkspace, get_workspace, acquire_workspace, release_workspace
+from ..events import DeltaStream, stream_for, EV_FRONTIER, EV_VISITED, EV_PATH
 
 class DFS(ISolver):
-    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True) -> Generator[int, None, dict]:
-        stack = [start_cell]
-        came_from = {start_cell: None}
+    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True, step_size: int = 1, workspace: Optional[SolverWorkspace] = None, events: Optional[DeltaStream] = None) -> Generator[int, None, dict]:
+        # Leased, not the thread's run() workspace: a suspended generator must not share it
+        ws = workspace.bind(grid) if workspace else acquire_workspace(grid)
+        gen = ws.reset()
+        stamp, parent = ws.stamp, ws.parent
+        stack = ws.stack
+        
+        stack.append(start_cell)
+        stamp[start_cell.id] = gen
+        parent[start_cell.id] = None
         
         visited_count = 0
         max_frontier = 1
+        steps = 0
         
         if visualize:
-            start_cell.in_frontier = True
+            events = stream_for(grid, events)
+            events.emit(start_cell.id, EV_FRONTIER)
         
         found = False
         while stack:
@@ -21,36 +32,79 @@ class DFS(ISolver):
             visited_count += 1
             
             if visualize:
-                current.in_frontier = False
-                current.visited_by_solver = True
+                events.emit(current.id, EV_VISITED)
             
             if current == end_cell:
                 found = True
                 break
                 
             for neighbor in grid.get_accessible_neighbors(current):
-                if neighbor not in came_from:
-                    came_from[neighbor] = current
+                if stamp[neighbor.id] != gen:
+                    stamp[neighbor.id] = gen
+                    parent[neighbor.id] = current
                     if visualize:
-                        neighbor.in_frontier = True
+                        events.emit(neighbor.id, EV_FRONTIER)
                     stack.append(neighbor)
             
-            if visualize:
+            steps += 1
+            if steps == step_size:
+                steps = 0
+                if visualize:
+                    events.flush()
                 yield len(stack)
             
         # Reconstruct path
-        path = []
-        if found:
-            temp = end_cell
-            while temp:
-                path.append(temp)
-                if visualize:
-                    temp.is_path = True
-                temp = came_from[temp]
-            path.reverse()
+        path = ws.build_path(end_cell) if found else []
+        if visualize:
+            for cell in path:
+                events.emit(cell.id, EV_PATH)
+            events.flush()
             
+        if workspace is None:
+            release_workspace(ws)
         return {
             "path": path,
             "visited_count": visited_count,
-            "peak_frontier": max_frontier
+            "peak_frontier": max_frontier,
+            "working_set": visited_count + len(stack) # Stack pushes, one labelled cell each
+        }
+
+    def run(self, grid: Grid, start_cell: Cell, end_cell: Cell, workspace: Optional[SolverWorkspace] = None) -> dict:
+        # Same search as `solve`, as a plain loop with no visualization or yields
+        ws = workspace.bind(grid) if workspace else get_workspace(grid)
+        gen = ws.reset()
+        stamp, parent = ws.stamp, ws.parent
+        stack = ws.stack
+        get_neighbors = grid.get_accessible_neighbors
+        
+        stack.append(start_cell)
+        stamp[start_cell.id] = gen
+        parent[start_cell.id] = None
+        
+        visited_count = 0
+        max_frontier = 1
+        
+        found = False
+        while stack:
+            if len(stack) > max_frontier:
+                max_frontier = len(stack)
+            current = stack.pop()
+            visited_count += 1
+            
+            if current == end_cell:
+                found = True
+                break
+                
+            for neighbor in get_neighbors(current):
+                nid = neighbor.id
+                if stamp[nid] != gen:
+                    stamp[nid] = gen
+                    parent[nid] = current
+                    stack.append(neighbor)
+            
+        return {
+            "path": ws.build_path(end_cell) if found else [],
+            "visited_count": visited_count,
+            "peak_frontier": max_frontier,
+            "working_set": visited_count + len(stack) # Stack pushes, one labelled cell each
         }
@@ -1,8 +1,10 @@
 import heapq
-from typing import Generator, List
+from typing import Generator, List, Optional
 from ..interfaces import ISolver
 from ..grid import Grid
 from ..cell import Cell
+from ..workspace import SolverWorkspace, get_workspace, acquire_workspace, release_workspace
+from ..events import DeltaStream, stream_for, EV_FRONTIER, EV_VISITED, EV_PATH
 
 class Dijkstra(ISolver):
     """
@@ -10,60 +12,120 @@ class Dijkstra(ISolver):
     In an unweighted grid, this behaves like BFS but uses a priority queue.
     Useful for comparison with A*.
     """
-    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True) -> Generator[int, None, dict]:
-        # Priority Queue: (distance, (x, y))
-        pq = [(0, (start_cell.x, start_cell.y))]
-        distances = {(start_cell.x, start_cell.y): 0}
-        came_from = {start_cell: None}
+    # Heap functions used by run(); model.opcount swaps in counting ones per instance
+    heappush = staticmethod(heapq.heappush)
+    heappop = staticmethod(heapq.heappop)
+
+    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True, step_size: int = 1, workspace: Optional[SolverWorkspace] = None, events: Optional[DeltaStream] = None) -> Generator[int, None, dict]:
+        # Leased, not the thread's run() workspace: a suspended generator must not share it
+        ws = workspace.bind(grid) if workspace else acquire_workspace(grid)
+        gen = ws.reset()
+        stamp, distances, parent = ws.stamp, ws.dist, ws.parent
+        cells_by_id = grid.cells_by_id
+        
+        # Priority Queue: (distance, cell id)
+        pq = ws.heap
+        pq.append((0, start_cell.id))
+        stamp[start_cell.id] = gen
+        distances[start_cell.id] = 0
+        parent[start_cell.id] = None
         
         visited_count = 0
         max_frontier = 1
+        steps = 0
         
         if visualize:
-            start_cell.in_frontier = True
+            events = stream_for(grid, events)
+            events.emit(start_cell.id, EV_FRONTIER)
         
         while pq:
             max_frontier = max(max_frontier, len(pq))
-            dist, (curr_x, curr_y) = heapq.heappop(pq)
-            current = grid.get_cell(curr_x, curr_y)
-            
-            if not current: continue
+            dist, current_id = heapq.heappop(pq)
+            current = cells_by_id[current_id]
             
             visited_count += 1
             if visualize:
-                current.in_frontier = False
-                current.visited_by_solver = True
+                events.emit(current.id, EV_VISITED)
             
             if current == end_cell:
                 break
                 
             for neighbor in grid.get_accessible_neighbors(current):
                 new_dist = dist + 1
-                neighbor_coords = (neighbor.x, neighbor.y)
+                nid = neighbor.id
                 
-                if neighbor_coords not in distances or new_dist < distances[neighbor_coords]:
-                    distances[neighbor_coords] = new_dist
-                    came_from[neighbor] = current
+                if stamp[nid] != gen or new_dist < distances[nid]:
+                    stamp[nid] = gen
+                    distances[nid] = new_dist
+                    parent[nid] = current
                     if visualize:
-                        neighbor.in_frontier = True
-                    heapq.heappush(pq, (new_dist, neighbor_coords))
+                        events.emit(nid, EV_FRONTIER)
+                    heapq.heappush(pq, (new_dist, nid))
             
-            if visualize:
+            steps += 1
+            if steps == step_size:
+                steps = 0
+                if visualize:
+                    events.flush()
                 yield len(pq)
             
         # Reconstruct path
-        path = []
-        if end_cell in came_from:
-            temp = end_cell
-            while temp:
-                path.append(temp)
-                if visualize:
-                    temp.is_path = True
-                temp = came_from[temp]
-            path.reverse()
+        path = ws.build_path(end_cell)
+        if visualize:
+            for cell in path:
+                events.emit(cell.id, EV_PATH)
+            events.flush()
         
+        if workspace is None:
+            release_workspace(ws)
         return {
             "path": path,
             "visited_count": visited_count,
-            "peak_frontier": max_frontier
+            "peak_frontier": max_frontier,
+            "working_set": visited_count + len(pq) # Heap pushes (popped or still queued)
+        }
+
+    def run(self, grid: Grid, start_cell: Cell, end_cell: Cell, workspace: Optional[SolverWorkspace] = None) -> dict:
+        # Same search as `solve`, as a plain loop with no visualization or yields
+        ws = workspace.bind(grid) if workspace else get_workspace(grid)
+        gen = ws.reset()
+        stamp, distances, parent = ws.stamp, ws.dist, ws.parent
+        heappush = self.heappush
+        heappop = self.heappop
+        get_neighbors = grid.get_accessible_neighbors
+        cells_by_id = grid.cells_by_id
+        
+        pq = ws.heap
+        pq.append((0, start_cell.id))
+        stamp[start_cell.id] = gen
+        distances[start_cell.id] = 0
+        parent[start_cell.id] = None
+        
+        visited_count = 0
+        max_frontier = 1
+        
+        while pq:
+            if len(pq) > max_frontier:
+                max_frontier = len(pq)
+            dist, current_id = heappop(pq)
+            current = cells_by_id[current_id]
+            
+            visited_count += 1
+            if current == end_cell:
+                break
+                
+            new_dist = dist + 1
+            for neighbor in get_neighbors(current):
+                nid = neighbor.id
+                if stamp[nid] != gen or new_dist < distances[nid]:
+                    stamp[nid] = gen
+                    distances[nid] = new_dist
+                    parent[nid] = current
+                    heappush(pq, (new_dist, nid))
+        
+        return {
+            "path": ws.build_path(end_cell),
+            "visited_count": visited_count,
+            "peak_frontier": max_frontier,
+            "working_set": visited_count + len(pq) # Heap pushes (popped or still queued)
         }
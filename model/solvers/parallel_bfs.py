@@ -0,0 +1,210 @@
+"""
+Level-synchronous BFS over the packed wall array (see Grid.wall_array).
+
+VectorizedBFS expands each level with NumPy in one process.
+ParallelBFS partitions the grid into column strips owned by worker processes.
+All workers write into one shared distance array; cells discovered across a
+strip boundary are handed to their owner through per-worker shared-memory
+outboxes at each level (two barriers per level).
+"""
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Generator, List, Optional, Tuple
+import numpy as np
+from ..interfaces import ISolver
+from ..grid import Grid, WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+from ..cell import Cell
+from ..events import DeltaStream, stream_for, EV_VISITED, EV_PATH
+
+def _expand(walls: np.ndarray, dist: np.ndarray, frontier: np.ndarray, rows: int) -> np.ndarray:
+    """Returns the unique, still unlabelled open neighbours of the frontier cell ids."""
+    w = walls[frontier]
+    cand = np.concatenate((
+        frontier[(w & WALL_LEFT) == 0] - rows,
+        frontier[(w & WALL_RIGHT) == 0] + rows,
+        frontier[(w & WALL_TOP) == 0] - 1,
+        frontier[(w & WALL_BOTTOM) == 0] + 1
+    ))
+    cand = cand[dist[cand] < 0]
+    return np.unique(cand)
+
+def bfs_distances(walls: np.ndarray, rows: int, start_id: int, end_id: int = -1) -> Tuple[np.ndarray, int]:
+    """
+    Single-process vectorized BFS on a flat wall array.
+    Stops after the level that labels end_id (or exhausts the maze).
+    Returns (dist, peak_frontier); unreached cells keep -1.
+    """
+    dist = np.full(walls.shape[0], -1, dtype=np.int32)
+    dist[start_id] = 0
+    frontier = np.array([start_id], dtype=np.int64)
+    peak = 1
+    level = 0
+    
+    while frontier.size and (end_id < 0 or dist[end_id] < 0):
+        frontier = _expand(walls, dist, frontier, rows)
+        level += 1
+        dist[frontier] = level
+        peak = max(peak, frontier.size)
+    return dist, peak
+
+def path_from_distances(dist: np.ndarray, walls: np.ndarray, rows: int, end_id: int) -> List[int]:
+    """Walks down the distance field from end_id to the start. Returns cell ids start -> end."""
+    if dist[end_id] < 0:
+        return []
+    
+    ids = [end_id]
+    current = end_id
+    while dist[current] > 0:
+        d = dist[current] - 1
+        w = walls[current]
+        for neighbor, bit in ((current - rows, WALL_LEFT), (current + rows, WALL_RIGHT), (current - 1, WALL_TOP), (current + 1, WALL_BOTTOM)):
+            if not w & bit and dist[neighbor] == d:
+                current = neighbor
+                break
+        ids.append(current)
+    ids.reverse()
+    return ids
+
+def _attach(name: str, shape, dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _strip_worker(wid, workers, names, cols, rows, start_id, end_id, barrier):
+    """Owns columns [x0, x1) and runs the level loop in lockstep with the other strips."""
+    n = cols * rows
+    shm_walls, walls = _attach(names["walls"], (n,), np.uint8)
+    shm_dist, dist = _attach(names["dist"], (n,), np.int32)
+    # outbox[w, 0] -> cells for the left neighbour, outbox[w, 1] -> right neighbour; slot 0 is the count
+    shm_out, outbox = _attach(names["outbox"], (workers, 2, rows + 1), np.int64)
+    # counts[w] = (next frontier size, 1 if w owns end_id and has labelled it)
+    shm_counts, counts = _attach(names["counts"], (workers, 2), np.int64)
+    
+    try:
+        lo = (cols * wid // workers) * rows
+        hi = (cols * (wid + 1) // workers) * rows
+        
+        frontier = np.array([start_id] if lo <= start_id < hi else [], dtype=np.int64)
+        level = 0
+        while True:
+            cand = _expand(walls, dist, frontier, rows) if frontier.size else frontier
+            mine = cand[(cand >= lo) & (cand < hi)]
+            dist[mine] = level + 1
+            
+            to_left = cand[cand < lo]
+            to_right = cand[cand >= hi]
+            outbox[wid, 0, 0] = to_left.size
+            outbox[wid, 0, 1:1 + to_left.size] = to_left
+            outbox[wid, 1, 0] = to_right.size
+            outbox[wid, 1, 1:1 + to_right.size] = to_right
+            barrier.wait()
+            
+            # Adopt cells the neighbouring strips discovered inside this strip
+            incoming = [mine]
+            if wid > 0:
+                k = outbox[wid - 1, 1, 0]
+                incoming.append(outbox[wid - 1, 1, 1:1 + k].copy())
+            if wid < workers - 1:
+                k = outbox[wid + 1, 0, 0]
+                incoming.append(outbox[wid + 1, 0, 1:1 + k].copy())
+            frontier = np.concatenate(incoming)
+            if len(incoming) > 1:
+                adopted = frontier[mine.size:]
+                adopted = adopted[dist[adopted] < 0]
+                dist[adopted] = level + 1
+                frontier = np.concatenate((mine, adopted))
+            # Only the owner reads dist[end_id]: other strips may still be writing labels
+            counts[wid, 0] = frontier.size
+            counts[wid, 1] = lo <= end_id < hi and dist[end_id] >= 0
+            level += 1
+            barrier.wait()
+            
+            if counts[:, 0].sum() == 0 or counts[:, 1].any():
+                break
+    finally:
+        del walls, dist, outbox, counts
+        for shm in (shm_walls, shm_dist, shm_out, shm_counts):
+            shm.close()
+
+def parallel_bfs_distances(walls: np.ndarray, cols: int, rows: int, start_id: int, end_id: int, workers: int = 4) -> np.ndarray:
+    """Runs the strip-partitioned BFS and returns a private copy of the distance array."""
+    n = cols * rows
+    workers = max(1, min(workers, cols))
+    blocks = {
+        "walls": walls.nbytes,
+        "dist": n * 4,
+        "outbox": workers * 2 * (rows + 1) * 8,
+        "counts": workers * 2 * 8
+    }
+    shms = {key: shared_memory.SharedMemory(create=True, size=size) for key, size in blocks.items()}
+    try:
+        np.ndarray((n,), dtype=np.uint8, buffer=shms["walls"].buf)[:] = walls
+        dist = np.ndarray((n,), dtype=np.int32, buffer=shms["dist"].buf)
+        dist[:] = -1
+        dist[start_id] = 0
+        
+        names = {key: shm.name for key, shm in shms.items()}
+        barrier = multiprocessing.Barrier(workers)
+        procs = [
+            multiprocessing.Process(target=_strip_worker, args=(wid, workers, names, cols, rows, start_id, end_id, barrier))
+            for wid in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        if any(p.exitcode != 0 for p in procs):
+            raise RuntimeError("Parallel BFS worker failed")
+        
+        result = dist.copy()
+        del dist
+        return result
+    finally:
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+
+class VectorizedBFS(ISolver):
+    """
+    Level-synchronous BFS with NumPy on the packed wall array (single process).
+    visited_count is the number of labelled cells; peak_frontier the widest level.
+    """
+    def _result(self, grid: Grid, walls: np.ndarray, dist: np.ndarray, end_cell: Cell, peak: int) -> dict:
+        ids = path_from_distances(dist, walls, grid.rows, end_cell.id)
+        labelled = int(np.count_nonzero(dist >= 0))
+        return {
+            "path": [grid.cells_by_id[i] for i in ids],
+            "visited_count": labelled,
+            "peak_frontier": peak,
+            "working_set": labelled
+        }
+
+    def run(self, grid: Grid, start_cell: Cell, end_cell: Cell) -> dict:
+        walls = grid.wall_array().ravel()
+        dist, peak = bfs_distances(walls, grid.rows, start_cell.id, end_cell.id)
+        return self._result(grid, walls, dist, end_cell, peak)
+
+    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True, step_size: int = 1, events: Optional[DeltaStream] = None) -> Generator[int, None, dict]:
+        # Runs in one step; the level loop has no per-cell visualization
+        result = self.run(grid, start_cell, end_cell)
+        if visualize:
+            events = stream_for(grid, events)
+            for cell in result["path"]:
+                events.emit(cell.id, EV_VISITED)
+                events.emit(cell.id, EV_PATH)
+            events.flush()
+        yield 0
+        return result
+
+class ParallelBFS(VectorizedBFS):
+    """Strip-partitioned BFS across `workers` processes sharing one distance array."""
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+
+    def run(self, grid: Grid, start_cell: Cell, end_cell: Cell) -> dict:
+        walls = grid.wall_array().ravel()
+        dist = parallel_bfs_distances(walls, grid.cols, grid.rows, start_cell.id, end_cell.id, self.workers)
+        # Level widths are not collected across strips; report the widest level from the distances
+        labelled = dist[dist >= 0]
+        peak = int(np.bincount(labelled).max()) if labelled.size else 0
+        return self._result(grid, walls, dist, end_cell, peak)
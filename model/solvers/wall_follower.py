@@ -1,7 +1,8 @@
-from typing import Generator, List
+from typing import Generator, List, Optional
 from ..interfaces import ISolver
 from ..grid import Grid
 from ..cell import Cell
+from ..events import DeltaStream, stream_for, EV_VISITED, EV_PATH, EV_UNPATH
 
 class WallFollower(ISolver):
     """
@@ -9,7 +10,7 @@ class WallFollower(ISolver):
     This is a local navigation algorithm that doesn't maintain a global frontier.
     Note: Can fail in mazes with 'islands' if the goal is inside one.
     """
-    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True) -> Generator[int, None, dict]:
+    def solve(self, grid: Grid, start_cell: Cell, end_cell: Cell, visualize: bool = True, step_size: int = 1, events: Optional[DeltaStream] = None) -> Generator[int, None, dict]:
         # Directions: 0: Top, 1: Right, 2: Bottom, 3: Left
         direction = 1 # Initial direction: Right
         current = start_cell
@@ -19,10 +20,12 @@ class WallFollower(ISolver):
         
         visited_count = 0
         max_frontier = 1
+        steps = 0
         
         if visualize:
-            current.visited_by_solver = True
-            current.is_path = True
+            events = stream_for(grid, events)
+            events.emit(current.id, EV_VISITED)
+            events.emit(current.id, EV_PATH)
         
         # Directions mapping: (dx, dy)
         moves = [(0, -1), (1, 0), (0, 1), (-1, 0)]
@@ -45,18 +48,18 @@ class WallFollower(ISolver):
                         visited_count += 1
                         
                         if visualize:
-                            current.visited_by_solver = True
+                            events.emit(current.id, EV_VISITED)
                         
                         # Loop detection for the solution path
                         if current in path_stack:
                             while path_stack[-1] != current:
                                 popped = path_stack.pop()
                                 if visualize:
-                                    popped.is_path = False
+                                    events.emit(popped.id, EV_UNPATH)
                         else:
                             path_stack.append(current)
                             if visualize:
-                                current.is_path = True
+                                events.emit(current.id, EV_PATH)
                         
                         moved = True
                         break
@@ -64,11 +67,68 @@ class WallFollower(ISolver):
             if not moved:
                 break
                 
-            if visualize:
+            steps += 1
+            if steps == step_size:
+                steps = 0
+                if visualize:
+                    events.flush()
                 yield len(path_stack)
+        
+        if visualize:
+            events.flush()
+            
+        return {
+            "path": path_stack,
+            "visited_count": visited_count,
+            "peak_frontier": max_frontier,
+            "working_set": max_frontier # The path stack is its only state
+        }
+
+    def run(self, grid: Grid, start_cell: Cell, end_cell: Cell) -> dict:
+        # Same walk as `solve`, as a plain loop with no visualization or yields
+        direction = 1
+        current = start_cell
+        path_stack = [current]
+        
+        visited_count = 0
+        max_frontier = 1
+        
+        moves = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        wall_names = ['top', 'right', 'bottom', 'left']
+        get_cell = grid.get_cell
+
+        while current != end_cell:
+            if len(path_stack) > max_frontier:
+                max_frontier = len(path_stack)
+            moved = False
+            for rotation in (1, 0, -1, 2):
+                new_dir = (direction + rotation) % 4
+                
+                if not current.walls[wall_names[new_dir]]:
+                    dx, dy = moves[new_dir]
+                    next_cell = get_cell(current.x + dx, current.y + dy)
+                    
+                    if next_cell:
+                        current = next_cell
+                        direction = new_dir
+                        visited_count += 1
+                        
+                        # Loop detection for the solution path
+                        if current in path_stack:
+                            while path_stack[-1] != current:
+                                path_stack.pop()
+                        else:
+                            path_stack.append(current)
+                        
+                        moved = True
+                        break
+            
+            if not moved:
+                break
             
         return {
             "path": path_stack,
             "visited_count": visited_count,
-            "peak_frontier": max_frontier
+            "peak_frontier": max_frontier,
+            "working_set": max_frontier # The path stack is its only state
         }
@@ -0,0 +1,154 @@
+"""
+Live progress events from benchmark worker processes.
+
+Workers publish tuples on a multiprocessing queue handed to them once, by init_telemetry in
+the pool initializer:
+    (kind, worker pid, label, time.time(), worker RSS in KB)
+with kind "task_start", "task_step" (same task, new label, e.g. the solver now running) or
+"task_end". TelemetryState folds them into one lane per worker plus throughput and ETA; the
+in-app benchmark view and ConsoleDashboard both draw from it. Publishing without a
+queue is a no-op.
+"""
+import os
+import sys
+import time
+from collections import deque
+from queue import Empty
+from typing import Any, List, Optional
+import psutil
+
+EVENT_KINDS = ("task_start", "task_step", "task_end")
+
+_queue = None
+_process = None
+
+def init_telemetry(queue: Any):
+    """Pool initializer part: where this worker publishes to."""
+    global _queue, _process
+    _queue = queue
+    _process = psutil.Process(os.getpid())
+
+def publish(kind: str, label: str = ""):
+    if _queue is not None:
+        _queue.put((kind, _process.pid, label, time.time(), _process.memory_info().rss / 1024))
+
+def format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
+
+class TelemetryState:
+    """Per-worker lanes and overall progress of `total` tasks, built from published events."""
+    def __init__(self, total: int = 0, window: int = 20):
+        self.total = total
+        self.completed = 0
+        self.started = time.time()
+        self.lanes = {} # pid -> {"label", "since", "done", "rss_kb", "recent": deque of (start, end)}
+        self._ends = deque(maxlen=window) # Completion times of the latest tasks
+
+    def apply(self, event: tuple):
+        kind, worker, label, t, rss_kb = event
+        lane = self.lanes.get(worker)
+        if lane is None:
+            lane = self.lanes[worker] = {"label": None, "since": None, "done": 0, "rss_kb": 0.0, "recent": deque(maxlen=32)}
+        lane["rss_kb"] = rss_kb
+        if kind == "task_start":
+            lane["label"], lane["since"] = label, t
+        elif kind == "task_step":
+            lane["label"] = label
+        elif kind == "task_end":
+            if lane["since"] is not None:
+                lane["recent"].append((lane["since"], t))
+            lane["label"] = lane["since"] = None
+            lane["done"] += 1
+            self.completed += 1
+            self._ends.append(t)
+
+    def drain(self, queue: Any) -> int:
+        """Applies every event waiting on `queue` without blocking; returns how many."""
+        count = 0
+        while True:
+            try:
+                self.apply(queue.get_nowait())
+            except Empty:
+                return count
+            count += 1
+
+    def catch_up(self, queue: Any, timeout: float = 1.0):
+        """Applies events until every task has ended (their events can trail the results) or `timeout` passes."""
+        deadline = time.time() + timeout
+        while self.completed < self.total and time.time() < deadline:
+            try:
+                self.apply(queue.get(timeout=max(0.0, deadline - time.time())))
+            except Empty:
+                return
+        self.drain(queue)
+
+    @property
+    def throughput(self) -> float:
+        """Tasks per second over the latest completions (since the start until there are two)."""
+        if len(self._ends) >= 2 and self._ends[-1] > self._ends[0]:
+            return (len(self._ends) - 1) / (self._ends[-1] - self._ends[0])
+        elapsed = time.time() - self.started
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        rate = self.throughput
+        return (self.total - self.completed) / rate if rate > 0 else None
+
+    @property
+    def rss_kb(self) -> float:
+        return sum(lane["rss_kb"] for lane in self.lanes.values())
+
+class ConsoleDashboard:
+    """
+    Redraws a block of status lines in place (ANSI cursor movement) on a terminal. When output
+    is redirected, prints the summary line every `log_every` finished tasks instead.
+    """
+    def __init__(self, state: TelemetryState, stream: Any = sys.stdout, interval: float = 0.5, log_every: int = 10):
+        self.state = state
+        self.stream = stream
+        self.interval = interval
+        self.log_every = log_every
+        self.tty = stream.isatty()
+        self._lines = 0
+        self._last_draw = 0.0
+        self._last_logged = 0
+
+    def summary(self) -> str:
+        st = self.state
+        pct = st.completed / st.total * 100 if st.total else 0.0
+        return (f"{st.completed}/{st.total} tasks ({pct:.1f}%)  {st.throughput:.2f} tasks/s  "
+                f"ETA {format_seconds(st.eta)}  elapsed {format_seconds(time.time() - st.started)}  "
+                f"RSS {st.rss_kb / 1024:.0f} MB")
+
+    def render(self) -> List[str]:
+        now = time.time()
+        lines = [self.summary()]
+        for i, (pid, lane) in enumerate(sorted(self.state.lanes.items())):
+            running = f"{lane['label']} ({now - lane['since']:.1f}s)" if lane["since"] is not None else "idle"
+            lines.append(f"  worker {i + 1} [{pid}]  done {lane['done']:>4}  RSS {lane['rss_kb'] / 1024:>6.1f} MB  {running}")
+        return lines
+
+    def update(self, force: bool = False):
+        if not self.tty:
+            if force or self.state.completed - self._last_logged >= self.log_every:
+                self._last_logged = self.state.completed
+                print(self.summary(), file=self.stream, flush=True)
+            return
+        now = time.time()
+        if not force and now - self._last_draw < self.interval:
+            return
+        self._last_draw = now
+        lines = self.render()
+        out = f"\x1b[{self._lines}F" if self._lines else ""
+        out += "".join(f"{line}\x1b[K\n" for line in lines)
+        if len(lines) < self._lines:
+            out += "\x1b[K\n" * (self._lines - len(lines)) # Clear leftover lines of a longer block
+        self._lines = max(len(lines), self._lines)
+        self.stream.write(out)
+        self.stream.flush()
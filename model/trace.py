@@ -0,0 +1,206 @@
+"""
+Binary traces of generator/solver runs: the per-step delta stream plus periodic keyframes,
+so a run can be recorded once (live or headless) and replayed or scrubbed later without
+re-running the algorithm.
+
+File layout (little-endian):
+    MAGIC, uint32 meta length, JSON meta (kind, name, rows, cols, start, end, chunk_size, delta_bytes)
+    segments: SEGMENT header, keyframe blob, delta blob
+        keyframe blob: zlib(flags bytes + wall bytes), the full cell state at the segment's first step
+        delta blob:    zlib(uint32 delta count per step + packed deltas as uint32/uint64)
+    index: (first_step, offset) uint64 pairs, one per segment
+    FOOTER (index offset, segment count, total steps), END_MAGIC
+
+A new segment starts once the open one holds `keyframe_deltas` deltas, so seeking costs a
+binary search over the index, one keyframe load and at most `keyframe_deltas` applied deltas,
+regardless of the trace length.
+"""
+import json
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+from typing import Any, Optional
+import numpy as np
+from model.grid import Grid
+from model.events import CellStateArray, DeltaStream
+
+MAGIC = b"MAZETRC1"
+END_MAGIC = b"MAZETRCE"
+SEGMENT = struct.Struct("<QIIiII") # first_step, steps, deltas, current_id, keyframe bytes, delta bytes
+FOOTER = struct.Struct("<QQQ")     # index offset, segments, total steps
+
+def default_keyframe_deltas(cells: int) -> int:
+    """Keyframe spacing: a keyframe costs about as much to store as `cells / 4` deltas."""
+    return max(4096, min(65536, cells // 4))
+
+class TraceRecorder:
+    """
+    Delta stream subscriber that writes the run to a trace file. Subscribe it to the run's
+    stream before the first step and close() it when the run ends (a closed partial run is a
+    valid, shorter trace).
+    """
+    def __init__(self, path: str, grid: Grid, kind: str, name: str, start_id: int, end_id: int,
+                 chunk_size: int = 1, keyframe_deltas: Optional[int] = None):
+        self.path = path
+        cells = grid.rows * grid.cols
+        self.keyframe_deltas = keyframe_deltas or default_keyframe_deltas(cells)
+        self.delta_dtype = np.uint32 if cells < (1 << 28) else np.uint64
+        self.states = CellStateArray(grid) # Mirror of the recorded state, for keyframes
+        self.total_steps = 0
+        self.index = []
+
+        self.file = open(path, "wb")
+        meta = json.dumps({
+            "kind": kind, "name": name, "rows": grid.rows, "cols": grid.cols,
+            "start": start_id, "end": end_id, "chunk_size": chunk_size,
+            "delta_bytes": np.dtype(self.delta_dtype).itemsize,
+        }).encode()
+        self.file.write(MAGIC + struct.pack("<I", len(meta)) + meta)
+        self._begin_segment()
+
+    def _begin_segment(self):
+        states = self.states
+        self._keyframe = (bytes(states.flags) + bytes(states.walls), states.current_id)
+        self._first_step = self.total_steps
+        self._counts = array('I')
+        self._deltas = array('Q')
+
+    def _write_segment(self):
+        keyframe = zlib.compress(self._keyframe[0])
+        packed = np.frombuffer(self._deltas, dtype=np.uint64).astype(self.delta_dtype)
+        block = zlib.compress(self._counts.tobytes() + packed.tobytes())
+
+        self.index.append((self._first_step, self.file.tell()))
+        self.file.write(SEGMENT.pack(self._first_step, len(self._counts), len(self._deltas),
+                                     self._keyframe[1], len(keyframe), len(block)))
+        self.file.write(keyframe)
+        self.file.write(block)
+
+    def __call__(self, step: int, deltas: array):
+        self._counts.append(len(deltas))
+        self._deltas.extend(deltas)
+        self.states(step, deltas)
+        self.total_steps += 1
+        if len(self._deltas) >= self.keyframe_deltas:
+            self._write_segment()
+            self._begin_segment()
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self._counts or not self.index:
+            self._write_segment()
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.index, dtype=np.uint64).tobytes())
+        self.file.write(FOOTER.pack(index_offset, len(self.index), self.total_steps))
+        self.file.write(END_MAGIC)
+        self.file.close()
+
+class TraceState(CellStateArray):
+    """CellStateArray driven by a TracePlayer: the trace, not a Grid, is the source of truth."""
+    def __init__(self, grid: Grid):
+        super().__init__(grid)
+        self.wall_version = 0
+
+    def sync(self):
+        pass
+
+    def sync_walls(self):
+        pass
+
+class TracePlayer:
+    """
+    Replays a trace file. `grid` is a fresh Grid of the recorded size (for the renderer);
+    `state` holds the cell state after `position` steps and is what gets drawn.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a maze trace")
+        meta_len, = struct.unpack("<I", self.file.read(4))
+        self.meta = json.loads(self.file.read(meta_len))
+        self.kind = self.meta["kind"]
+        self.name = self.meta["name"]
+        self.rows = self.meta["rows"]
+        self.cols = self.meta["cols"]
+        self.delta_dtype = np.uint32 if self.meta["delta_bytes"] == 4 else np.uint64
+
+        self.file.seek(-(FOOTER.size + len(END_MAGIC)), 2)
+        footer = self.file.read(FOOTER.size)
+        if self.file.read(len(END_MAGIC)) != END_MAGIC:
+            raise ValueError(f"{path} is incomplete (recording was not closed)")
+        index_offset, segments, self.total_steps = FOOTER.unpack(footer)
+        self.file.seek(index_offset)
+        index = np.frombuffer(self.file.read(segments * 16), dtype=np.uint64).reshape(segments, 2)
+        self.segment_steps = index[:, 0].tolist()
+        self.segment_offsets = index[:, 1].tolist()
+
+        self.grid = Grid(self.rows, self.cols)
+        self.grid.cells_by_id[self.meta["start"]].is_entry = True
+        self.grid.cells_by_id[self.meta["end"]].is_exit = True
+        self.state = TraceState(self.grid)
+        self.position = 0
+        self._segment = -1
+        self._load_segment(0)
+
+    @property
+    def is_solver(self) -> bool:
+        return self.kind == "solver"
+
+    def _load_segment(self, i: int):
+        """Restores the keyframe of segment i and makes its deltas current."""
+        self.file.seek(self.segment_offsets[i])
+        first_step, steps, _, current_id, keyframe_len, block_len = SEGMENT.unpack(self.file.read(SEGMENT.size))
+        keyframe = zlib.decompress(self.file.read(keyframe_len))
+        block = zlib.decompress(self.file.read(block_len))
+
+        n = self.rows * self.cols
+        state = self.state
+        state.flags[:] = np.frombuffer(keyframe, dtype=np.uint8, count=n)
+        state.walls[:] = np.frombuffer(keyframe, dtype=np.uint8, offset=n)
+        state.current_id = current_id
+        state.wall_version += 1
+        state.recount()
+
+        counts = np.frombuffer(block, dtype=np.uint32, count=steps)
+        self._offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64))).tolist()
+        self._deltas = np.frombuffer(block, dtype=self.delta_dtype, offset=steps * 4)
+        self._segment = i
+        self._first_step = first_step
+        self.position = first_step
+
+    def seek(self, step: int) -> int:
+        """Moves to the state after `step` steps (clamped to the trace) and returns the new position."""
+        step = max(0, min(int(step), self.total_steps))
+        i = bisect_right(self.segment_steps, step) - 1
+        if i != self._segment or step < self.position:
+            self._load_segment(i)
+        if step > self.position:
+            a = self._offsets[self.position - self._first_step]
+            b = self._offsets[step - self._first_step]
+            self.state(self.position, self._deltas[a:b].tolist())
+            self.position = step
+        return self.position
+
+    def close(self):
+        self.file.close()
+
+def record_run(path: str, kind: str, algo: Any, grid: Grid, start_cell: Any, end_cell: Any,
+               chunk_size: int = 1, keyframe_deltas: Optional[int] = None) -> TraceRecorder:
+    """Runs `algo` (a generator or solver instance) to completion headless, recording it to `path`."""
+    name = algo.__class__.__name__
+    recorder = TraceRecorder(path, grid, kind, name, start_cell.id, end_cell.id, chunk_size, keyframe_deltas)
+    events = DeltaStream()
+    events.subscribe(recorder)
+    if kind == "solver":
+        run = algo.solve(grid, start_cell, end_cell, step_size=chunk_size, events=events)
+    else:
+        run = algo.generate(grid, step_size=chunk_size, events=events)
+    try:
+        for _ in run:
+            pass
+    finally:
+        recorder.close()
+    return recorder
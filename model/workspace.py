@@ -0,0 +1,119 @@
+import weakref
+import threading
+from collections import deque
+from typing import Any, List, Optional
+
+class SolverWorkspace:
+    """
+    Preallocated search state shared by the graph-search solvers.
+
+    Arrays are indexed by cell id (see Grid) and sized to the grid once.
+    An entry is only valid while stamp[id] == generation, so reset() is O(1)
+    instead of clearing every array.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.generation = 0
+        self.stamp = [0] * size      # Generation in which the cell was labelled (visited/discovered)
+        self.dist = [0] * size       # g-score / distance
+        self.parent = [None] * size  # Predecessor Cell (None for the start cell)
+        
+        # Reusable containers; emptied on reset
+        self.queue = deque()
+        self.stack = []
+        self.heap = []
+        self._owner = None # Weak reference to the grid whose Cells the parent labels hold
+
+    @classmethod
+    def for_grid(cls, grid: Any) -> "SolverWorkspace":
+        return cls(grid.rows * grid.cols)
+
+    def bind(self, grid: Any) -> "SolverWorkspace":
+        """
+        Marks the workspace as used on `grid` and returns it. Parent labels hold that grid's
+        Cells, so they are dropped when the workspace moves to another grid or the grid is
+        garbage collected; a pooled workspace then doesn't keep a replaced maze alive.
+        Raises ValueError if the workspace is too small for the grid.
+        """
+        if self.size < grid.rows * grid.cols:
+            raise ValueError(f"Workspace for {self.size} cells is too small for a {grid.cols}x{grid.rows} grid")
+        owner = self._owner
+        if owner is not None and owner() is grid:
+            return self
+        if owner is not None:
+            self.drop_labels()
+        def on_collect(ref, ws=weakref.ref(self)):
+            ws = ws()
+            if ws is not None and ws._owner is ref:
+                ws.drop_labels()
+        self._owner = weakref.ref(grid, on_collect)
+        return self
+
+    def drop_labels(self):
+        """Clears the parent labels in place and any leftover frontier (stamps stay, so generations remain valid)."""
+        self.parent[:] = [None] * self.size
+        self.queue.clear()
+        self.stack.clear()
+        self.heap.clear()
+        self._owner = None
+
+    def reset(self) -> int:
+        """Invalidates all labels and returns the new generation."""
+        self.generation += 1
+        # Leftovers only exist when the previous search stopped early
+        if self.queue: self.queue.clear()
+        if self.stack: self.stack.clear()
+        if self.heap: self.heap.clear()
+        return self.generation
+
+    def is_labelled(self, cell: Any) -> bool:
+        return self.stamp[cell.id] == self.generation
+
+    def build_path(self, end_cell: Any) -> List[Any]:
+        """Walks predecessors back from end_cell. Empty if end_cell was never reached."""
+        path = []
+        if self.stamp[end_cell.id] == self.generation:
+            parent = self.parent
+            temp = end_cell
+            while temp:
+                path.append(temp)
+                temp = parent[temp.id]
+            path.reverse()
+        return path
+
+# Per thread (and therefore per process): the workspace run() uses, grown to the largest grid
+# seen, and the free workspaces solve() leases (a suspended generator must not share one)
+_pool = threading.local()
+MAX_FREE_WORKSPACES = 2
+
+def get_workspace(grid: Any) -> SolverWorkspace:
+    """Returns this thread's pooled workspace, reallocating only if the grid is larger."""
+    size = grid.rows * grid.cols
+    ws: Optional[SolverWorkspace] = getattr(_pool, "workspace", None)
+    if ws is None or ws.size < size:
+        ws = SolverWorkspace(size)
+        _pool.workspace = ws
+    ws.bind(grid)
+    return ws
+
+def acquire_workspace(grid: Any) -> SolverWorkspace:
+    """
+    A workspace for one solve() generator, taken from this thread's free list (or allocated).
+    Hand it back with release_workspace when the search ends; one from an abandoned generator
+    is simply garbage collected with it.
+    """
+    size = grid.rows * grid.cols
+    free: List[SolverWorkspace] = _pool.__dict__.setdefault("free", [])
+    for i, ws in enumerate(free):
+        if ws.size >= size:
+            del free[i]
+            break
+    else:
+        ws = SolverWorkspace(size)
+    ws.bind(grid)
+    return ws
+
+def release_workspace(ws: SolverWorkspace):
+    free: List[SolverWorkspace] = _pool.__dict__.setdefault("free", [])
+    if len(free) < MAX_FREE_WORKSPACES:
+        free.append(ws)
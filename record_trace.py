@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import random
+import argparse
+from model.grid import Grid
+from model.registry import GENERATORS, SOLVERS
+from model.trace import record_run
+
+# Increased recursion limit for deep mazes
+sys.setrecursionlimit(10**7)
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a generator or solver run headless to a trace file for later replay (python main.py <file>).")
+    parser.add_argument("--generator", choices=list(GENERATORS), default="RecursiveBacktracker")
+    parser.add_argument("--solver", choices=list(SOLVERS),
+                        help="Record this solver on the generated maze instead of the generation itself")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--cols", type=int, default=200)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--chunk-size", type=int, default=1, help="Algorithm steps per recorded step")
+    parser.add_argument("--keyframe-deltas", type=int,
+                        help="Deltas between keyframes (default: a quarter of the cell count, 4096-65536)")
+    parser.add_argument("--out", help="Trace file (default: traces/<algorithm>_<cols>x<rows>.trace)")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    grid = Grid(args.rows, args.cols)
+    start_cell = grid.get_cell(0, 0)
+    end_cell = grid.get_cell(args.cols - 1, args.rows - 1)
+    start_cell.is_entry = True
+    end_cell.is_exit = True
+
+    generator = GENERATORS[args.generator]()
+    if args.solver:
+        generator.run(grid)
+        kind, algo = "solver", SOLVERS[args.solver]()
+    else:
+        kind, algo = "generator", generator
+
+    path = args.out
+    if not path:
+        os.makedirs("traces", exist_ok=True)
+        path = os.path.join("traces", f"{algo.__class__.__name__}_{args.cols}x{args.rows}.trace")
+
+    print(f"Recording {algo.__class__.__name__} on {args.cols}x{args.rows} to {path}...")
+    start_time = time.perf_counter()
+    recorder = record_run(path, kind, algo, grid, start_cell, end_cell, args.chunk_size, args.keyframe_deltas)
+    duration = time.perf_counter() - start_time
+
+    size_kb = os.path.getsize(path) / 1024
+    print(f"{recorder.total_steps} steps, {len(recorder.index)} keyframes, {size_kb:.1f} KB in {duration:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import csv
+from analyze_results import load_csv
+
+def test_load_csv_fills_missing_text_columns(tmp_path):
+    """Files from before the generator and status columns: the defaults must not be cut to the array's width."""
+    path = tmp_path / "results.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["size", "iteration", "algorithm", "time_ms", "path_len", "visited_count"])
+        writer.writeheader()
+        writer.writerow({"size": 10, "iteration": 0, "algorithm": "BFS", "time_ms": 1.5, "path_len": 19, "visited_count": 60})
+        writer.writerow({"size": 20, "iteration": 1, "algorithm": "AStar", "time_ms": 2.5, "path_len": 39, "visited_count": 200})
+
+    cols = load_csv(path)
+    assert list(cols["generator"]) == ["RecursiveBacktracker"] * 2
+    assert list(cols["status"]) == ["ok"] * 2
+    assert (cols["status"] == "ok").sum() == 2
+    assert list(cols["seed"]) == [0, 1]
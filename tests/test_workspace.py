@@ -0,0 +1,93 @@
+import random
+import threading
+import pytest
+from model.grid import Grid
+from model.execution import execute_generator
+from model.generators.recursive_backtracker import RecursiveBacktracker
+from model.generators.prims import PrimsAlgorithm
+from model.solvers.bfs import BFS
+from model.solvers.dfs import DFS
+from model.solvers.astar import AStar
+from model.solvers.dijkstra import Dijkstra
+from model.workspace import SolverWorkspace, get_workspace, acquire_workspace, release_workspace
+
+SOLVERS = [BFS, DFS, AStar, Dijkstra]
+
+def make_maze(rows, cols, generator, seed):
+    random.seed(seed)
+    grid = Grid(rows, cols)
+    execute_generator(generator, grid)
+    return grid
+
+@pytest.fixture(scope="module")
+def mazes():
+    """Two non-square mazes of different sizes; the second end cell is mid-maze, so searches stop with a frontier left over."""
+    small = make_maze(12, 17, RecursiveBacktracker(), 1)
+    large = make_maze(30, 23, PrimsAlgorithm(), 2)
+    return [(small, small.get_cell(0, 0), small.get_cell(16, 11)),
+            (large, large.get_cell(0, 0), large.get_cell(11, 15))]
+
+def summary(result):
+    return [cell.id for cell in result["path"]], result["visited_count"]
+
+def run_solve(solver, grid, start, end, **kwargs):
+    gen = solver.solve(grid, start, end, visualize=False, step_size=7, **kwargs)
+    try:
+        while True:
+            next(gen)
+    except StopIteration as e:
+        return e.value
+
+@pytest.mark.parametrize("solver_cls", SOLVERS, ids=lambda cls: cls.__name__)
+def test_run_and_solve_agree_with_pooled_and_explicit_workspaces(solver_cls, mazes):
+    """Alternates the two mazes so the pooled and the explicit workspace are rebound (and reused while larger) in between."""
+    solver = solver_cls()
+    explicit = SolverWorkspace(max(grid.rows * grid.cols for grid, _, _ in mazes))
+    for _ in range(2):
+        for grid, start, end in mazes:
+            expected = summary(solver.run(grid, start, end, workspace=SolverWorkspace.for_grid(grid)))
+            assert expected[0][0] == start.id and expected[0][-1] == end.id
+            assert summary(solver.run(grid, start, end)) == expected
+            assert summary(solver.run(grid, start, end, workspace=explicit)) == expected
+            assert summary(run_solve(solver, grid, start, end)) == expected
+            assert summary(run_solve(solver, grid, start, end, workspace=explicit)) == expected
+
+def test_too_small_workspace_is_rejected(mazes):
+    (small, _, _), (large, start, end) = mazes
+    with pytest.raises(ValueError):
+        BFS().run(large, start, end, workspace=SolverWorkspace.for_grid(small))
+    with pytest.raises(ValueError):
+        next(BFS().solve(large, start, end, visualize=False, workspace=SolverWorkspace.for_grid(small)))
+
+def test_reset_invalidates_labels_without_clearing():
+    ws = SolverWorkspace(4)
+    gen = ws.reset()
+    ws.stamp[2] = gen
+    ws.queue.append("leftover")
+    assert ws.reset() == gen + 1
+    assert ws.stamp[2] == gen and not ws.queue
+
+def test_rebinding_drops_labels(mazes):
+    (small, start, end), (large, _, _) = mazes
+    ws = SolverWorkspace.for_grid(large)
+    BFS().run(small, start, end, workspace=ws)
+    assert any(p is not None for p in ws.parent)
+    ws.bind(small)
+    assert any(p is not None for p in ws.parent) # Same grid: labels kept
+    ws.bind(large)
+    assert all(p is None for p in ws.parent)
+
+def test_pool_reuses_workspaces(mazes):
+    """In a new thread, since the pool is per thread and earlier tests filled this one's."""
+    (small, _, _), (large, _, _) = mazes
+    def check():
+        pooled = get_workspace(large)
+        leased = acquire_workspace(small)
+        release_workspace(leased)
+        results.extend([get_workspace(small) is pooled, # Large enough already: no reallocation
+                        leased is not pooled, acquire_workspace(small) is leased])
+    results = []
+    thread = threading.Thread(target=check)
+    thread.start()
+    thread.join()
+    assert results == [True, True, True]
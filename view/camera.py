@@ -0,0 +1,90 @@
+import math
+from typing import Tuple
+import pygame
+from model.grid import Grid
+
+class Camera:
+    """
+    Viewport over the maze: which cells are on screen and how large they are drawn.
+    Zoom has two regimes: `cell_size` pixels per cell, or, below one pixel per cell,
+    `block` cells per pixel (the downsampled overview; always a power of two).
+    Until the user zooms or pans, the camera keeps fitting the whole grid into the area.
+    """
+    MAX_CELL_SIZE = 64
+    ZOOM_FACTOR = 1.25
+    PAN_FRACTION = 0.1 # Share of the view moved per pan key press
+
+    def __init__(self):
+        self.cell_size = 20
+        self.block = 1
+        self.center_x = 0.0 # View center in cell coordinates
+        self.center_y = 0.0
+        self.fitted = True
+
+    @property
+    def pixels_per_cell(self) -> float:
+        return self.cell_size / self.block
+
+    def fit(self, grid: Grid, area: pygame.Rect):
+        """Largest zoom that shows the whole grid, centered."""
+        size = min(area.w // grid.cols, area.h // grid.rows)
+        if size >= 1:
+            self.cell_size, self.block = size, 1
+        else:
+            self.cell_size = 1
+            self.block = 2 ** math.ceil(math.log2(max(grid.cols / area.w, grid.rows / area.h)))
+        self.center_x = grid.cols / 2
+        self.center_y = grid.rows / 2
+        self.fitted = True
+
+    def zoom(self, steps: int, anchor: Tuple[int, int], area: pygame.Rect):
+        """Zooms in (steps > 0) or out, keeping the cell under `anchor` (screen pos) in place."""
+        ppc = self.pixels_per_cell
+        world_x = self.center_x + (anchor[0] - area.centerx) / ppc
+        world_y = self.center_y + (anchor[1] - area.centery) / ppc
+
+        for _ in range(abs(steps)):
+            if steps > 0:
+                if self.block > 1:
+                    self.block //= 2
+                else:
+                    self.cell_size = min(self.MAX_CELL_SIZE, max(self.cell_size + 1, int(self.cell_size * self.ZOOM_FACTOR)))
+            else:
+                if self.cell_size > 1:
+                    self.cell_size = max(1, min(self.cell_size - 1, int(self.cell_size / self.ZOOM_FACTOR)))
+                else:
+                    self.block *= 2
+
+        ppc = self.pixels_per_cell
+        self.center_x = world_x - (anchor[0] - area.centerx) / ppc
+        self.center_y = world_y - (anchor[1] - area.centery) / ppc
+        self.fitted = False
+
+    def pan(self, dx: int, dy: int, area: pygame.Rect):
+        """Moves the view by PAN_FRACTION of its width/height per unit of dx/dy."""
+        ppc = self.pixels_per_cell
+        self.center_x += dx * self.PAN_FRACTION * area.w / ppc
+        self.center_y += dy * self.PAN_FRACTION * area.h / ppc
+        self.fitted = False
+
+    def clamp(self, grid: Grid):
+        """Keeps the view center over the grid."""
+        self.center_x = min(max(self.center_x, 0.0), float(grid.cols))
+        self.center_y = min(max(self.center_y, 0.0), float(grid.rows))
+
+    def offsets(self, area: pygame.Rect) -> Tuple[int, int]:
+        """Screen position of the top-left corner of cell (0, 0)."""
+        ppc = self.pixels_per_cell
+        return int(area.centerx - self.center_x * ppc), int(area.centery - self.center_y * ppc)
+
+    def visible_range(self, grid: Grid, area: pygame.Rect) -> Tuple[int, int, int, int]:
+        """(x0, x1, y0, y1): the half-open cell ranges intersecting `area`, aligned to `block`."""
+        ppc = self.pixels_per_cell
+        offset_x, offset_y = self.offsets(area)
+        x0 = max(0, int((area.left - offset_x) / ppc))
+        y0 = max(0, int((area.top - offset_y) / ppc))
+        x1 = min(grid.cols, math.ceil((area.right - offset_x) / ppc))
+        y1 = min(grid.rows, math.ceil((area.bottom - offset_y) / ppc))
+        x0 -= x0 % self.block
+        y0 -= y0 % self.block
+        return x0, max(x0, x1), y0, max(y0, y1)
@@ -0,0 +1,89 @@
+"""
+Offscreen frame rendering for headless export (PNG sequences or raw video frames).
+
+The Renderer draws into a plain pygame.Surface instead of the display, with the sidebar
+removed so the frame is the maze alone. Works under the SDL dummy video driver.
+"""
+import os
+from typing import Optional, Sequence
+import pygame
+from model.grid import Grid
+from model.trace import TracePlayer
+from view.renderer import Renderer
+
+class FrameExporter:
+    def __init__(self, width: int, height: int):
+        pygame.init()
+        self.surface = pygame.Surface((width, height))
+        self.renderer = Renderer(self.surface)
+        self.renderer.SIDEBAR_WIDTH = 0 # Whole surface is maze area
+        self.renderer.set_raster_mode(True)
+
+    @property
+    def size(self):
+        return self.surface.get_size()
+
+    def render(self, grid: Grid, states=None) -> pygame.Surface:
+        """Draws `grid` (from `states`, e.g. a TracePlayer's, when given) and returns the frame surface."""
+        renderer = self.renderer
+        if states is not None and renderer.states is not states:
+            renderer.attach_states(states)
+        self.surface.fill(renderer.COLOR_BG)
+        renderer.draw_grid(grid)
+        current_id = renderer.state_array(grid).current_id
+        if current_id >= 0:
+            renderer.draw_current(grid.cells_by_id[current_id])
+        renderer.present()
+        return self.surface
+
+    def frame_bytes(self) -> bytes:
+        """The last frame as packed RGB24 (the layout ffmpeg's `-f rawvideo -pix_fmt rgb24` expects)."""
+        return pygame.image.tobytes(self.surface, "RGB")
+
+    def save(self, path: str):
+        pygame.image.save(self.surface, path)
+
+def frame_path(out_dir: str, index: int) -> str:
+    return os.path.join(out_dir, f"frame_{index:06d}.png")
+
+def frame_steps(total_steps: int, every: int) -> list:
+    """Trace positions to render: every `every`-th step, always including the first and last state."""
+    steps = list(range(0, total_steps, every))
+    steps.append(total_steps)
+    return steps
+
+# --- Parallel rendering from a trace: each pool process replays its own copy ---
+
+_player: Optional[TracePlayer] = None
+_exporter: Optional[FrameExporter] = None
+
+def init_trace_worker(trace_path: str, width: int, height: int):
+    """Pool initializer: opens the trace and an offscreen renderer once per process."""
+    global _player, _exporter
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    # SDL would otherwise catch SIGTERM, and Pool.terminate() could not stop the process
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    _player = TracePlayer(trace_path)
+    _exporter = FrameExporter(width, height)
+
+def render_trace_frames(task) -> list:
+    """
+    Renders frames (first_index, steps) from the process's trace. Steps ascend, so the
+    player mostly moves forward incrementally. With out_dir, writes PNGs and returns [];
+    otherwise returns the raw RGB24 frames in order.
+    """
+    first_index, steps, out_dir = task
+    frames = []
+    for i, step in enumerate(steps):
+        _player.seek(step)
+        _exporter.render(_player.grid, _player.state)
+        if out_dir:
+            _exporter.save(frame_path(out_dir, first_index + i))
+        else:
+            frames.append(_exporter.frame_bytes())
+    return frames
+
+def split_tasks(steps: Sequence[int], tasks: int, out_dir: Optional[str]) -> list:
+    """Contiguous (first_index, steps, out_dir) ranges, about `tasks` of them."""
+    size = max(1, -(-len(steps) // tasks))
+    return [(i, list(steps[i:i + size]), out_dir) for i in range(0, len(steps), size)]
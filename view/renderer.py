@@ -1,6 +1,14 @@
+import time
+from collections import deque
+import numpy as np
 import pygame
-from model.grid import Grid
+from model.grid import Grid, WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
 from model.cell import Cell
+from model.events import (CODE_BITS, CODE_MASK, EV_PATH, EV_UNPATH, EV_CURRENT, EV_CURRENT_CLEAR, EV_CARVE,
+                          CellStateArray, ST_GEN_VISITED, ST_VISITED, ST_FRONTIER, ST_PATH, ST_ENTRY, ST_EXIT)
+from model.telemetry import format_seconds
+from view.camera import Camera
+from view.text_cache import TextCache
 
 class Renderer:
     def __init__(self, screen):
@@ -30,74 +38,412 @@ class Renderer:
         self.font_bold = pygame.font.SysFont('Consolas', 16, bold=True)
         self.font_large = pygame.font.SysFont('Consolas', 24, bold=True)
 
-        # Dynamic Metrics (Calculated per frame)
+        # Dynamic Metrics (Calculated per frame from the camera)
+        self.camera = Camera()
+        self._camera_grid = None
         self.cell_size = 20
+        self.block = 1 # Cells per pixel in the downsampled overview
         self.offset_x = 10
         self.offset_y = 10
+        self.MIN_CELL_SIZE = 4 # Per-cell drawing needs at least 4px; smaller zooms use the raster path
+        
+        # Retained maze layers: walls are drawn once per grid/metrics and patched on carve deltas,
+        # cells are redrawn only when the delta stream touches them
+        self.COLOR_KEY = (255, 0, 255)
+        self.maze_layer = None
+        self.wall_layer = None
+        self._layer_key = None
+        self._wall_version = 0
+        self._dirty_ids = set()
+        self._dirty_path_ids = set()
+        self._pending_carves = []
+        self._overlay_rects = [] # Screen rects drawn over the maze layer last frame
+        self._dirty_rects = []   # Screen rects to push in present()
+        self.replay_bar_rect = None # Timeline of the last drawn replay bar (for click-to-seek)
+        self._full_redraw = True
+        
+        # Raster path (V): one pixel per visible cell (or per block of cells when zoomed out)
+        # from the state array, colored through a palette and scaled in one call.
+        # Walls come from the state array's wall bits.
+        self.raster_mode = False
+        self.RASTER_WALL_MIN_CELL = 4 # Smaller cells are shown without walls
+        self.raster_palette = [self.COLOR_BG, self.COLOR_VISITED_GEN, self.COLOR_VISITED_SOLVE, self.COLOR_FRONTIER,
+                               self.COLOR_PATH, self.COLOR_ENTRY, self.COLOR_EXIT]
+        self.state_lut = self._build_state_lut()
+        self.states = None
+        self._external_states = False # States owned elsewhere (worker process); drawn read-only
+        self._states_stale = True
+        self._raster_image = None
+        self._raster_scaled = None
+        self._raster_walls = None
+        self._raster_walls_key = None
+        
+        # Rolling draw_grid times (ms) per rendering path
+        self.frame_times = {"cells": deque(maxlen=120), "raster": deque(maxlen=120),
+                            "sidebar": deque(maxlen=120), "results": deque(maxlen=120)}
+        
+        # Retained UI: text surfaces are cached, the static sidebar groups are drawn once,
+        # and the benchmark charts are redrawn only when the results change
+        self.text_cache = TextCache()
+        self._static_panel = None
+        self._results_layer = None
+        self._results_key = None
+        self.results_builds = 0
+        self.debug_overlay = False # F12: sidebar / cache timings
 
     def calculate_metrics(self, grid: Grid):
-        # Calculate available space for maze
-        available_w = self.screen.get_width() - self.SIDEBAR_WIDTH - 20 # 20 padding
-        available_h = self.screen.get_height() - 20 # 20 padding
-        
-        # Determine cell size to fit
-        cell_w = available_w // grid.cols
-        cell_h = available_h // grid.rows
-        self.cell_size = max(4, min(cell_w, cell_h)) # Minimum 4px size
-        
-        # Center the maze in the available area
-        maze_w = self.cell_size * grid.cols
-        maze_h = self.cell_size * grid.rows
-        
-        self.offset_x = 10 + (available_w - maze_w) // 2
-        self.offset_y = 10 + (available_h - maze_h) // 2
+        # Available space for the maze (20 padding); the camera fits the grid into it until the user zooms or pans
+        viewport = self.maze_viewport()
+        if grid is not self._camera_grid:
+            self.camera.fitted = True
+            self._camera_grid = grid
+        if self.camera.fitted:
+            self.camera.fit(grid, viewport)
+        else:
+            self.camera.clamp(grid)
+        
+        self.cell_size = self.camera.cell_size
+        self.block = self.camera.block
+        self.offset_x, self.offset_y = self.camera.offsets(viewport)
+
+    def maze_viewport(self) -> pygame.Rect:
+        return pygame.Rect(10, 10, self.screen.get_width() - self.SIDEBAR_WIDTH - 20, self.screen.get_height() - 20)
+
+    def zoom(self, steps: int, anchor=None):
+        """Zooms the camera around `anchor` (screen pos, default the maze center)."""
+        viewport = self.maze_viewport()
+        self.camera.zoom(steps, anchor or viewport.center, viewport)
+
+    def pan(self, dx: int, dy: int):
+        self.camera.pan(dx, dy, self.maze_viewport())
+
+    def fit_view(self):
+        self.camera.fitted = True
+
+    def uses_raster(self) -> bool:
+        """Raster path when selected, or when cells are too small to draw one by one."""
+        return self.raster_mode or self._external_states or self.block > 1 or self.cell_size < self.MIN_CELL_SIZE
+
+    def visible_range(self, grid: Grid):
+        return self.camera.visible_range(grid, self.maze_area())
+
+    def on_deltas(self, step, deltas):
+        """DeltaStream subscriber: queues the cells whose pixels changed for the next draw_grid."""
+        dirty = self._dirty_ids
+        for packed in deltas:
+            code = packed & CODE_MASK
+            cell_id = packed >> CODE_BITS
+            if code >= EV_CARVE:
+                self._pending_carves.append(cell_id)
+            elif code == EV_PATH or code == EV_UNPATH:
+                # Path connections are drawn half in each neighbour
+                self._dirty_path_ids.add(cell_id)
+            elif code != EV_CURRENT and code != EV_CURRENT_CLEAR:
+                dirty.add(cell_id)
+
+    def invalidate(self):
+        """Forces a full rebuild of the maze layers (cell state changed outside the delta stream)."""
+        self._layer_key = None
+        self._states_stale = True
+
+    def set_raster_mode(self, enabled: bool):
+        self.raster_mode = enabled
+        self.invalidate()
+
+    def attach_states(self, states):
+        """Draws from `states` (e.g. a worker's SharedCellState) instead of the Cells, on the raster path."""
+        self.states = states
+        self._external_states = True
+        self._states_stale = False
+
+    def detach_states(self):
+        self.states = None
+        self._external_states = False
+        self.invalidate()
+
+    def state_array(self, grid: Grid) -> CellStateArray:
+        """The CellStateArray for `grid`, to be subscribed to its delta stream."""
+        if self._external_states:
+            return self.states
+        if self.states is None or self.states.grid is not grid:
+            self.states = CellStateArray(grid)
+            self._states_stale = False
+        return self.states
+
+    def _build_state_lut(self):
+        """Maps every combination of state bits to the palette index of the color that wins."""
+        lut = np.zeros(64, dtype=np.uint8)
+        for flags in range(64):
+            if flags & ST_ENTRY:
+                lut[flags] = 5
+            elif flags & ST_EXIT:
+                lut[flags] = 6
+            elif flags & ST_PATH:
+                lut[flags] = 4
+            elif flags & ST_FRONTIER:
+                lut[flags] = 3
+            elif flags & ST_VISITED:
+                lut[flags] = 2
+            elif flags & ST_GEN_VISITED:
+                lut[flags] = 1
+        return lut
+
+    def maze_area(self) -> pygame.Rect:
+        return pygame.Rect(0, 0, self.screen.get_width() - self.SIDEBAR_WIDTH, self.screen.get_height())
+
+    def cell_rect(self, cell: Cell) -> pygame.Rect:
+        size = max(1, self.cell_size // self.block)
+        return pygame.Rect(cell.x * self.cell_size // self.block + self.offset_x, cell.y * self.cell_size // self.block + self.offset_y, size, size)
 
     def draw_grid(self, grid: Grid):
-        self.screen.fill(self.COLOR_BG)
+        start_time = time.perf_counter()
+        self.calculate_metrics(grid)
+        
+        # The state array (and its live counts) missed changes made outside the delta stream
+        states = self.state_array(grid)
+        if self._states_stale:
+            states.sync()
+            self._states_stale = False
+        
+        key = (grid, grid.rows, grid.cols, self.cell_size, self.offset_x, self.offset_y, self.screen.get_size())
+        expected_version = self._wall_version + len(self._pending_carves)
+        raster = self.uses_raster()
+        if raster:
+            self._draw_grid_raster(grid)
+            self._layer_key = None # The retained layers fell behind while rastering
+        elif key != self._layer_key or grid.version != expected_version:
+            self._rebuild_layers(grid)
+            self._layer_key = key
+        else:
+            self._apply_dirty(grid)
+        
+        self._dirty_ids = set()
+        self._dirty_path_ids = set()
+        self._pending_carves = []
+        self._wall_version = grid.version
         
         # Draw Sidebar Background
         sidebar_rect = pygame.Rect(self.screen.get_width() - self.SIDEBAR_WIDTH, 0, self.SIDEBAR_WIDTH, self.screen.get_height())
         pygame.draw.rect(self.screen, self.COLOR_SIDEBAR_BG, sidebar_rect)
         pygame.draw.line(self.screen, self.COLOR_WALL, (sidebar_rect.x, 0), (sidebar_rect.x, self.screen.get_height()), 2)
+        self._dirty_rects.append(sidebar_rect)
         
-        self.calculate_metrics(grid)
+        self.frame_times["raster" if raster else "cells"].append((time.perf_counter() - start_time) * 1000)
+
+    def _draw_grid_raster(self, grid: Grid):
+        """Draws the visible cells from the state array: palette lookup, one scale, one blit."""
+        states = self.state_array(grid)
+        if states.wall_version != grid.version:
+            states.sync_walls() # Walls changed without carve deltas
+        
+        area = self.maze_area()
+        self.screen.set_clip(area)
+        self.screen.fill(self.COLOR_BG, area)
+        x0, x1, y0, y1 = self.visible_range(grid)
+        if x0 < x1 and y0 < y1:
+            # Cell ids are x * rows + y, so the flat state array reshapes straight to surfarray's (x, y)
+            codes = self.state_lut[states.flags.reshape(grid.cols, grid.rows)[x0:x1, y0:y1]]
+            if self.block > 1:
+                codes = self._downsample(codes, self.block)
+            
+            if self._raster_image is None or self._raster_image.get_size() != codes.shape:
+                self._raster_image = pygame.Surface(codes.shape, depth=8)
+                self._raster_image.set_palette(self.raster_palette)
+            pygame.surfarray.blit_array(self._raster_image, codes)
+            
+            image = self._raster_image
+            if self.cell_size > 1:
+                size = (codes.shape[0] * self.cell_size, codes.shape[1] * self.cell_size)
+                if self._raster_scaled is None or self._raster_scaled.get_size() != size:
+                    self._raster_scaled = pygame.Surface(size, depth=8)
+                    self._raster_scaled.set_palette(self.raster_palette)
+                pygame.transform.scale(image, size, self._raster_scaled)
+                image = self._raster_scaled
+            
+            pos = (self.offset_x + x0 * self.cell_size // self.block, self.offset_y + y0 * self.cell_size // self.block)
+            self.screen.blit(image, pos)
+            if self.block == 1 and self.cell_size >= self.RASTER_WALL_MIN_CELL:
+                walls_key = (grid, states.wall_version, x0, x1, y0, y1, self.cell_size)
+                if walls_key != self._raster_walls_key:
+                    self._raster_walls = self._build_wall_overlay(states.walls.reshape(grid.cols, grid.rows), x0, x1, y0, y1)
+                    self._raster_walls_key = walls_key
+                self.screen.blit(self._raster_walls, pos)
+        self.screen.set_clip(None)
+        
+        self._overlay_rects = []
+        self._dirty_rects.append(area)
+
+    def _downsample(self, codes: np.ndarray, block: int) -> np.ndarray:
+        """
+        One pixel per block x block cells: the highest-priority palette index in the block.
+        `block` is a power of two; halving with strided maxima is far cheaper than a reshaped max.
+        """
+        pad_w, pad_h = -codes.shape[0] % block, -codes.shape[1] % block
+        if pad_w or pad_h:
+            codes = np.pad(codes, ((0, pad_w), (0, pad_h)))
+        while block > 1:
+            codes = np.maximum(codes[0::2], codes[1::2])
+            codes = np.maximum(codes[:, 0::2], codes[:, 1::2])
+            block //= 2
+        return codes
+
+    def _build_wall_overlay(self, walls: np.ndarray, x0: int, x1: int, y0: int, y1: int) -> pygame.Surface:
+        """Rasterizes the walls of the visible cells at once into a colorkeyed overlay."""
+        cs = self.cell_size
+        width = max(1, int(cs * 0.1))
+        cols, rows = walls.shape
+        w, h = (x1 - x0) * cs, (y1 - y0) * cs
+        
+        # Every pixel gets its cell's wall bits; a wall is a band along the matching cell edge.
+        # Shared walls are drawn from one side only (top/left), the outer right/bottom edges from the last column/row.
+        bits = np.repeat(np.repeat(walls[x0:x1, y0:y1], cs, axis=0), cs, axis=1)
+        px = np.arange(w) % cs
+        py = np.arange(h) % cs
+        mask = ((bits & WALL_TOP) != 0) & (py < width)[None, :]
+        mask |= ((bits & WALL_LEFT) != 0) & (px < width)[:, None]
+        if x1 == cols:
+            mask |= ((bits & WALL_RIGHT) != 0) & ((px >= cs - width) & (np.arange(w) >= w - cs))[:, None]
+        if y1 == rows:
+            mask |= ((bits & WALL_BOTTOM) != 0) & ((py >= cs - width) & (np.arange(h) >= h - cs))[None, :]
+        
+        overlay = pygame.Surface((w, h), depth=8)
+        overlay.set_palette([self.COLOR_KEY, self.COLOR_WALL])
+        pygame.surfarray.blit_array(overlay, mask.view(np.uint8))
+        overlay.set_colorkey(self.COLOR_KEY)
+        return overlay
+
+    def _culled_range(self, grid: Grid):
+        """Visible cell range plus a one-cell margin (wall lines reach into neighbouring cells)."""
+        x0, x1, y0, y1 = self.visible_range(grid)
+        return max(0, x0 - 1), min(grid.cols, x1 + 1), max(0, y0 - 1), min(grid.rows, y1 + 1)
+
+    def _rebuild_layers(self, grid: Grid):
+        """Redraws the static wall layer and every visible cell, then the whole screen."""
+        area = self.maze_area()
+        if self.maze_layer is None or self.maze_layer.get_size() != area.size:
+            self.maze_layer = pygame.Surface(area.size)
+            self.wall_layer = pygame.Surface(area.size)
+            self.wall_layer.set_colorkey(self.COLOR_KEY)
+        
+        x0, x1, y0, y1 = self._culled_range(grid)
+        visible = [cell for col in grid.cells[x0:x1] for cell in col[y0:y1]]
+        
+        self.wall_layer.fill(self.COLOR_KEY)
+        for cell in visible:
+            self.draw_cell_walls(cell, self.wall_layer)
+        
+        self.maze_layer.fill(self.COLOR_BG)
         
         # First pass: Draw cell backgrounds (visited states)
-        for col in grid.cells:
-            for cell in col:
-                self.draw_cell_background(cell)
+        for cell in visible:
+            self.draw_cell_background(cell, self.maze_layer)
 
         # Second pass: Draw walls
-        for col in grid.cells:
-            for cell in col:
-                self.draw_cell_walls(cell)
+        self.maze_layer.blit(self.wall_layer, (0, 0))
                 
         # Third pass: Draw Path overlays
-        for col in grid.cells:
-            for cell in col:
-                if cell.is_path:
-                    self.draw_path_connection(cell, grid)
+        for cell in visible:
+            if cell.is_path:
+                self.draw_path_connection(cell, grid, self.maze_layer)
+        
+        self.screen.blit(self.maze_layer, area)
+        self._overlay_rects = []
+        self._full_redraw = True
+
+    def _apply_dirty(self, grid: Grid):
+        """Redraws only the cells touched since the last frame and queues their screen rects."""
+        # Restore whatever the overlays (current pointer, pause) covered last frame
+        for rect in self._overlay_rects:
+            self.screen.blit(self.maze_layer, rect, rect)
+            self._dirty_rects.append(rect)
+        self._overlay_rects = []
+        
+        cells = grid.cells_by_id
+        dirty = self._dirty_ids
+        x0, x1, y0, y1 = self._culled_range(grid)
+        
+        for cell_id in self._pending_carves:
+            cell = cells[cell_id]
+            if not (x0 <= cell.x < x1 and y0 <= cell.y < y1):
+                continue
+            self._patch_walls(grid, cell)
+            # Thick wall lines reach past their endpoints into the diagonal cells too
+            for dx in range(-1, 2):
+                for dy in range(-1, 2):
+                    n = grid.get_cell(cell.x + dx, cell.y + dy)
+                    if n:
+                        dirty.add(n.id)
+        
+        for cell_id in self._dirty_path_ids:
+            cell = cells[cell_id]
+            dirty.add(cell_id)
+            for n in grid.get_neighbors(cell):
+                dirty.add(n.id)
+        
+        # Each cell is redrawn clipped to its own rect: background, its slice of the wall layer,
+        # then its half of any path segments (segments are symmetric between the two cells)
+        layer = self.maze_layer
+        for cell_id in dirty:
+            cell = cells[cell_id]
+            if not (x0 <= cell.x < x1 and y0 <= cell.y < y1):
+                continue # Culled: off screen
+            rect = self.cell_rect(cell)
+            layer.set_clip(rect)
+            layer.fill(self.COLOR_BG, rect)
+            self.draw_cell_background(cell, layer)
+            layer.blit(self.wall_layer, rect, rect)
+            if cell.is_path:
+                self.draw_path_connection(cell, grid, layer)
+            layer.set_clip(None)
+            self.screen.blit(layer, rect, rect)
+            self._dirty_rects.append(rect)
+
+    def _patch_walls(self, grid: Grid, cell: Cell):
+        """Redraws the wall layer around a cell after a wall between it and a neighbour was carved."""
+        wall_w = max(1, int(self.cell_size * 0.1))
+        region = self.cell_rect(cell).inflate(self.cell_size * 2 + wall_w * 2, self.cell_size * 2 + wall_w * 2)
+        self.wall_layer.set_clip(region)
+        self.wall_layer.fill(self.COLOR_KEY, region)
+        for dx in range(-2, 3):
+            for dy in range(-2, 3):
+                n = grid.get_cell(cell.x + dx, cell.y + dy)
+                if n:
+                    self.draw_cell_walls(n, self.wall_layer)
+        self.wall_layer.set_clip(None)
 
-    def draw_cell_background(self, cell: Cell):
+    def present(self):
+        """Pushes this frame to the display: only the dirty rects unless a full redraw happened."""
+        if self.screen is not pygame.display.get_surface():
+            pass # Offscreen target (headless export): nothing to push
+        elif self._full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty_rects)
+        self._dirty_rects = []
+        self._full_redraw = False
+
+    def draw_cell_background(self, cell: Cell, surface=None):
+        surface = surface or self.screen
         x = cell.x * self.cell_size + self.offset_x
         y = cell.y * self.cell_size + self.offset_y
         rect = pygame.Rect(x, y, self.cell_size, self.cell_size)
         
         # Priority 1: Entry/Exit (Fill whole cell)
         if cell.is_entry:
-            pygame.draw.rect(self.screen, self.COLOR_ENTRY, rect)
+            pygame.draw.rect(surface, self.COLOR_ENTRY, rect)
         elif cell.is_exit:
-            pygame.draw.rect(self.screen, self.COLOR_EXIT, rect)
+            pygame.draw.rect(surface, self.COLOR_EXIT, rect)
         # Priority 2: Solver states
         elif cell.in_frontier:
-            pygame.draw.rect(self.screen, self.COLOR_FRONTIER, rect)
+            pygame.draw.rect(surface, self.COLOR_FRONTIER, rect)
         elif cell.visited_by_solver:
-            pygame.draw.rect(self.screen, self.COLOR_VISITED_SOLVE, rect)
+            pygame.draw.rect(surface, self.COLOR_VISITED_SOLVE, rect)
         # Priority 3: Generator visited
         elif cell.visited:
-            pygame.draw.rect(self.screen, self.COLOR_VISITED_GEN, rect)
+            pygame.draw.rect(surface, self.COLOR_VISITED_GEN, rect)
 
-    def draw_path_connection(self, cell: Cell, grid: Grid):
+    def draw_path_connection(self, cell: Cell, grid: Grid, surface=None):
+        surface = surface or self.screen
         cx = cell.x * self.cell_size + self.offset_x + self.cell_size // 2
         cy = cell.y * self.cell_size + self.offset_y + self.cell_size // 2
         
@@ -106,9 +452,10 @@ class Renderer:
             if n.is_path:
                 nx = n.x * self.cell_size + self.offset_x + self.cell_size // 2
                 ny = n.y * self.cell_size + self.offset_y + self.cell_size // 2
-                pygame.draw.line(self.screen, self.COLOR_PATH, (cx, cy), (nx, ny), max(2, self.cell_size // 3))
+                pygame.draw.line(surface, self.COLOR_PATH, (cx, cy), (nx, ny), max(2, self.cell_size // 3))
 
-    def draw_cell_walls(self, cell: Cell):
+    def draw_cell_walls(self, cell: Cell, surface=None):
+        surface = surface or self.screen
         x = cell.x * self.cell_size + self.offset_x
         y = cell.y * self.cell_size + self.offset_y
         
@@ -116,25 +463,30 @@ class Renderer:
         width = max(1, int(self.cell_size * 0.1)) # Dynamic wall width
         
         if cell.walls['top']:
-            pygame.draw.line(self.screen, wall_color, (x, y), (x + self.cell_size, y), width)
+            pygame.draw.line(surface, wall_color, (x, y), (x + self.cell_size, y), width)
         if cell.walls['right']:
-            pygame.draw.line(self.screen, wall_color, (x + self.cell_size, y), (x + self.cell_size, y + self.cell_size), width)
+            pygame.draw.line(surface, wall_color, (x + self.cell_size, y), (x + self.cell_size, y + self.cell_size), width)
         if cell.walls['bottom']:
-            pygame.draw.line(self.screen, wall_color, (x + self.cell_size, y + self.cell_size), (x, y + self.cell_size), width)
+            pygame.draw.line(surface, wall_color, (x + self.cell_size, y + self.cell_size), (x, y + self.cell_size), width)
         if cell.walls['left']:
-            pygame.draw.line(self.screen, wall_color, (x, y + self.cell_size), (x, y), width)
+            pygame.draw.line(surface, wall_color, (x, y + self.cell_size), (x, y), width)
 
     def draw_current(self, cell: Cell):
         if not cell:
             return
-        x = cell.x * self.cell_size + self.offset_x
-        y = cell.y * self.cell_size + self.offset_y
-        
-        # Smaller pointer
-        inset = self.cell_size // 4
-        size = self.cell_size - (inset * 2)
-        rect = pygame.Rect(x + inset, y + inset, size, size)
-        pygame.draw.rect(self.screen, self.COLOR_CURRENT, rect, border_radius=max(2, self.cell_size // 8))
+        cell_rect = self.cell_rect(cell)
+        
+        # Smaller pointer (kept visible at a few pixels when zoomed out)
+        inset = cell_rect.w // 4
+        size = max(4, cell_rect.w - (inset * 2))
+        rect = pygame.Rect(0, 0, size, size)
+        rect.center = cell_rect.center
+        rect = rect.clip(self.maze_area())
+        if not rect.w or not rect.h:
+            return
+        pygame.draw.rect(self.screen, self.COLOR_CURRENT, rect, border_radius=max(2, cell_rect.w // 8))
+        self._overlay_rects.append(rect)
+        self._dirty_rects.append(rect)
 
     def draw_pause_overlay(self):
         # Draw over the maze area only? Or whole screen? Let's do maze area
@@ -144,7 +496,7 @@ class Renderer:
         s.fill((0, 0, 0))
         self.screen.blit(s, (0, 0))
         
-        text = self.font_large.render("PAUSED", True, self.COLOR_TEXT)
+        text = self.text(self.font_large, "PAUSED")
         text_rect = text.get_rect(center=(area_w // 2, self.screen.get_height() // 2))
         
         box_rect = text_rect.inflate(40, 40)
@@ -152,14 +504,193 @@ class Renderer:
         pygame.draw.rect(self.screen, self.COLOR_WALL, box_rect, 2)
         
         self.screen.blit(text, text_rect)
+        self._overlay_rects.append(self.maze_area())
+        self._dirty_rects.append(self.maze_area())
+
+    def draw_replay_bar(self, position: int, total: int, playing: bool):
+        """Timeline along the bottom of the maze area: trace position out of `total` steps."""
+        area = self.maze_area()
+        bar = pygame.Rect(area.x + 20, area.bottom - 34, area.w - 40, 24)
+        pygame.draw.rect(self.screen, self.COLOR_BG, bar.inflate(8, 8))
+        fill = bar.copy()
+        fill.w = int(bar.w * position / total) if total else bar.w
+        pygame.draw.rect(self.screen, self.COLOR_FRONTIER, fill)
+        pygame.draw.rect(self.screen, self.COLOR_WALL, bar, 1)
+        
+        label = f"{'>' if playing else '||'} {position}/{total}"
+        text = self.text(self.font, label)
+        self.screen.blit(text, text.get_rect(midleft=(bar.x + 6, bar.centery)))
+        
+        self.replay_bar_rect = bar
+        self._overlay_rects.append(bar.inflate(8, 8))
+        self._dirty_rects.append(bar.inflate(8, 8))
+
+    def draw_debug_overlay(self):
+        """F12: per-frame cost of the UI layer and how well its caches are doing."""
+        def avg(name):
+            times = self.frame_times[name]
+            return (sum(times) / len(times), max(times)) if times else (0.0, 0.0)
+        
+        cache = self.text_cache
+        lookups = cache.hits + cache.misses
+        lines = [
+            "Sidebar: %.3fms avg, %.3fms max" % avg("sidebar"),
+            "Results view: %.3fms avg, %.3fms max" % avg("results"),
+            f"Text cache: {len(cache.entries)}/{cache.max_entries}, {100 * cache.hits / lookups if lookups else 0:.1f}% hits",
+            f"Chart rebuilds: {self.results_builds}",
+        ]
+        
+        rect = pygame.Rect(15, 15, 330, 18 * len(lines) + 12)
+        pygame.draw.rect(self.screen, self.COLOR_SIDEBAR_BG, rect)
+        pygame.draw.rect(self.screen, self.COLOR_FRONTIER, rect, 1)
+        for i, line in enumerate(lines):
+            # Not cached: these change every frame and would only evict useful entries
+            self.screen.blit(self.font.render(line, True, self.COLOR_TEXT), (rect.x + 8, rect.y + 6 + 18 * i))
+        self._overlay_rects.append(rect)
+        self._dirty_rects.append(rect)
+
+    def draw_frame_profile(self, profiler):
+        """F11: histogram of recent frame times and the average cost of each frame phase."""
+        times = profiler.busy_times()
+        averages = profiler.phase_averages()
+        colors = [self.COLOR_FRONTIER, self.COLOR_CURRENT, self.COLOR_VISITED_SOLVE, self.COLOR_PATH,
+                  self.COLOR_EXIT, (129, 161, 193), self.COLOR_ENTRY, (180, 142, 173)]
+        
+        bins = 34 # 1ms buckets, the last one holds 33ms and slower
+        bin_w = 10
+        width = bins * bin_w + 16
+        area = self.maze_area()
+        rect = pygame.Rect(15, area.bottom - 230, width, 215)
+        pygame.draw.rect(self.screen, self.COLOR_SIDEBAR_BG, rect)
+        pygame.draw.rect(self.screen, self.COLOR_FRONTIER, rect, 1)
+        x, y = rect.x + 8, rect.y + 6
+        
+        if times:
+            ordered = sorted(times)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            summary = f"Frame {sum(times) / len(times):.2f}ms avg, p95 {p95:.2f}, max {ordered[-1]:.2f}"
+        else:
+            summary = "Frame: collecting..."
+        # Not cached: changes every frame
+        self.screen.blit(self.font.render(summary, True, self.COLOR_TEXT), (x, y))
+        self.screen.blit(self.font.render(f"Draw calls: {profiler.draw_calls}", True, self.COLOR_TEXT), (x, y + 18))
+        
+        # Histogram of busy frame times (the wait in clock.tick excluded)
+        counts = profiler.histogram(1.0, bins)
+        top = max(counts) if any(counts) else 1
+        hist_y, hist_h = y + 42, 60
+        for i, count in enumerate(counts):
+            h = round(hist_h * count / top)
+            if h:
+                pygame.draw.rect(self.screen, self.COLOR_VISITED_SOLVE, (x + i * bin_w, hist_y + hist_h - h, bin_w - 1, h))
+        budget_x = x + int(1000 / 60 * bin_w) # 60 FPS frame budget
+        pygame.draw.line(self.screen, self.COLOR_ENTRY, (budget_x, hist_y), (budget_x, hist_y + hist_h))
+        pygame.draw.line(self.screen, self.COLOR_WALL, (x, hist_y + hist_h), (x + bins * bin_w, hist_y + hist_h))
+        for label, lx in (("0", x), ("16.7ms", budget_x - 20), ("33+", x + bins * bin_w - 30)):
+            self.screen.blit(self.text(self.font, label, (150, 150, 150)), (lx, hist_y + hist_h + 2))
+        
+        # Average phase breakdown: stacked bar and legend
+        bar_y = hist_y + hist_h + 24
+        total = sum(averages.values())
+        bx = x
+        for color, ms in zip(colors, averages.values()):
+            w = round(bins * bin_w * ms / total) if total else 0
+            pygame.draw.rect(self.screen, color, (bx, bar_y, w, 10))
+            bx += w
+        for i, (phase, ms) in enumerate(averages.items()):
+            lx = x + (i % 2) * (width // 2)
+            ly = bar_y + 16 + (i // 2) * 18
+            pygame.draw.rect(self.screen, colors[i], (lx, ly + 4, 8, 8))
+            self.screen.blit(self.text(self.font, phase), (lx + 12, ly))
+            self.screen.blit(self.font.render(f"{ms:.2f}ms", True, self.COLOR_TEXT), (lx + 105, ly))
+        
+        self._overlay_rects.append(rect)
+        self._dirty_rects.append(rect)
+
+    def render_info(self) -> str:
+        path = "raster" if self.uses_raster() else "cells"
+        times = self.frame_times[path]
+        avg = sum(times) / len(times) if times else 0.0
+        zoom = f"1px/{self.block}" if self.block > 1 else f"{self.cell_size}px"
+        return f"{path} {zoom} {avg:.2f}ms"
+
+    def text(self, font, text, color=None) -> pygame.Surface:
+        """Rendered `text`, from the text cache."""
+        return self.text_cache.render(font, text, color or self.COLOR_TEXT)
+
+    def draw_info_line(self, surface, line, x, y):
+        """Draws "Key: value | Key: value" with bold keys."""
+        segments = line.split(" | ")
+        curr_x = x
+        
+        for i, seg in enumerate(segments):
+            if ":" in seg:
+                # Bold the key (part before colon)
+                key, val = seg.split(":", 1)
+                k_surf = self.text(self.font_bold, key)
+                v_surf = self.text(self.font, ":" + val)
+                surface.blit(k_surf, (curr_x, y))
+                surface.blit(v_surf, (curr_x + k_surf.get_width(), y))
+                curr_x += k_surf.get_width() + v_surf.get_width()
+            else:
+                t_surf = self.text(self.font, seg)
+                surface.blit(t_surf, (curr_x, y))
+                curr_x += t_surf.get_width()
+            
+            if i < len(segments) - 1:
+                p_surf = self.text(self.font, " | ")
+                surface.blit(p_surf, (curr_x, y))
+                curr_x += p_surf.get_width()
+
+    def draw_info_groups(self, surface, info_groups, x, y) -> int:
+        """Draws titled groups of info lines; returns the y below the last group."""
+        for group_title, lines in info_groups:
+            # Group Header
+            surface.blit(self.text(self.font, group_title, self.COLOR_FRONTIER), (x, y))
+            y += 22
+            
+            for line in lines:
+                self.draw_info_line(surface, line, x + 5, y)
+                y += 18
+            
+            y += 10 # Group spacing
+        return y
+
+    def static_panel(self) -> pygame.Surface:
+        """The fixed Controls / Algorithms groups, rendered once."""
+        if self._static_panel is None:
+            info_groups = [
+                ("Controls", [
+                    "SPACE: Pause | R: Reset",
+                    "B: Bench | [ / ]: Speed",
+                    "TAB: Step Mode (fixed/budget/finish)",
+                    "C: Chunked | V: Raster | X: Worker",
+                    "T: Record Trace | L: Replay Last",
+                    "WASD: Pan | -/=: Zoom",
+                    "0: Fit View | Wheel: Zoom",
+                    "ARROWS: Resize Grid",
+                    "F1-F3: Grid Presets | F11: Profiler",
+                ]),
+                ("Algorithms", [
+                    "1: Backtracker | 2: Prim's",
+                    "3: BFS | 4: DFS | 5: A*",
+                    "6: Dijkstra | 7: Wall",
+                    "8: Portfolio Race",
+                ])
+            ]
+            height = sum(22 + 18 * len(lines) + 10 for _, lines in info_groups)
+            self._static_panel = pygame.Surface((self.SIDEBAR_WIDTH - 15, height))
+            self._static_panel.fill(self.COLOR_SIDEBAR_BG)
+            self.draw_info_groups(self._static_panel, info_groups, 0, 0)
+        return self._static_panel
 
     def draw_info(self, algo_name, speed_info, grid_size, stats=None):
+        start_time = time.perf_counter()
         x_start = self.screen.get_width() - self.SIDEBAR_WIDTH + 15
         y_start = 15
         
         # Title
-        title = self.font_large.render("Maze Visualizer", True, self.COLOR_PATH)
-        self.screen.blit(title, (x_start, y_start))
+        self.screen.blit(self.text(self.font_large, "Maze Visualizer", self.COLOR_PATH), (x_start, y_start))
         y_start += 40
         
         # --- Live Statistics Panel (Two Column) ---
@@ -176,92 +707,59 @@ class Renderer:
                 (f"Steps: {stats['steps']}", f"RAM: {stats['memory']:.0f}K"),
                 (f"Visit: {stats['visited']}", f"Total: {stats['total']}"),
                 (f"Cover: {stats['coverage']:.1f}%", f"Front: {stats['frontier']}"),
-                (f"Path:  {stats['path']}", "")
+                (f"Path:  {stats['path']}", f"Rate: {stats.get('rate', 0):.0f}/s")
             ]
             
             sy = y_start + 10
             col2_off = stats_w // 2
             for left, right in stat_pairs:
-                self.screen.blit(self.font.render(left, True, self.COLOR_TEXT), (x_start + 10, sy))
+                self.screen.blit(self.text(self.font, left), (x_start + 10, sy))
                 if right:
-                    self.screen.blit(self.font.render(right, True, self.COLOR_TEXT), (x_start + col2_off, sy))
+                    self.screen.blit(self.text(self.font, right), (x_start + col2_off, sy))
                 sy += 20
             
         y_start += stats_h + 15
         
-        # --- Grouped Info ---
-        info_groups = [
+        # --- Grouped Info: live status, then the static groups ---
+        y_start = self.draw_info_groups(self.screen, [
             ("Status & Config", [
                 f"Algo: {algo_name}",
                 f"Grid: {grid_size[0]}x{grid_size[1]}",
                 f"Speed: {speed_info}",
+                f"Render: {self.render_info()}",
             ]),
-            ("Controls", [
-                "SPACE: Pause | R: Reset",
-                "B: Bench | [ / ]: Speed",
-                "ARROWS: Resize Grid",
-                "F1-F3: Grid Presets",
-            ]),
-            ("Algorithms", [
-                "1: Backtracker | 2: Prim's",
-                "3: BFS | 4: DFS | 5: A*",
-                "6: Dijkstra | 7: Wall",
-            ])
-        ]
+        ], x_start, y_start)
+        self.screen.blit(self.static_panel(), (x_start, y_start))
         
-        for group_title, lines in info_groups:
-            # Group Header
-            head = self.font.render(group_title, True, self.COLOR_FRONTIER)
-            self.screen.blit(head, (x_start, y_start))
-            y_start += 22
-            
-            # Lines
-            for line in lines:
-                segments = line.split(" | ")
-                curr_x = x_start + 5
-                
-                for i, seg in enumerate(segments):
-                    if ":" in seg:
-                        # Bold the key (part before colon)
-                        key, val = seg.split(":", 1)
-                        k_surf = self.font_bold.render(key, True, self.COLOR_TEXT)
-                        v_surf = self.font.render(":" + val, True, self.COLOR_TEXT)
-                        self.screen.blit(k_surf, (curr_x, y_start))
-                        self.screen.blit(v_surf, (curr_x + k_surf.get_width(), y_start))
-                        curr_x += k_surf.get_width() + v_surf.get_width()
-                    else:
-                        t_surf = self.font.render(seg, True, self.COLOR_TEXT)
-                        self.screen.blit(t_surf, (curr_x, y_start))
-                        curr_x += t_surf.get_width()
-                    
-                    if i < len(segments) - 1:
-                        p_surf = self.font.render(" | ", True, self.COLOR_TEXT)
-                        self.screen.blit(p_surf, (curr_x, y_start))
-                        curr_x += p_surf.get_width()
-                y_start += 18
-            
-            y_start += 10 # Group spacing
+        self.frame_times["sidebar"].append((time.perf_counter() - start_time) * 1000)
 
-    def draw_benchmark_progress(self, progress, message, current_ram=0.0):
+    def draw_benchmark_progress(self, progress, message, current_ram=0.0, telemetry=None):
+        """Progress view; with `telemetry` (a TelemetryState) also throughput, ETA and one lane per worker."""
+        # Full-screen views: present() flips, and the maze layers must be redrawn afterwards
+        self.invalidate()
+        self._full_redraw = True
         self.screen.fill(self.COLOR_BG)
         
         # ... (keep sidebar logic) ...
         sidebar_rect = pygame.Rect(self.screen.get_width() - self.SIDEBAR_WIDTH, 0, self.SIDEBAR_WIDTH, self.screen.get_height())
         pygame.draw.rect(self.screen, self.COLOR_SIDEBAR_BG, sidebar_rect)
         pygame.draw.line(self.screen, self.COLOR_WALL, (sidebar_rect.x, 0), (sidebar_rect.x, self.screen.get_height()), 2)
+        info_x = sidebar_rect.x + 15
+        self.screen.blit(self.text(self.font_bold, "ESC: Cancel"), (info_x, 60))
         
-        # Center Area
+        # Center Area (moved up to make room for the worker lanes)
         area_w = self.screen.get_width() - self.SIDEBAR_WIDTH
         center_x = area_w // 2
-        center_y = self.screen.get_height() // 2
+        lanes = sorted(telemetry.lanes.items()) if telemetry else []
+        center_y = self.screen.get_height() // 2 - min(len(lanes), 8) * 14
         
         # Title
-        title = self.font_large.render("Running Benchmarks...", True, self.COLOR_PATH)
+        title = self.text(self.font_large, "Running Benchmarks...", self.COLOR_PATH)
         title_rect = title.get_rect(center=(center_x, center_y - 80))
         self.screen.blit(title, title_rect)
         
-        # RAM Usage Real-time
-        ram_text = self.font_large.render(f"Live RAM: {current_ram:.1f} KB", True, self.COLOR_FRONTIER)
+        # RAM Usage Real-time (summed over the workers)
+        ram_text = self.text(self.font_large, f"Live RAM: {current_ram / 1024:.1f} MB", self.COLOR_FRONTIER)
         ram_rect = ram_text.get_rect(center=(center_x, center_y - 30))
         self.screen.blit(ram_text, ram_rect)
 
@@ -273,57 +771,104 @@ class Renderer:
         pygame.draw.rect(self.screen, self.COLOR_WALL, (center_x - bar_w // 2, center_y + 20, bar_w, bar_h), 2)
         
         # Message
-        msg_surf = self.font.render(message, True, self.COLOR_TEXT)
+        msg_surf = self.text(self.font, message)
         msg_rect = msg_surf.get_rect(center=(center_x, center_y + 70))
         self.screen.blit(msg_surf, msg_rect)
+        if lanes:
+            self._draw_worker_lanes(telemetry, lanes, max(10, center_x - 300), center_y + 110, min(600, area_w - 20))
 
-    def draw_benchmark_results(self, stats, iterations=5):
-        self.screen.fill(self.COLOR_BG)
-        
-        # Draw Sidebar Background
-        sidebar_rect = pygame.Rect(self.screen.get_width() - self.SIDEBAR_WIDTH, 0, self.SIDEBAR_WIDTH, self.screen.get_height())
-        pygame.draw.rect(self.screen, self.COLOR_SIDEBAR_BG, sidebar_rect)
-        pygame.draw.line(self.screen, self.COLOR_WALL, (sidebar_rect.x, 0), (sidebar_rect.x, self.screen.get_height()), 2)
+    def _draw_worker_lanes(self, telemetry, lanes, x, y, w, window_s=10.0):
+        """
+        One timeline per worker over the last `window_s` seconds: finished mazes as blocks, the
+        running one in the frontier color, with the worker's RSS and current step beside it.
+        """
+        now = time.time()
+        label_w = 150
+        track_x, track_w = x + label_w, w - label_w
+        header = (f"{telemetry.throughput:.2f} mazes/s | ETA {format_seconds(telemetry.eta)} | "
+                  f"elapsed {format_seconds(now - telemetry.started)}")
+        self.screen.blit(self.text(self.font_bold, header), (x, y))
+        y += 28
+        
+        for i, (pid, lane) in enumerate(lanes[:8]):
+            row_y = y + i * 28
+            self.screen.blit(self.text(self.font, f"W{i + 1} {lane['rss_kb'] / 1024:.0f} MB"), (x, row_y + 2))
+            pygame.draw.rect(self.screen, self.COLOR_VISITED_GEN, (track_x, row_y, track_w, 20))
+            spans = list(lane["recent"])
+            if lane["since"] is not None:
+                spans.append((lane["since"], None))
+            for begin, finish in spans:
+                finish = now if finish is None else finish
+                if finish < now - window_s:
+                    continue
+                x0 = track_x + int(track_w * (1 - (now - max(begin, now - window_s)) / window_s))
+                x1 = track_x + int(track_w * (1 - (now - finish) / window_s))
+                color = self.COLOR_FRONTIER if finish == now else self.COLOR_VISITED_SOLVE
+                pygame.draw.rect(self.screen, color, (x0, row_y + 2, max(2, x1 - x0 - 1), 16))
+            if lane["label"]:
+                self.screen.blit(self.text(self.font, lane["label"]), (track_x + 6, row_y + 2))
+        if len(lanes) > 8:
+            self.screen.blit(self.text(self.font, f"+{len(lanes) - 8} more workers"), (x, y + 8 * 28))
+
+    def draw_benchmark_results(self, stats, iterations=5, mode="run", results_version=None):
+        """
+        Results view. Everything but the controls is drawn to a retained layer that is only
+        rebuilt when `results_version` (BenchmarkService.results_version) or the window size changes.
+        """
+        start_time = time.perf_counter()
+        # Full-screen views: present() flips, and the maze layers must be redrawn afterwards
+        self.invalidate()
+        self._full_redraw = True
+        
+        key = (results_version, self.screen.get_size())
+        if results_version is None or key != self._results_key:
+            self._results_layer = pygame.Surface(self.screen.get_size())
+            self._draw_results_layer(self._results_layer, stats)
+            self._results_key = key
+            self.results_builds += 1
+        self.screen.blit(self._results_layer, (0, 0))
         
         # Instructions
         info_x = self.screen.get_width() - self.SIDEBAR_WIDTH + 15
-        self.screen.blit(self.font_large.render("Benchmark Results", True, self.COLOR_PATH), (info_x, 20))
-        
         ctrl_y = 60
-        ctrls = ["B: Back to Maze", "ENTER: Rerun All", f"Iter: {iterations} (UP/DN)"]
+        ctrls = ["B: Back to Maze", "ENTER: Rerun All", f"Iter: {iterations} (UP/DN)", f"Mode: {mode} (M)"]
         for msg in ctrls:
-            if ":" in msg:
-                parts = msg.split(":", 1)
-                key_surf = self.font_bold.render(parts[0], True, self.COLOR_TEXT)
-                val_surf = self.font.render(":" + parts[1], True, self.COLOR_TEXT)
-                self.screen.blit(key_surf, (info_x, ctrl_y))
-                self.screen.blit(val_surf, (info_x + key_surf.get_width(), ctrl_y))
-            else:
-                self.screen.blit(self.font.render(msg, True, self.COLOR_TEXT), (info_x, ctrl_y))
+            self.draw_info_line(self.screen, msg, info_x, ctrl_y)
             ctrl_y += 20
+        
+        self.frame_times["results"].append((time.perf_counter() - start_time) * 1000)
 
+    def _draw_results_layer(self, surface, stats):
+        surface.fill(self.COLOR_BG)
+        
+        # Draw Sidebar Background
+        sidebar_rect = pygame.Rect(surface.get_width() - self.SIDEBAR_WIDTH, 0, self.SIDEBAR_WIDTH, surface.get_height())
+        pygame.draw.rect(surface, self.COLOR_SIDEBAR_BG, sidebar_rect)
+        pygame.draw.line(surface, self.COLOR_WALL, (sidebar_rect.x, 0), (sidebar_rect.x, surface.get_height()), 2)
+        
+        info_x = surface.get_width() - self.SIDEBAR_WIDTH + 15
+        surface.blit(self.text(self.font_large, "Benchmark Results", self.COLOR_PATH), (info_x, 20))
+        
         if not stats:
-            area_w = self.screen.get_width() - self.SIDEBAR_WIDTH
-            msg = self.font_large.render("No results. Press ENTER.", True, self.COLOR_TEXT)
-            msg_rect = msg.get_rect(center=(area_w // 2, self.screen.get_height() // 2))
-            self.screen.blit(msg, msg_rect)
+            area_w = surface.get_width() - self.SIDEBAR_WIDTH
+            msg = self.text(self.font_large, "No results. Press ENTER.")
+            msg_rect = msg.get_rect(center=(area_w // 2, surface.get_height() // 2))
+            surface.blit(msg, msg_rect)
             return
-
+        
         # Detailed Stats Table in Sidebar
-        ty = 140
+        ty = 160
         for name, data in stats.items():
-            head = self.font.render(f"[{name}]", True, self.COLOR_FRONTIER)
-            self.screen.blit(head, (info_x, ty))
-            line = f"T:{data['time_avg']:.1f}ms | R:{data['memory_avg']:.0f}K"
-            self.screen.blit(self.font.render(line, True, self.COLOR_TEXT), (info_x + 5, ty + 18))
+            surface.blit(self.text(self.font, f"[{name}]", self.COLOR_FRONTIER), (info_x, ty))
+            line = f"T:{data['time_avg']:.1f}ms | M:{data['memory_avg']:.0f}K | W:{data['working_set_avg']:.0f}"
+            surface.blit(self.text(self.font, line), (info_x + 5, ty + 18))
             ty += 40
-
-        # Draw 4 Charts
-        area_w = self.screen.get_width() - self.SIDEBAR_WIDTH
+        
+        # One chart per metric
+        area_w = surface.get_width() - self.SIDEBAR_WIDTH
         padding_x = 50 # Increased padding to avoid left-side overflow
         padding_between = 40
-        chart_w = (area_w - padding_x - (padding_between * 4)) // 4
-        chart_h = self.screen.get_height() - 180
+        chart_h = surface.get_height() - 180
         y_start = 100
         
         algos = list(stats.keys())
@@ -339,20 +884,23 @@ class Renderer:
             ([stats[a]['time_avg'] for a in algos], "Time (ms)"),
             ([stats[a]['visited_avg'] for a in algos], "Visited"),
             ([stats[a]['path_avg'] for a in algos], "Path Len"),
-            ([stats[a]['memory_avg'] for a in algos], "RAM (KB)")
+            ([stats[a]['memory_avg'] for a in algos], "Peak Alloc (KB)"),
+            ([stats[a]['working_set_avg'] for a in algos], "Working Set")
         ]
+        chart_w = (area_w - padding_x - (padding_between * len(metrics))) // len(metrics)
         
         for i, (values, label) in enumerate(metrics):
-            self.draw_bar_chart(padding_x + i*(chart_w + padding_between), y_start, chart_w, chart_h, algos, values, label, colors)
+            self.draw_bar_chart(padding_x + i*(chart_w + padding_between), y_start, chart_w, chart_h, algos, values, label, colors, surface)
 
-    def draw_bar_chart(self, x, y, w, h, labels, values, title, colors):
+    def draw_bar_chart(self, x, y, w, h, labels, values, title, colors, surface=None):
+        surface = surface or self.screen
         # Title
-        title_surf = self.font.render(title, True, self.COLOR_TEXT)
-        self.screen.blit(title_surf, (x + w//2 - title_surf.get_width()//2, y - 30))
+        title_surf = self.text(self.font, title)
+        surface.blit(title_surf, (x + w//2 - title_surf.get_width()//2, y - 30))
         
         # Axes
-        pygame.draw.line(self.screen, self.COLOR_WALL, (x, y + h), (x + w, y + h), 2) # X
-        pygame.draw.line(self.screen, self.COLOR_WALL, (x, y), (x, y + h), 2) # Y
+        pygame.draw.line(surface, self.COLOR_WALL, (x, y + h), (x + w, y + h), 2) # X
+        pygame.draw.line(surface, self.COLOR_WALL, (x, y), (x, y + h), 2) # Y
         
         if not values: return
         max_val = max(values) if max(values) > 0 else 1
@@ -360,11 +908,11 @@ class Renderer:
         # Grid lines (5 lines)
         for i in range(1, 6):
             gy = y + h - (i * h / 5)
-            pygame.draw.line(self.screen, (60, 60, 60), (x, gy), (x + w, gy), 1)
+            pygame.draw.line(surface, (60, 60, 60), (x, gy), (x + w, gy), 1)
             # Label
             val = (max_val / 5) * i
-            lbl = self.font.render(f"{val:.0f}", True, (100, 100, 100))
-            self.screen.blit(lbl, (x - lbl.get_width() - 5, gy - 10))
+            lbl = self.text(self.font, f"{val:.0f}", (100, 100, 100))
+            surface.blit(lbl, (x - lbl.get_width() - 5, gy - 10))
         
         bar_width = w // len(values) - 10
         
@@ -375,13 +923,12 @@ class Renderer:
             
             # Bar
             color = colors[i % len(colors)]
-            pygame.draw.rect(self.screen, color, (bx, by, bar_width, bar_h))
+            pygame.draw.rect(surface, color, (bx, by, bar_width, bar_h))
             
             # Value Label
-            val_text = f"{val:.1f}"
-            val_surf = self.font.render(val_text, True, self.COLOR_TEXT)
-            self.screen.blit(val_surf, (bx + bar_width//2 - val_surf.get_width()//2, by - 20))
+            val_surf = self.text(self.font, f"{val:.1f}")
+            surface.blit(val_surf, (bx + bar_width//2 - val_surf.get_width()//2, by - 20))
             
             # X Label
-            lbl_surf = self.font.render(labels[i], True, self.COLOR_TEXT)
-            self.screen.blit(lbl_surf, (bx + bar_width//2 - lbl_surf.get_width()//2, y + h + 5))
\ No newline at end of file
+            lbl_surf = self.text(self.font, labels[i])
+            surface.blit(lbl_surf, (bx + bar_width//2 - lbl_surf.get_width()//2, y + h + 5))
\ No newline at end of file
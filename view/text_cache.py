@@ -0,0 +1,32 @@
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, color), with least-recently-used eviction.
+    Labels that repeat from frame to frame are rendered once; changing values
+    (counters, timers) only cost a render when their text actually changes.
+    """
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        key = (font, text, tuple(color))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()